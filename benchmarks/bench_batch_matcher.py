@@ -0,0 +1,35 @@
+"""
+Compare per-object preference matching with the vectorized batch matcher.
+
+Usage: python -m benchmarks.bench_batch_matcher [--users 20000] [--events 5000]
+"""
+import argparse
+import time
+from benchmarks.generators import make_events, make_users
+from src.services.batch_matcher import match_users
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=20000)
+    parser.add_argument('--events', type=int, default=5000)
+    parser.add_argument('--sample', type=int, default=500,
+                        help="users matched object by object, extrapolated to all")
+    args = parser.parse_args()
+    users, events = make_users(args.users), make_events(args.events)
+
+    start = time.perf_counter()
+    sample = users[:args.sample]
+    for user in sample:
+        [event for event in events if user.matches_event(event)]
+    per_object = (time.perf_counter() - start) * len(users) / len(sample)
+
+    start = time.perf_counter()
+    matrix = match_users(users, events)
+    vectorized = time.perf_counter() - start
+
+    print(f"{args.users} users x {args.events} events, {matrix.nnz} matches")
+    print(f"matches_event (extrapolated) {per_object:8.2f} s")
+    print(f"match_users                  {vectorized:8.2f} s  {per_object / vectorized:6.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Compare the memory used by cached events in different representations.
+
+Usage: python -m benchmarks.bench_event_memory [--events 200000]
+"""
+import argparse
+import gc
+import random
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import List
+from src.models.event import Event
+from src.models.event_batch import EventBatch
+
+@dataclass
+class DictEvent:
+    """The previous Event layout: a plain dataclass with a __dict__"""
+    id: str
+    title: str
+    description: str
+    date: datetime
+    location: str
+    category: str
+    source: str
+    url: str = None
+    image_url: str = None
+    source_urls: List[str] = field(default_factory=list)
+
+LOCATIONS = ["Downtown Tech Hub", "City Park", "Central Library", "Town Hall", "Riverside"]
+CATEGORIES = ["technology", "music", "arts", "community", "sports"]
+SOURCES = ["eventbrite", "meetup", "community_web"]
+
+def make_rows(count: int, seed: int = 42):
+    """
+    Field values as a parser would produce them: every string is a fresh
+    object, even when its text repeats.
+    """
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    for index in range(count):
+        yield dict(
+            id=f"{index:016x}",
+            title=f"Event number {index}",
+            description=f"Description of event {index} " * 3,
+            date=start + timedelta(minutes=rng.randrange(525600)),
+            location="".join(rng.choice(LOCATIONS)),
+            category="".join(rng.choice(CATEGORIES)),
+            source="".join(rng.choice(SOURCES)),
+            url=f"http://example.com/events/{index}",
+        )
+
+def measure(build) -> int:
+    """Bytes still allocated after building a representation"""
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del value
+    return size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--events', type=int, default=200000)
+    args = parser.parse_args()
+
+    count = args.events
+    layouts = {
+        "dataclass with __dict__": lambda: [DictEvent(**row) for row in make_rows(count)],
+        "slotted Event": lambda: [Event(**row) for row in make_rows(count)],
+        "columnar EventBatch": lambda: EventBatch(Event(**row) for row in make_rows(count)),
+    }
+
+    print(f"{count} events")
+    baseline = None
+    for name, build in layouts.items():
+        size = measure(build)
+        baseline = baseline or size
+        print(f"{name:<24} {size / 2**20:8.1f} MiB  {size / count:6.0f} B/event  "
+              f"{size / baseline:5.0%}")
+
+if __name__ == "__main__":
+    main()
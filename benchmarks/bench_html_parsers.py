@@ -0,0 +1,39 @@
+"""
+Compare HTML parser backends on synthetic event listing pages.
+
+Usage: python -m benchmarks.bench_html_parsers [--cards 2000] [--repeat 5]
+"""
+import argparse
+import time
+from benchmarks.generators import make_listing_page
+from src.sources.html_parsers import BeautifulSoupBackend, available_backends, get_parser_backend
+
+def bench(backend, html: str, repeat: int) -> float:
+    """Best wall-clock time of several extractions"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        backend.extract(html)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cards', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    html = make_listing_page(args.cards)
+    backends = {"html.parser (full tree)": BeautifulSoupBackend(strain=False)}
+    for name in available_backends():
+        backends[name] = get_parser_backend(name)
+
+    print(f"{args.cards} cards, {len(html) / 1024:.0f} KiB page")
+    baseline = None
+    for name, backend in backends.items():
+        seconds = bench(backend, html, args.repeat)
+        baseline = baseline or seconds
+        print(f"{name:<26} {seconds * 1000:9.1f} ms  {baseline / seconds:6.1f}x")
+
+if __name__ == "__main__":
+    main()
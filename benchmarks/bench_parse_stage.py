@@ -0,0 +1,47 @@
+"""
+Measure parse throughput of the process-pool parse stage as workers scale.
+
+Usage: python -m benchmarks.bench_parse_stage [--pages 32] [--cards 500] [--parser html.parser]
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.generators import make_listing_page
+from src.services.parse_stage import ParseStage
+from src.sources.web_scraper import CommunityWebScraper
+
+def bench(stage: ParseStage, source: CommunityWebScraper, pages, threads: int) -> float:
+    """Seconds to parse every page, submitted from several fetch threads"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as fetchers:
+        list(fetchers.map(lambda html: stage.parse(source, html), pages))
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, default=32)
+    parser.add_argument('--cards', type=int, default=500)
+    parser.add_argument('--parser', default="html.parser")
+    args = parser.parse_args()
+
+    pages = [make_listing_page(args.cards, seed) for seed in range(args.pages)]
+    source = CommunityWebScraper("http://example.com/events", parser=args.parser)
+    cpus = os.cpu_count() or 1
+    counts = [0] + sorted({1 << i for i in range(cpus.bit_length())} | {cpus})
+
+    print(f"{args.pages} pages x {args.cards} cards, {args.parser} parser, {cpus} CPUs")
+    for workers in counts:
+        stage = ParseStage(workers)
+        try:
+            if workers:
+                # Start the workers and build their parsers before timing
+                bench(stage, source, pages[:workers], workers)
+            seconds = bench(stage, source, pages, max(workers, 1) * 2)
+        finally:
+            stage.close()
+        label = "inline" if workers == 0 else f"{workers} workers"
+        print(f"{label:<12} {seconds:7.2f} s  {args.pages / seconds:7.1f} pages/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Seeded generators for synthetic benchmark inputs. The same seed always
+produces the same events, users and pages, so runs are comparable.
+"""
+import random
+from datetime import datetime, timedelta
+from typing import List
+from src.models.event import Event
+from src.models.user_preferences import UserPreferences
+
+CATEGORIES = [f"category{i}" for i in range(20)]
+LOCATIONS = [f"neighbourhood{i}" for i in range(40)]
+SOURCES = ["eventbrite", "meetup", "community_web"]
+WORDS = ["python", "jazz", "art", "community", "workshop", "festival", "meetup", "night"]
+
+CARD_TEMPLATE = """
+<div class="event-card">
+    <h2 class="event-title">{title}</h2>
+    <p class="event-description">{description}</p>
+    <span class="event-date">2024-{month:02d}-{day:02d} 18:30</span>
+    <span class="event-location">{location}</span>
+    <span class="event-category">{category}</span>
+    <a class="event-link" href="http://example.com/events/{index}">Details</a>
+</div>
+"""
+
+def make_events(count: int, seed: int = 42, start: datetime = None) -> List[Event]:
+    """
+    Events spread over a year, the categories and the locations.
+    By default the year starts next January, so no event is already past.
+    """
+    rng = random.Random(seed)
+    start = start or datetime(datetime.now().year + 1, 1, 1)
+    return [Event(
+        id=f"{index:016x}",
+        title=" ".join(rng.choices(WORDS, k=3)).title(),
+        description=" ".join(rng.choices(WORDS, k=25)),
+        date=start + timedelta(minutes=rng.randrange(525600)),
+        location=rng.choice(LOCATIONS),
+        category=rng.choice(CATEGORIES),
+        source=rng.choice(SOURCES),
+        url=f"http://example.com/events/{index}"
+    ) for index in range(count)]
+
+def make_users(count: int, seed: int = 42) -> List[UserPreferences]:
+    """Users selecting a few categories and locations; some select none"""
+    rng = random.Random(seed)
+    return [UserPreferences(
+        user_id=f"user{index}",
+        categories=rng.sample(CATEGORIES, rng.randint(0, 3)),
+        locations=rng.sample(LOCATIONS, rng.randint(0, 3)),
+        email=f"user{index}@example.com"
+    ) for index in range(count)]
+
+def make_listing_page(cards: int, seed: int = 42) -> str:
+    """Build a listing page with navigation chrome and the given number of cards"""
+    rng = random.Random(seed)
+    parts = ["<html><head><title>Events</title></head><body>",
+             "<nav>" + "".join(f"<a href='/p{i}'>Page {i}</a>" for i in range(50)) + "</nav>"]
+    for index in range(cards):
+        parts.append(CARD_TEMPLATE.format(
+            title=" ".join(rng.choices(WORDS, k=3)).title(),
+            description=" ".join(rng.choices(WORDS, k=25)),
+            month=rng.randint(1, 12),
+            day=rng.randint(1, 28),
+            location=rng.choice(["Downtown Hub", "City Park", "Library", "Town Hall"]),
+            category=rng.choice(["Technology", "Music", "Arts"]),
+            index=index
+        ))
+        parts.append("<div class='sidebar'><p>" + " ".join(rng.choices(WORDS, k=40)) + "</p></div>")
+    parts.append("</body></html>")
+    return "".join(parts)
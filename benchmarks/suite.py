@@ -0,0 +1,230 @@
+"""
+Time the hot paths on seeded synthetic inputs and compare with a baseline.
+
+Usage:
+    python -m benchmarks.suite [--scale quick|full] [--filter TEXT] [--output results.json]
+    python -m benchmarks.suite --baseline baseline.json [--threshold 0.15]
+    python -m benchmarks.suite --compare baseline.json results.json
+
+A case regresses when its best time is more than threshold slower than in
+the baseline; the exit status is then 1. Baselines are only comparable when
+taken on the same machine and Python version.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from benchmarks.generators import make_events, make_listing_page, make_users
+from src.models.event import Event
+from src.services.batch_matcher import match_users
+from src.services.email_renderer import EmailRenderer
+from src.services.event_processor import EventProcessor
+from src.sources.web_scraper import CommunityWebScraper
+
+SCALES = ('quick', 'full')
+
+@dataclass
+class Case:
+    """
+    A benchmark: setup builds the inputs once and returns the function to
+    time. operations is how many items one call handles, for per-item times.
+    prepare, if set, runs untimed before every repeat, e.g. to drop caches.
+    """
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    operations: int = 1
+    prepare: Optional[Callable[[], None]] = None
+    params: Dict[str, object] = field(default_factory=dict)
+
+def time_case(case: Case, repeat: int) -> Dict[str, float]:
+    """Best and median seconds of repeat calls"""
+    func = case.setup()
+    times = []
+    for _ in range(repeat):
+        if case.prepare is not None:
+            case.prepare()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    best = min(times)
+    return {
+        'seconds': best,
+        'median': statistics.median(times),
+        'operations': case.operations,
+        'per_operation_us': best / case.operations * 1e6,
+        'repeat': repeat,
+        'params': case.params,
+    }
+
+def parse_case(cards: int) -> Case:
+    scraper = CommunityWebScraper("http://example.com/events")
+    html = make_listing_page(cards)
+    return Case(f"scraper.parse_page[cards={cards}]", lambda: lambda: scraper.parse_page(html),
+                operations=cards, params={'cards': cards, 'parser': scraper.parser_name})
+
+def matching_case(users: int, events: int) -> Case:
+    def setup():
+        processor = EventProcessor({})
+        processor.update_events(make_events(events))
+        population = make_users(users)
+        return lambda: [processor.get_matching_events(user) for user in population]
+    return Case(f"processor.get_matching_events[users={users},events={events}]", setup,
+                operations=users, params={'users': users, 'events': events})
+
+def batch_matching_case(users: int, events: int) -> Case:
+    def setup():
+        population, event_list = make_users(users), make_events(events)
+        return lambda: match_users(population, event_list)
+    return Case(f"batch_matcher.match_users[users={users},events={events}]", setup,
+                operations=users, params={'users': users, 'events': events})
+
+def update_case(events: int) -> Case:
+    processor = EventProcessor({})
+    first, second = make_events(events, seed=1), make_events(events, seed=2)
+    # Every repeat starts from the first fetch and diffs a full change set
+    return Case(f"processor.update_events[events={events}]",
+                lambda: lambda: processor.update_events(second), operations=events,
+                prepare=lambda: processor.update_events(first), params={'events': events})
+
+def search_case(events: int) -> Case:
+    processor = EventProcessor({})
+    processor.update_events(make_events(events))
+    queries = ["jazz", "python workshop", "community night", "art festival meetup"]
+    return Case(f"processor.search[events={events}]",
+                lambda: lambda: [processor.search(query) for query in queries],
+                operations=len(queries), params={'events': events})
+
+def render_cases(events: int) -> List[Case]:
+    processor = EventProcessor({})
+    digest = make_events(events)
+    cold = Case(f"processor._format_email_body[events={events},cache=cold]",
+                lambda: lambda: processor._format_email_body(digest), operations=events,
+                prepare=lambda: setattr(processor, '_renderer', EmailRenderer()),
+                params={'events': events, 'cache': 'cold'})
+    warm = Case(f"processor._format_email_body[events={events},cache=warm]",
+                lambda: lambda: processor._format_email_body(digest), operations=events,
+                prepare=lambda: processor._format_email_body(digest),
+                params={'events': events, 'cache': 'warm'})
+    return [cold, warm]
+
+def serialization_cases(events: int) -> List[Case]:
+    event_list = make_events(events)
+    dicts = [event.to_dict() for event in event_list]
+    copies: List[dict] = []
+
+    def refill():
+        # from_dict parses the date in place, so give every repeat fresh dicts
+        copies[:] = [dict(data) for data in dicts]
+    to_dict = Case(f"event.to_dict[events={events}]",
+                   lambda: lambda: [event.to_dict() for event in event_list],
+                   operations=events, params={'events': events})
+    from_dict = Case(f"event.from_dict[events={events}]",
+                     lambda: lambda: [Event.from_dict(data) for data in copies],
+                     operations=events, prepare=refill, params={'events': events})
+    return [to_dict, from_dict]
+
+def build_cases(scale: str) -> List[Case]:
+    """The benchmark cases at a scale; full adds larger inputs to quick"""
+    matching = [(100, 1000), (1000, 1000), (1000, 10000)]
+    batch = [(10000, 1000)]
+    sizes = [1000]
+    if scale == 'full':
+        matching += [(10000, 10000), (10000, 50000)]
+        batch += [(100000, 5000)]
+        sizes += [10000]
+
+    cases = [parse_case(cards) for cards in [size // 2 for size in sizes]]
+    cases += [matching_case(users, events) for users, events in matching]
+    cases += [batch_matching_case(users, events) for users, events in batch]
+    for size in sizes:
+        cases.append(update_case(size))
+        cases.append(search_case(size))
+        cases += render_cases(size)
+        cases += serialization_cases(size)
+    return cases
+
+def run(cases: List[Case], repeat: int, scale: str) -> dict:
+    """Time every case, printing progress, and return the results document"""
+    results = {}
+    for case in cases:
+        result = time_case(case, repeat)
+        results[case.name] = result
+        print(f"{case.name:<66} {result['seconds'] * 1000:10.2f} ms "
+              f"{result['per_operation_us']:10.2f} us/op", flush=True)
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scale': scale,
+        'results': results,
+    }
+
+def compare(baseline: dict, current: dict, threshold: float) -> Tuple[List[str], List[str]]:
+    """
+    Compare best times case by case, printing a table.
+    Returns the names of regressed and improved cases.
+    """
+    regressed, improved = [], []
+    for name, result in current['results'].items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            print(f"{name:<66} {'new':>10}")
+            continue
+        ratio = result['seconds'] / previous['seconds'] if previous['seconds'] > 0 else 1.0
+        if ratio > 1 + threshold:
+            status = "REGRESSED"
+            regressed.append(name)
+        elif ratio < 1 / (1 + threshold):
+            status = "improved"
+            improved.append(name)
+        else:
+            status = ""
+        print(f"{name:<66} {ratio:9.2f}x {status}")
+    for name in baseline['results'].keys() - current['results'].keys():
+        print(f"{name:<66} {'missing':>10}")
+    return regressed, improved
+
+def load(path: str) -> dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', choices=SCALES, default='quick')
+    parser.add_argument('--filter', help="only run cases whose name contains this text")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help="save the results as JSON, e.g. as a new baseline")
+    parser.add_argument('--baseline', help="compare the results with this JSON baseline")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'RESULTS'),
+                        help="compare two saved results without running anything")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="relative slowdown reported as a regression (default 0.15)")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        baseline, current = (load(path) for path in args.compare)
+    else:
+        cases = build_cases(args.scale)
+        if args.filter:
+            cases = [case for case in cases if args.filter in case.name]
+        current = run(cases, args.repeat, args.scale)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(current, f, indent=1, sort_keys=True)
+        if not args.baseline:
+            return 0
+        baseline = load(args.baseline)
+
+    print(f"\nCompared with baseline from {baseline.get('created')} "
+          f"(Python {baseline.get('python')}), threshold {args.threshold:.0%}")
+    regressed, improved = compare(baseline, current, args.threshold)
+    print(f"{len(regressed)} regressed, {len(improved)} improved")
+    return 1 if regressed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,52 @@
 import os
-import time
-import schedule
+import threading
+from datetime import timedelta
 from typing import List
 from dotenv import load_dotenv
 from src.models.event import Event
 from src.models.user_preferences import UserPreferences
+from src.sources.base import EventSource
+from src.sources.http_cache import HTTPCache
+from src.sources.site_config import load_site_configs
 from src.sources.web_scraper import CommunityWebScraper
+from src.services.dashboard import create_app
+from src.services.deduplicator import EventDeduplicator
+from src.services.email_delivery import EmailDeliveryPipeline, SMTPConnectionPool
 from src.services.event_processor import EventProcessor
+from src.services.event_repository import EventRepository
+from src.services.fetch_orchestrator import FetchOrchestrator
+from src.services.geo import Gazetteer
+from src.services.metrics import start_metrics_server, write_metrics
+from src.services.parse_stage import ParseStage
+from src.services.polling_policy import AdaptivePolling
+from src.services.refresh_pipeline import RefreshPipeline
+from src.services.scheduler import Scheduler
+from src.services.scraper_engine import MultiSiteScraperEngine
 
 # Load environment variables
 load_dotenv()
 
-def create_event_sources() -> List[CommunityWebScraper]:
+def create_event_sources(http_cache: HTTPCache = None,
+                         parse_stage: ParseStage = None) -> List[EventSource]:
     """Initialize event sources"""
     sources = [
-        CommunityWebScraper(os.getenv('COMMUNITY_EVENTS_URL', 'http://example.com/events'))
+        CommunityWebScraper(
+            os.getenv('COMMUNITY_EVENTS_URL', 'http://example.com/events'),
+            http_cache=http_cache
+        )
         # Add more sources here as needed
     ]
+    
+    # Additional community sites described by selector configs
+    sites_config = os.getenv('SCRAPER_SITES_CONFIG')
+    if sites_config:
+        sources.append(MultiSiteScraperEngine(
+            load_site_configs(sites_config),
+            max_workers=int(os.getenv('SCRAPER_MAX_WORKERS', '32')),
+            http_cache=http_cache,
+            parse_stage=parse_stage,
+            site_timeout=float(os.getenv('SCRAPER_SITE_TIMEOUT', '20'))
+        ))
     return sources
 
 def load_user_preferences() -> List[UserPreferences]:
@@ -39,56 +69,138 @@ def setup_event_processor() -> EventProcessor:
         'username': os.getenv('SMTP_USERNAME', ''),
         'password': os.getenv('SMTP_PASSWORD', '')
     }
-    return EventProcessor(smtp_config)
+    pool = SMTPConnectionPool(
+        smtp_config,
+        size=int(os.getenv('SMTP_POOL_SIZE', '4'))
+    )
+    delivery = EmailDeliveryPipeline(
+        pool,
+        workers=pool.size,
+        queue_size=int(os.getenv('SMTP_QUEUE_SIZE', '1000'))
+    )
+    # An empty EVENT_DB_URL keeps events in memory, snapshotted to disk
+    db_url = os.getenv('EVENT_DB_URL', 'sqlite:///events.db')
+    repository = EventRepository(db_url) if db_url else None
+    gazetteer_path = os.getenv('GAZETTEER_PATH')
+    return EventProcessor(
+        smtp_config,
+        delivery=delivery,
+        repository=repository,
+        snapshot_path=os.getenv('EVENT_SNAPSHOT_PATH', '.event_snapshot'),
+        retain_past=timedelta(hours=float(os.getenv('RETAIN_PAST_HOURS', '0'))),
+        gazetteer=Gazetteer(gazetteer_path) if gazetteer_path else None
+    )
+
+def setup_parse_stage() -> ParseStage:
+    """Initialize the process pool used for CPU-bound page parsing"""
+    workers = os.getenv('PARSE_WORKERS')
+    return ParseStage(int(workers) if workers else None)
+
+def setup_fetch_orchestrator(parse_stage: ParseStage = None) -> FetchOrchestrator:
+    """Initialize the concurrent source fetcher"""
+    return FetchOrchestrator(
+        max_workers=int(os.getenv('FETCH_MAX_WORKERS', '8')),
+        source_timeout=float(os.getenv('FETCH_SOURCE_TIMEOUT', '30')),
+        deadline=float(os.getenv('FETCH_DEADLINE', '120')),
+        parse_stage=parse_stage
+    )
+
+def setup_polling_policy() -> AdaptivePolling:
+    """Initialize per-source polling intervals adapted to each source's change rate"""
+    return AdaptivePolling(
+        min_interval=float(os.getenv('SOURCE_MIN_INTERVAL_SECONDS', '300')),
+        max_interval=float(os.getenv('SOURCE_MAX_INTERVAL_SECONDS', '86400')),
+        initial_interval=float(os.getenv('SOURCE_INTERVAL_SECONDS', '3600')),
+        target_change=float(os.getenv('SOURCE_TARGET_CHANGE', '0.1'))
+    )
 
-def process_events(sources: List[CommunityWebScraper], 
+def process_events(sources: List[EventSource], 
                   processor: EventProcessor,
-                  users: List[UserPreferences]):
+                  users: List[UserPreferences],
+                  fetcher: FetchOrchestrator = None,
+                  deduplicator: EventDeduplicator = None,
+                  http_cache: HTTPCache = None):
     """Fetch and process events for all users"""
-    print("Fetching and processing events...")
-    
-    # Fetch events from all sources
-    all_events = []
-    for source in sources:
-        try:
-            events = source.fetch_events()
-            all_events.extend(events)
-        except Exception as e:
-            print(f"Error fetching events from source: {e}")
-    
-    # Update processor's event cache
-    processor.update_events(all_events)
-    
-    # Process events for each user
-    for user in users:
-        matching_events = processor.get_matching_events(user)
-        if matching_events and user.notification_preferences.get('email'):
-            processor.send_email_notification(user, matching_events)
+    RefreshPipeline(
+        sources, processor, users,
+        fetcher=fetcher or setup_fetch_orchestrator(),
+        deduplicator=deduplicator,
+        http_cache=http_cache
+    ).run_once()
+
+def setup_scheduler(pipeline: RefreshPipeline, initial_delay: float) -> Scheduler:
+    """Schedule source fetches, cache refreshes and digest batches independently"""
+    scheduler = Scheduler(workers=int(os.getenv('SCHEDULER_WORKERS', '4')))
+    pipeline.schedule(
+        scheduler,
+        source_interval=float(os.getenv('SOURCE_INTERVAL_SECONDS', '3600')),
+        refresh_interval=float(os.getenv('REFRESH_INTERVAL_SECONDS', '300')),
+        digest_interval=float(os.getenv('DIGEST_INTERVAL_SECONDS', '3600')),
+        digest_batch_size=int(os.getenv('DIGEST_BATCH_SIZE', '500')),
+        jitter=float(os.getenv('SCHEDULE_JITTER_SECONDS', '60')),
+        initial_delay=initial_delay
+    )
+    return scheduler
+
+def setup_metrics(scheduler: Scheduler):
+    """Export pipeline metrics over HTTP and/or to a file, as configured"""
+    port = os.getenv('METRICS_PORT')
+    if port:
+        host = os.getenv('METRICS_HOST', '127.0.0.1')
+        start_metrics_server(int(port), host)
+        print(f"Serving metrics on {host}:{port}")
+    path = os.getenv('METRICS_FILE')
+    if path:
+        scheduler.add_job('metrics', lambda: write_metrics(path),
+                          interval=float(os.getenv('METRICS_EXPORT_INTERVAL_SECONDS', '15')))
+
+def setup_dashboard(processor: EventProcessor, users: List[UserPreferences]):
+    """Serve the dashboard read API from a background thread when a port is configured"""
+    port = os.getenv('DASHBOARD_PORT')
+    if not port:
+        return
+    app = create_app(
+        processor, users,
+        page_size=int(os.getenv('DASHBOARD_PAGE_SIZE', '50')),
+        cache_size=int(os.getenv('DASHBOARD_CACHE_SIZE', '1024'))
+    )
+    threading.Thread(
+        target=app.run,
+        kwargs={'host': os.getenv('DASHBOARD_HOST', '127.0.0.1'), 'port': int(port),
+                'threaded': True, 'use_reloader': False},
+        name="dashboard", daemon=True
+    ).start()
+    print(f"Serving the dashboard API on port {port}")
 
 def main():
     """Main application entry point"""
     print("Starting the Community Event Aggregator...")
     
     # Initialize components
-    sources = create_event_sources()
+    http_cache = HTTPCache(os.getenv('HTTP_CACHE_DIR', '.http_cache'))
+    parse_stage = setup_parse_stage()
+    sources = create_event_sources(http_cache, parse_stage)
     processor = setup_event_processor()
     users = load_user_preferences()
+    fetcher = setup_fetch_orchestrator(parse_stage)
+    pipeline = RefreshPipeline(sources, processor, users, fetcher=fetcher,
+                               http_cache=http_cache, polling=setup_polling_policy())
     
-    # Schedule event processing
-    schedule.every(1).hours.do(
-        process_events, 
-        sources=sources, 
-        processor=processor, 
-        users=users
-    )
+    setup_dashboard(processor, users)
     
-    # Initial run
-    process_events(sources, processor, users)
+    # With events from the previous run we can serve them straight away and
+    # let the scheduled fetches catch up; otherwise do a full run first
+    if processor.warm_start():
+        print("Warm start from stored events, refreshing in the background")
+        initial_delay = 0.0
+    else:
+        pipeline.run_once()
+        initial_delay = float(os.getenv('SOURCE_INTERVAL_SECONDS', '3600'))
     
     # Keep the script running
-    while True:
-        schedule.run_pending()
-        time.sleep(60)
+    scheduler = setup_scheduler(pipeline, initial_delay)
+    setup_metrics(scheduler)
+    scheduler.run_forever()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
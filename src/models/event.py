@@ -1,9 +1,18 @@
+import sys
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import List
 
-@dataclass
+# Low-cardinality fields shared by many events
+CATEGORICAL_FIELDS = ('location', 'category', 'source')
+
+@dataclass(slots=True)
 class Event:
-    """Represents a community event"""
+    """
+    Represents a community event.
+    Slotted, with categorical fields interned, so large caches do not pay
+    for a __dict__ and a private copy of every repeated string per event.
+    """
     id: str
     title: str
     description: str
@@ -13,6 +22,18 @@ class Event:
     source: str
     url: str = None
     image_url: str = None
+    source_urls: List[str] = field(default_factory=list)  # URLs of merged duplicates
+    
+    def __post_init__(self):
+        for name in CATEGORICAL_FIELDS:
+            value = getattr(self, name)
+            if type(value) is str:
+                setattr(self, name, sys.intern(value))
+    
+    @property
+    def key(self):
+        """Identity of the event across refreshes"""
+        return (self.source, self.id)
     
     def to_dict(self):
         """Convert event to dictionary format"""
@@ -25,9 +46,22 @@ class Event:
             'category': self.category,
             'source': self.source,
             'url': self.url,
-            'image_url': self.image_url
+            'image_url': self.image_url,
+            'source_urls': list(self.source_urls)
         }
     
+    def to_tuple(self) -> tuple:
+        """Compact positional form, cheap to pickle between processes"""
+        return (self.id, self.title, self.description, self.date, self.location,
+                self.category, self.source, self.url, self.image_url,
+                tuple(self.source_urls))
+    
+    @classmethod
+    def from_tuple(cls, data: tuple):
+        """Create an Event instance from the output of to_tuple"""
+        *fields, source_urls = data
+        return cls(*fields, source_urls=list(source_urls))
+    
     @classmethod
     def from_dict(cls, data: dict):
         """Create an Event instance from a dictionary"""
@@ -0,0 +1,131 @@
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from src.models.event import Event
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+class DictionaryColumn:
+    """Column of repeated values stored once, with a small integer code per row"""
+
+    def __init__(self):
+        self.values: List[object] = []
+        self.codes = array('I')
+        self._lookup: Dict[object, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int):
+        return self.values[self.codes[index]]
+
+    def append(self, value):
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def codes_for(self, values: Iterable) -> Set[int]:
+        """Codes of the given values that occur in the column"""
+        return {self._lookup[value] for value in values if value in self._lookup}
+
+class EventBatch:
+    """
+    Columnar, append-only store of events.
+    Dates are kept as 64-bit microsecond offsets and location, category and
+    source are dictionary-encoded, so each row costs a few machine words plus
+    its free-text fields. Rows read back as ordinary Event objects.
+    """
+
+    def __init__(self, events: Iterable[Event] = ()):
+        self._ids: List[str] = []
+        self._titles: List[str] = []
+        self._descriptions: List[str] = []
+        self._dates = array('q')
+        self._timezones = DictionaryColumn()
+        self._locations = DictionaryColumn()
+        self._categories = DictionaryColumn()
+        self._sources = DictionaryColumn()
+        self._urls: List[Optional[str]] = []
+        self._image_urls: List[Optional[str]] = []
+        # Only merged events carry source URLs, so store them sparsely by row
+        self._source_urls: Dict[int, Tuple[str, ...]] = {}
+        self.extend(events)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, index: int) -> Event:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("EventBatch index out of range")
+        return Event(
+            id=self._ids[index],
+            title=self._titles[index],
+            description=self._descriptions[index],
+            date=self.date(index),
+            location=self._locations[index],
+            category=self._categories[index],
+            source=self._sources[index],
+            url=self._urls[index],
+            image_url=self._image_urls[index],
+            source_urls=list(self._source_urls.get(index, ()))
+        )
+
+    def __iter__(self) -> Iterator[Event]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def append(self, event: Event):
+        """Add an event as a new row"""
+        date = event.date
+        self._ids.append(event.id)
+        self._titles.append(event.title)
+        self._descriptions.append(event.description)
+        self._timezones.append(date.tzinfo)
+        self._dates.append((date.replace(tzinfo=None) - EPOCH) // MICROSECOND)
+        self._locations.append(event.location)
+        self._categories.append(event.category)
+        self._sources.append(event.source)
+        self._urls.append(event.url)
+        self._image_urls.append(event.image_url)
+        if event.source_urls:
+            self._source_urls[len(self._ids) - 1] = tuple(event.source_urls)
+
+    def extend(self, events: Iterable[Event]):
+        """Add several events"""
+        for event in events:
+            self.append(event)
+
+    def date(self, index: int) -> datetime:
+        """Date of one row, without materializing the event"""
+        date = EPOCH + self._dates[index] * MICROSECOND
+        tzinfo = self._timezones[index]
+        return date if tzinfo is None else date.replace(tzinfo=tzinfo)
+
+    def key(self, index: int) -> Tuple[str, str]:
+        """(source, id) of one row, as Event.key"""
+        return (self._sources[index], self._ids[index])
+
+    def match(self, categories: Iterable[str], locations: Iterable[str]) -> List[int]:
+        """
+        Row numbers of events matching the filters, by comparing codes.
+        Like UserPreferences.matches_event, an empty filter matches everything.
+        """
+        rows = range(len(self))
+        if categories:
+            wanted = self._categories.codes_for(categories)
+            codes = self._categories.codes
+            rows = [row for row in rows if codes[row] in wanted]
+        if locations:
+            wanted = self._locations.codes_for(locations)
+            codes = self._locations.codes
+            rows = [row for row in rows if codes[row] in wanted]
+        return list(rows)
+
+    def to_events(self) -> List[Event]:
+        """Materialize every row"""
+        return list(self)
@@ -30,14 +30,21 @@ class UserPreferences:
         """Create a UserPreferences instance from a dictionary"""
         return cls(**data)
     
-    def matches_event(self, event) -> bool:
-        """Check if an event matches user preferences"""
+    def matches_event(self, event, gazetteer=None) -> bool:
+        """
+        Check if an event matches user preferences.
+        With a gazetteer, locations match within max_distance km of any of
+        the user's locations; otherwise they must match by name.
+        """
         # Category matching
         if self.categories and event.category not in self.categories:
             return False
             
-        # Location matching (basic implementation)
-        if self.locations and event.location not in self.locations:
-            return False
+        # Location matching
+        if self.locations:
+            if gazetteer is None:
+                return event.location in self.locations
+            return any(gazetteer.within(location, event.location, self.max_distance)
+                       for location in self.locations)
             
         return True
\ No newline at end of file
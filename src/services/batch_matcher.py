@@ -0,0 +1,171 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+import numpy as np
+import pandas as pd
+from src.models.event import Event
+from src.models.user_preferences import UserPreferences
+from src.services.geo import Gazetteer, GeoIndex
+
+# Upper bound on the cells of any dense users x events (or pairs, values) array
+BLOCK_CELLS = 1 << 24
+
+@dataclass
+class MatchMatrix:
+    """
+    Sparse user x event match matrix in CSR form: the events matched by
+    user_ids[row] are events[indices[indptr[row]:indptr[row + 1]]].
+    """
+    user_ids: List[str]
+    events: List[Event]
+    indptr: np.ndarray
+    indices: np.ndarray
+    _rows: Dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._rows = {user_id: row for row, user_id in enumerate(self.user_ids)}
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (len(self.user_ids), len(self.events))
+
+    @property
+    def nnz(self) -> int:
+        """Number of (user, event) matches"""
+        return len(self.indices)
+
+    def row(self, user_id: str) -> np.ndarray:
+        """Event columns matched by one user, in event order"""
+        row = self._rows[user_id]
+        return self.indices[self.indptr[row]:self.indptr[row + 1]]
+
+    def events_for(self, user_id: str) -> List[Event]:
+        """Events matched by one user, in event order"""
+        return [self.events[column] for column in self.row(user_id)]
+
+    def to_digests(self) -> Dict[str, List[Event]]:
+        """Matched events per user, omitting users without matches"""
+        digests = {}
+        for row, user_id in enumerate(self.user_ids):
+            start, end = self.indptr[row], self.indptr[row + 1]
+            if start != end:
+                digests[user_id] = [self.events[column] for column in self.indices[start:end]]
+        return digests
+
+    def to_coo(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(rows, columns) of every match"""
+        rows = np.repeat(np.arange(len(self.user_ids)), np.diff(self.indptr))
+        return rows, self.indices
+
+    def to_dense(self) -> np.ndarray:
+        """Boolean users x events matrix; only sensible for small inputs"""
+        dense = np.zeros(self.shape, dtype=bool)
+        dense[self.to_coo()] = True
+        return dense
+
+    def to_scipy(self):
+        """The matrix as a scipy.sparse.csr_matrix (requires scipy)"""
+        from scipy.sparse import csr_matrix
+        data = np.ones(self.nnz, dtype=bool)
+        return csr_matrix((data, self.indices, self.indptr), shape=self.shape)
+
+def event_frame(events: Sequence[Event]) -> pd.DataFrame:
+    """Columnar view of events with category and location as categoricals"""
+    return pd.DataFrame({
+        'category': pd.Categorical([event.category for event in events]),
+        'location': pd.Categorical([event.location for event in events]),
+    })
+
+def membership_bitmap(selections: Sequence[Iterable[str]], values: pd.Index) -> np.ndarray:
+    """
+    users x values boolean matrix of which values each user selected.
+    Like UserPreferences.matches_event, an empty selection selects everything.
+    """
+    codes = {value: code for code, value in enumerate(values)}
+    bitmap = np.zeros((len(selections), len(values)), dtype=bool)
+    rows, columns, unfiltered = [], [], []
+    for row, selected in enumerate(selections):
+        if not selected:
+            unfiltered.append(row)
+            continue
+        for value in set(selected):
+            code = codes.get(value)
+            if code is not None:
+                rows.append(row)
+                columns.append(code)
+    bitmap[rows, columns] = True
+    bitmap[unfiltered] = True
+    return bitmap
+
+def nearby_locations(users: Sequence[UserPreferences], values: pd.Index,
+                     gazetteer: Gazetteer) -> List[Set[str]]:
+    """
+    Each user's locations widened to every event location within the user's
+    max_distance, so radius matching reduces to the same bitmap lookup.
+    """
+    places = GeoIndex()
+    for value in values:
+        coordinates = gazetteer.lookup(value)
+        if coordinates is not None:
+            places.add(value, coordinates)
+
+    nearby: Dict[Tuple[str, float], Set[str]] = {}
+    selections = []
+    for user in users:
+        selected = set(user.locations)
+        for location in user.locations:
+            cache_key = (location, user.max_distance)
+            if cache_key not in nearby:
+                center = gazetteer.lookup(location)
+                nearby[cache_key] = (places.query(center, user.max_distance)
+                                     if center is not None else set())
+            selected |= nearby[cache_key]
+        selections.append(selected)
+    return selections
+
+def match_users(users: Sequence[UserPreferences], events: Sequence[Event],
+                gazetteer: Gazetteer = None) -> MatchMatrix:
+    """
+    Match every user against every event with vectorized boolean operations.
+    With a gazetteer, locations match within each user's max_distance.
+    """
+    users = list(users)
+    events = list(events)
+    user_ids = [user.user_id for user in users]
+    if not users or not events:
+        return MatchMatrix(user_ids, events, np.zeros(len(users) + 1, dtype=np.int64),
+                           np.zeros(0, dtype=np.int64))
+
+    frame = event_frame(events)
+    categories = frame['category'].cat
+    locations = frame['location'].cat
+    category_selections = [user.categories for user in users]
+    if gazetteer is None:
+        location_selections = [user.locations for user in users]
+    else:
+        location_selections = nearby_locations(users, locations.categories, gazetteer)
+
+    # Events sharing a (category, location) pair match exactly the same users,
+    # so match users against the distinct pairs and expand afterwards
+    location_count = len(locations.categories)
+    pair_codes = (categories.codes.to_numpy(np.int64) * location_count
+                  + locations.codes.to_numpy(np.int64))
+    pairs, pair_of_event = np.unique(pair_codes, return_inverse=True)
+    pair_categories, pair_locations = pairs // location_count, pairs % location_count
+
+    # Work through a block of users at a time, so no dense array ever has more
+    # than about BLOCK_CELLS cells however many users there are. nonzero walks
+    # each block row by row, so columns come out grouped by user in event order
+    block = max(1, BLOCK_CELLS // len(events))
+    row_lengths, blocks = [], []
+    for start in range(0, len(users), block):
+        end = start + block
+        category_bitmap = membership_bitmap(category_selections[start:end],
+                                            categories.categories)
+        location_bitmap = membership_bitmap(location_selections[start:end],
+                                            locations.categories)
+        pair_matches = category_bitmap[:, pair_categories] & location_bitmap[:, pair_locations]
+        rows, columns = np.nonzero(pair_matches[:, pair_of_event])
+        row_lengths.append(np.bincount(rows, minlength=len(pair_matches)))
+        blocks.append(columns)
+    indptr = np.concatenate(([0], np.cumsum(np.concatenate(row_lengths)))).astype(np.int64)
+    return MatchMatrix(user_ids, events, indptr, np.concatenate(blocks).astype(np.int64))
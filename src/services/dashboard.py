@@ -0,0 +1,201 @@
+import base64
+import binascii
+import hashlib
+import json
+import threading
+import uuid
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Hashable, List, Optional, Tuple
+from flask import Flask, Response, jsonify, request
+from src.models.event import Event
+from src.models.user_preferences import UserPreferences
+from src.services.event_processor import EventDiff, EventProcessor
+from src.services.time_index import sort_date
+
+# (date, source, id): the order events are paged in
+SortKey = Tuple[datetime, str, str]
+
+def sort_key(event: Event) -> SortKey:
+    return (sort_date(event.date), event.source, event.id)
+
+def encode_cursor(key: SortKey) -> str:
+    """Opaque cursor pointing just after an event"""
+    data = json.dumps([key[0].isoformat(), key[1], key[2]]).encode('utf-8')
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str) -> SortKey:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        when, source, event_id = json.loads(data)
+        return (datetime.fromisoformat(when), str(source), str(event_id))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+class LRUCache:
+    """Thread-safe mapping that forgets its least recently used entries"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class DashboardFeed:
+    """
+    Pages of a user's matching events, in date order.
+    Each user's matches are computed once per cache generation and paged
+    through by keyset, and rendered pages are kept in an LRU cache. Both
+    caches are dropped whenever the processor's events change.
+    """
+
+    def __init__(self, processor: EventProcessor, cache_size: int = 1024):
+        self.processor = processor
+        # Distinguishes generations of this process from those of a previous run
+        self.instance = uuid.uuid4().hex[:8]
+        self._matches = LRUCache(cache_size)
+        self.pages = LRUCache(cache_size)
+        processor.add_update_listener(self.invalidate)
+
+    @property
+    def version(self) -> str:
+        """Changes whenever the events served may have changed"""
+        return self.version_at(self.processor.generation)
+
+    def version_at(self, generation: int) -> str:
+        return f"{self.instance}-{generation}"
+
+    def invalidate(self, diff: EventDiff = None):
+        """Forget cached matches and pages"""
+        self._matches.clear()
+        self.pages.clear()
+
+    def etag(self, generation: int, user_id: str, after: Optional[str], limit: int) -> str:
+        """
+        Entity tag of one page at a generation. A request reads the generation
+        once and passes it to etag, page and matches, so an update landing
+        mid-request cannot pair one generation's tag with another's events.
+        """
+        text = "\x1f".join([self.version_at(generation), user_id, after or "", str(limit)])
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=12).hexdigest()
+
+    def matches(self, user: UserPreferences,
+                generation: int) -> Tuple[List[SortKey], List[Event]]:
+        """The user's matching events and their sort keys, in date order"""
+        cache_key = (generation, user.user_id)
+        cached = self._matches.get(cache_key)
+        if cached is None:
+            events = sorted(self.processor.get_matching_events(user), key=sort_key)
+            cached = ([sort_key(event) for event in events], events)
+            self._matches.put(cache_key, cached)
+        return cached
+
+    def page(self, user: UserPreferences, after: Optional[str], limit: int,
+             generation: int) -> Tuple[List[Event], Optional[str]]:
+        """Up to limit events following the cursor, and the cursor of the next page"""
+        keys, events = self.matches(user, generation)
+        start = bisect_right(keys, decode_cursor(after)) if after else 0
+        end = min(start + limit, len(events))
+        next_cursor = encode_cursor(keys[end - 1]) if end < len(events) else None
+        return events[start:end], next_cursor
+
+def create_app(processor: EventProcessor, users: List[UserPreferences],
+               page_size: int = 50, max_page_size: int = 200,
+               cache_size: int = 1024) -> Flask:
+    """
+    Read API for the dashboard:
+    GET /api/users/<user_id>/events?limit=N&after=CURSOR returns a page of the
+    user's matching events with the cursor of the next page. Responses carry
+    an ETag, so unchanged pages are answered with 304 Not Modified.
+    """
+    app = Flask(__name__)
+    feed = DashboardFeed(processor, cache_size)
+    users_by_id: Dict[str, UserPreferences] = {user.user_id: user for user in users}
+    app.extensions['dashboard_feed'] = feed
+
+    @app.get('/api/users/<user_id>/events')
+    def user_events(user_id: str):
+        user = users_by_id.get(user_id)
+        if user is None:
+            return jsonify(error=f"Unknown user {user_id}"), 404
+        if not user.notification_preferences.get('dashboard', True):
+            return jsonify(error="Dashboard is disabled for this user"), 403
+        try:
+            limit = int(request.args.get('limit', page_size))
+        except ValueError:
+            return jsonify(error="limit must be an integer"), 400
+        if not 1 <= limit <= max_page_size:
+            return jsonify(error=f"limit must be between 1 and {max_page_size}"), 400
+        after = request.args.get('after') or None
+
+        generation = processor.generation
+        etag = feed.etag(generation, user_id, after, limit)
+        if request.if_none_match.contains(etag):
+            return not_modified(etag)
+
+        body = feed.pages.get(etag)
+        if body is None:
+            try:
+                events, next_cursor = feed.page(user, after, limit, generation)
+            except ValueError as e:
+                return jsonify(error=str(e)), 400
+            body = json.dumps({
+                'events': [event.to_dict() for event in events],
+                'next': next_cursor,
+                'version': feed.version_at(generation),
+            }, separators=(',', ':'))
+            feed.pages.put(etag, body)
+        return cached_response(body, etag)
+
+    @app.get('/api/status')
+    def status():
+        last_update = processor._last_update
+        return jsonify(
+            version=feed.version,
+            last_update=last_update.isoformat() if last_update else None,
+            page_cache={'size': len(feed.pages), 'hits': feed.pages.hits,
+                        'misses': feed.pages.misses},
+        )
+
+    return app
+
+def cached_response(body: str, etag: str) -> Response:
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    # Clients may keep the page but must revalidate it, which is cheap
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def not_modified(etag: str) -> Response:
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
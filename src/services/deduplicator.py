@@ -0,0 +1,130 @@
+import re
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from difflib import SequenceMatcher
+from typing import Dict, List, Set, Tuple
+from src.models.event import Event
+from src.services.time_index import sort_date
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+_EPOCH = datetime(1970, 1, 1)
+
+# Venues sources fill in when they do not know one; they say nothing about
+# where an event is, so events there are blocked by title instead
+PLACEHOLDER_VENUES = frozenset({"", "tbd", "tba", "unknown"})
+
+def normalize_title(title: str) -> str:
+    """Lowercase a title and reduce it to space separated words"""
+    return " ".join(_NON_WORD.split((title or "").lower())).strip()
+
+def normalize_location(location: str) -> str:
+    """
+    Reduce a location to its venue name.
+    API sources format locations as "<venue> - <city>" while scrapers only
+    give the venue, so the city suffix is dropped before comparing.
+    """
+    venue = (location or "").lower().split(" - ")[0]
+    return " ".join(_NON_WORD.split(venue)).strip()
+
+@dataclass
+class Cluster:
+    """Events judged to be the same real-world event, first one canonical"""
+    title: str
+    start: datetime
+    order: int = 0
+    events: List[Event] = field(default_factory=list)
+    sources: Set[str] = field(default_factory=set)
+
+    def add(self, event: Event):
+        self.events.append(event)
+        self.sources.add(event.source)
+
+class EventDeduplicator:
+    """Merges the same real-world event reported by several sources"""
+
+    def __init__(self, title_threshold: float = 0.85,
+                 time_tolerance: timedelta = timedelta(minutes=30)):
+        self.title_threshold = title_threshold
+        self.time_tolerance = time_tolerance
+        self.last_merged = 0
+
+    def deduplicate(self, events: List[Event]) -> List[Event]:
+        """
+        Return events with duplicates merged, in order of first appearance.
+        Events are blocked by venue and by time buckets time_tolerance wide;
+        an event is only compared with clusters in its own and the two
+        neighbouring buckets, so the cost stays close to linear in the number
+        of events and duplicates either side of a bucket edge still meet.
+        Events at a placeholder venue are blocked by the first word of their
+        title instead. Duplicates must start within time_tolerance of each
+        other, and two events from the same source are never merged: a source
+        lists each of its events once, so same-titled listings there are
+        separate sessions.
+        """
+        width = max(self.time_tolerance, timedelta(seconds=1))
+        blocks: Dict[Tuple, List[Cluster]] = {}
+        clusters: List[Cluster] = []
+        for event in events:
+            start = sort_date(event.date)
+            title = normalize_title(event.title)
+            bucket = (start - _EPOCH) // width
+            place = self._block_place(event.location, title)
+            # Blocks hold clusters oldest first; join the oldest one that matches
+            match = None
+            for key in ((bucket - 1, place), (bucket, place), (bucket + 1, place)):
+                for cluster in blocks.get(key, ()):
+                    if match is not None and cluster.order > match.order:
+                        break
+                    if (event.source not in cluster.sources
+                            and abs(start - cluster.start) <= self.time_tolerance
+                            and self._similar(title, cluster.title)):
+                        match = cluster
+                        break
+            if match is None:
+                match = Cluster(title, start, len(clusters))
+                blocks.setdefault((bucket, place), []).append(match)
+                clusters.append(match)
+            match.add(event)
+
+        self.last_merged = len(events) - len(clusters)
+        return [self._merge(cluster.events) for cluster in clusters]
+
+    @staticmethod
+    def _block_place(location: str, title: str) -> Tuple[str, str]:
+        """The venue to block an event by, or its first title word without one"""
+        venue = normalize_location(location)
+        if venue in PLACEHOLDER_VENUES:
+            return ("", title.split(" ", 1)[0])
+        return (venue, "")
+
+    def _similar(self, title: str, other: str) -> bool:
+        """Fuzzy title comparison, using the cheap upper bounds first"""
+        if title == other:
+            return True
+        matcher = SequenceMatcher(None, title, other)
+        return (matcher.real_quick_ratio() >= self.title_threshold
+                and matcher.quick_ratio() >= self.title_threshold
+                and matcher.ratio() >= self.title_threshold)
+
+    @staticmethod
+    def _merge(cluster: List[Event]) -> Event:
+        """Combine duplicates into the first one, keeping every source URL"""
+        canonical = cluster[0]
+        if len(cluster) == 1:
+            return canonical
+
+        urls = []
+        for event in cluster:
+            for url in [event.url] + list(event.source_urls):
+                if url and url not in urls:
+                    urls.append(url)
+        description = max((event.description or "" for event in cluster), key=len)
+        return replace(
+            canonical,
+            description=description,
+            url=canonical.url or (urls[0] if urls else None),
+            image_url=canonical.image_url or next(
+                (event.image_url for event in cluster if event.image_url), None
+            ),
+            source_urls=urls
+        )
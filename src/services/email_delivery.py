@@ -0,0 +1,293 @@
+import queue
+import random
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from email.message import Message
+from typing import Callable, Dict, Iterator, List, Optional
+from src.services.metrics import EMAILS, timed
+
+# Errors that reject a single message but leave the connection usable
+PERMANENT_ERRORS = (
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPSenderRefused,
+    smtplib.SMTPDataError,
+)
+
+@dataclass
+class DeliveryMetrics:
+    """
+    Thread-safe counters for the delivery pipeline.
+    Throughput is measured over the time spent delivering, not since the
+    metrics were created, so the idle hours between digest batches don't
+    water it down.
+    """
+    sent: int = 0
+    failed: int = 0
+    retries: int = 0
+    connections_opened: int = 0
+    clock: Callable[[], float] = field(default=time.monotonic, repr=False, compare=False)
+    started_at: float = None
+    # Seconds in which at least one message was being delivered
+    active_seconds: float = 0.0
+    _active: int = field(default=0, repr=False, compare=False)
+    _active_since: float = field(default=0.0, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.started_at is None:
+            self.started_at = self.clock()
+
+    def increment(self, name: str, amount: int = 1):
+        """Increase a counter by amount"""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    @contextmanager
+    def delivering(self) -> Iterator[None]:
+        """Count the time spent in the block as active, however many workers overlap"""
+        with self._lock:
+            if not self._active:
+                self._active_since = self.clock()
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active -= 1
+                if not self._active:
+                    self.active_seconds += self.clock() - self._active_since
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the metrics were started"""
+        return self.clock() - self.started_at
+
+    @property
+    def active(self) -> float:
+        """Seconds spent delivering so far, including a window still open"""
+        with self._lock:
+            if self._active:
+                return self.active_seconds + self.clock() - self._active_since
+            return self.active_seconds
+
+    @property
+    def throughput(self) -> float:
+        """Messages delivered per second of delivery time"""
+        active = self.active
+        return self.sent / active if active > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        """Convert metrics to dictionary format"""
+        return {
+            'sent': self.sent,
+            'failed': self.failed,
+            'retries': self.retries,
+            'connections_opened': self.connections_opened,
+            'elapsed': self.elapsed,
+            'active_seconds': self.active,
+            'throughput': self.throughput
+        }
+
+class PooledConnection:
+    """An authenticated SMTP connection owned by a pool"""
+
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.messages_sent = 0
+        self.last_used = time.monotonic()
+
+    def send(self, msg: Message):
+        """Send one message over this connection"""
+        self.smtp.send_message(msg)
+        self.messages_sent += 1
+        self.last_used = time.monotonic()
+
+    def close(self):
+        """Close the connection, ignoring errors from dead sockets"""
+        try:
+            self.smtp.quit()
+        except Exception:
+            try:
+                self.smtp.close()
+            except Exception:
+                pass
+
+class SMTPConnectionPool:
+    """Pool of reusable, already authenticated SMTP connections"""
+
+    def __init__(self, smtp_config: Dict[str, str], size: int = 4, use_tls: bool = True,
+                 max_messages_per_connection: int = 100, max_idle: float = 60.0,
+                 timeout: float = 30.0, metrics: DeliveryMetrics = None):
+        """
+        smtp_config should contain: host, port, username, password.
+        Connections are recycled after max_messages_per_connection sends or
+        after sitting idle for max_idle seconds.
+        """
+        self.smtp_config = smtp_config
+        self.size = size
+        self.use_tls = use_tls
+        self.max_messages_per_connection = max_messages_per_connection
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.metrics = metrics or DeliveryMetrics()
+        self._idle: "queue.LifoQueue[PooledConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._closed = False
+
+    def acquire(self) -> PooledConnection:
+        """Take a connection from the pool, opening one if none are idle"""
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        self._slots.acquire()
+        try:
+            while True:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._connect()
+                if time.monotonic() - conn.last_used <= self.max_idle:
+                    return conn
+                # Servers drop idle sessions, so don't bother reusing stale ones
+                conn.close()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn: PooledConnection, broken: bool = False):
+        """Return a connection to the pool, discarding it if broken or worn out"""
+        try:
+            if (broken or self._closed
+                    or conn.messages_sent >= self.max_messages_per_connection):
+                conn.close()
+            else:
+                self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Close all idle connections and refuse new acquisitions"""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def _connect(self) -> PooledConnection:
+        """Open, secure and authenticate a new connection"""
+        smtp = smtplib.SMTP(self.smtp_config['host'], int(self.smtp_config['port']),
+                            timeout=self.timeout)
+        try:
+            if self.use_tls:
+                smtp.starttls()
+            if self.smtp_config.get('username'):
+                smtp.login(self.smtp_config['username'], self.smtp_config['password'])
+        except Exception:
+            smtp.close()
+            raise
+        self.metrics.increment('connections_opened')
+        return PooledConnection(smtp)
+
+class EmailDeliveryPipeline:
+    """Bounded send queue drained by worker threads over pooled connections"""
+
+    def __init__(self, pool: SMTPConnectionPool, workers: int = 4,
+                 queue_size: int = 1000, max_retries: int = 2,
+                 retry_delay: float = 0.5, max_retry_delay: float = 30.0,
+                 rng: random.Random = None, sleep: Callable[[float], None] = time.sleep):
+        """
+        Failed sends are retried up to max_retries times after exponential
+        backoff: up to retry_delay seconds before the first retry, doubling
+        each time up to max_retry_delay, with full jitter so workers that
+        failed together don't hammer the server together.
+        """
+        self.pool = pool
+        self.metrics = pool.metrics
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._rng = rng or random.Random()
+        self._sleep = sleep
+        self._queue: "queue.Queue[Optional[Message]]" = queue.Queue(maxsize=queue_size)
+        self._workers: List[threading.Thread] = [
+            threading.Thread(target=self._run, name=f"smtp-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        self._started = False
+
+    def start(self):
+        """Start the worker threads"""
+        if not self._started:
+            self._started = True
+            for worker in self._workers:
+                worker.start()
+
+    def submit(self, msg: Message, timeout: float = None):
+        """Queue a message for delivery, blocking while the queue is full"""
+        self.start()
+        self._queue.put(msg, timeout=timeout)
+
+    def flush(self):
+        """Block until every queued message has been handled"""
+        self._queue.join()
+
+    def close(self):
+        """Deliver remaining messages, stop the workers and close the pool"""
+        if self._started:
+            for _ in self._workers:
+                self._queue.put(None)
+            for worker in self._workers:
+                worker.join()
+        self.pool.close()
+
+    def _run(self):
+        """Worker loop: send queued messages until told to stop"""
+        while True:
+            msg = self._queue.get()
+            try:
+                if msg is None:
+                    return
+                with self.metrics.delivering():
+                    self._deliver(msg)
+            finally:
+                self._queue.task_done()
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait before retry number attempt (1 for the first retry)"""
+        delay = min(self.retry_delay * 2 ** (attempt - 1), self.max_retry_delay)
+        return self._rng.uniform(0, delay)
+
+    def _deliver(self, msg: Message):
+        """Send a message, reconnecting and retrying on connection failures"""
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.metrics.increment('retries')
+                self._sleep(self.backoff(attempt))
+            try:
+                conn = self.pool.acquire()
+            except Exception as e:
+                print(f"Error connecting to SMTP server: {e}")
+                continue
+
+            try:
+                with timed('smtp'):
+                    conn.send(msg)
+            except PERMANENT_ERRORS as e:
+                self.pool.release(conn)
+                print(f"Error sending email notification to {msg['To']}: {e}")
+                break
+            except Exception as e:
+                self.pool.release(conn, broken=True)
+                print(f"Error sending email notification to {msg['To']}, reconnecting: {e}")
+                continue
+
+            self.pool.release(conn)
+            self.metrics.increment('sent')
+            EMAILS.labels(result='sent').inc()
+            return
+
+        self.metrics.increment('failed')
+        EMAILS.labels(result='failed').inc()
@@ -0,0 +1,62 @@
+from string import Template
+from typing import Dict, List, Tuple
+from src.models.event import Event
+
+# Fixed wrapper around the per-event fragments, parsed once at import time
+EMAIL_TEMPLATE = Template("""
+        <html>
+            <body>
+                <h2>New Community Events</h2>
+                <p>Here are some events that match your interests:</p>
+        ${events}
+            </body>
+        </html>
+        """)
+
+class EmailRenderer:
+    """Renders digest emails from per-event fragments cached by event key"""
+
+    def __init__(self):
+        # (source, id) -> (the event's contents when rendered, fragment); an
+        # event whose contents changed since is rendered again
+        self._fragments: Dict[Tuple[str, str], Tuple[tuple, str]] = {}
+        self.generation = 0
+
+    def new_generation(self):
+        """Forget all cached fragments"""
+        self._fragments = {}
+        self.generation += 1
+
+    def discard(self, event: Event):
+        """Forget the cached fragment for an event that changed or went away"""
+        self._fragments.pop(event.key, None)
+
+    def render(self, events: List[Event]) -> str:
+        """Render a full HTML email body for the given events"""
+        return EMAIL_TEMPLATE.substitute(
+            events="".join([self.render_event(event) for event in events])
+        )
+
+    def render_event(self, event: Event) -> str:
+        """Render the HTML fragment for one event, reusing a cached copy"""
+        version = event.to_tuple()
+        cached = self._fragments.get(event.key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        fragment = self._render_fragment(event)
+        self._fragments[event.key] = (version, fragment)
+        return fragment
+
+    @staticmethod
+    def _render_fragment(event: Event) -> str:
+        """Format a single event as an HTML block"""
+        return f"""
+                <div style="margin-bottom: 20px;">
+                    <h3>{event.title}</h3>
+                    <p><strong>Date:</strong> {event.date.strftime('%B %d, %Y %I:%M %p')}</p>
+                    <p><strong>Location:</strong> {event.location}</p>
+                    <p><strong>Category:</strong> {event.category}</p>
+                    <p>{event.description}</p>
+                    {'<p><a href="' + event.url + '">More Information</a></p>' if event.url else ''}
+                </div>
+            """
@@ -0,0 +1,72 @@
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, Set
+from src.models.event import Event
+
+class EventIndex:
+    """Inverted index of cached events by category and location"""
+
+    def __init__(self):
+        self._by_category: Dict[str, Set[Hashable]] = defaultdict(set)
+        self._by_location: Dict[str, Set[Hashable]] = defaultdict(set)
+        self._keys: Set[Hashable] = set()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: Hashable, event: Event):
+        """Add an event to the posting lists under the given key"""
+        self._by_category[event.category].add(key)
+        self._by_location[event.location].add(key)
+        self._keys.add(key)
+
+    def remove(self, key: Hashable, event: Event):
+        """Remove an event previously added under the given key"""
+        self._discard(self._by_category, event.category, key)
+        self._discard(self._by_location, event.location, key)
+        self._keys.discard(key)
+
+    def clear(self):
+        """Drop all indexed events"""
+        self._by_category.clear()
+        self._by_location.clear()
+        self._keys.clear()
+
+    def match(self, categories: Iterable[str], locations: Iterable[str]) -> Set[Hashable]:
+        """
+        Return keys of events matching the given filters.
+        Mirrors UserPreferences.matches_event: an empty filter matches everything.
+        """
+        category_keys = self._union(self._by_category, categories)
+        location_keys = self._union(self._by_location, locations)
+
+        if category_keys is None and location_keys is None:
+            return set(self._keys)
+        if category_keys is None:
+            return location_keys
+        if location_keys is None:
+            return category_keys
+        if len(category_keys) > len(location_keys):
+            category_keys, location_keys = location_keys, category_keys
+        return category_keys & location_keys
+
+    @staticmethod
+    def _union(postings: Dict[str, Set[Hashable]], values: Iterable[str]):
+        """Union the posting lists for values, or None when there is no filter"""
+        if not values:
+            return None
+        keys = set()
+        for value in set(values):
+            posting = postings.get(value)
+            if posting:
+                keys |= posting
+        return keys
+
+    @staticmethod
+    def _discard(postings: Dict[str, Set[Hashable]], value: str, key: Hashable):
+        """Remove key from a posting list, dropping the list once empty"""
+        posting = postings.get(value)
+        if posting is None:
+            return
+        posting.discard(key)
+        if not posting:
+            del postings[value]
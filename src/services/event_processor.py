@@ -1,88 +1,436 @@
-from typing import List, Dict
-from datetime import datetime, timedelta
+from typing import Callable, List, Dict, Tuple
+from datetime import date, datetime, timedelta
+from itertools import islice
+from dataclasses import dataclass, field
 import smtplib
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from src.models.event import Event
 from src.models.user_preferences import UserPreferences
+from src.services.batch_matcher import MatchMatrix, match_users
+from src.services.email_delivery import EmailDeliveryPipeline
+from src.services.email_renderer import EmailRenderer
+from src.services.event_index import EventIndex
+from src.services.event_repository import EventRepository
+from src.services.geo import Gazetteer, GeoIndex
+from src.services.metrics import EMAILS, EVENTS_PER_SECOND, per_second, timed
+from src.services.search_index import SearchIndex
+from src.services.snapshot import SnapshotError, load_snapshot, save_snapshot
+from src.services.subscription_index import SubscriptionIndex
+from src.services.time_index import TimeIndex, sort_date
+
+@dataclass
+class EventDiff:
+    """Changes to the event cache made by one refresh"""
+    added: List[Event] = field(default_factory=list)
+    updated: List[Event] = field(default_factory=list)
+    removed: List[Event] = field(default_factory=list)
+    
+    @property
+    def changed(self) -> List[Event]:
+        """Events that are new or different since the previous refresh"""
+        return self.added + self.updated
+    
+    def __bool__(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
 
 class EventProcessor:
     """Processes events and handles filtering and notifications"""
     
-    def __init__(self, smtp_config: Dict[str, str]):
+    def __init__(self, smtp_config: Dict[str, str], delivery: EmailDeliveryPipeline = None,
+                 repository: EventRepository = None, snapshot_path: str = None,
+                 retain_past: timedelta = timedelta(0), gazetteer: Gazetteer = None):
         """
         Initialize with SMTP configuration
         smtp_config should contain: host, port, username, password
+        When a delivery pipeline is given, notifications are queued on its
+        pooled connections instead of opening a connection per email.
+        When a repository is given, events are kept in the database rather
+        than in memory, so they survive restarts. Otherwise, with a
+        snapshot_path, the in-memory cache is snapshotted after every update.
+        Events that started more than retain_past ago are dropped from the
+        cache; pass None to keep past events.
+        With a gazetteer, locations match within each user's max_distance.
+        Updates and queries may come from different threads, e.g. the
+        scheduler and the dashboard; they take turns on a lock.
         """
         self.smtp_config = smtp_config
+        self.delivery = delivery
+        self.repository = repository
+        self.snapshot_path = snapshot_path
+        self.retain_past = retain_past
+        self.gazetteer = gazetteer
         self._cached_events: List[Event] = []
+        self._events_by_key: Dict[Tuple[str, str], Event] = {}
+        self._order: Dict[Tuple[str, str], int] = {}
+        self._index = EventIndex()
+        self._time_index = TimeIndex()
+        self._geo_index = GeoIndex()
+        self._search_index = SearchIndex()
+        self._renderer = EmailRenderer()
+        self._subscriptions: SubscriptionIndex = None
+        self._digests: Dict[str, List[Event]] = {}
+        self.last_diff = EventDiff()
         self._last_update = None
+        # Bumped whenever the cached events change, so readers can key caches on it
+        self.generation = 0
+        self._update_listeners: List[Callable[[EventDiff], None]] = []
+        self._lock = threading.RLock()
+    
+    def subscribe_users(self, users: List[UserPreferences]):
+        """Register the users whose digests are built on each update"""
+        self._subscriptions = SubscriptionIndex(users, self.gazetteer)
+    
+    def add_update_listener(self, listener: Callable[[EventDiff], None]):
+        """Call listener with the diff whenever the cached events change"""
+        self._update_listeners.append(listener)
+    
+    def update_events(self, events: List[Event]) -> EventDiff:
+        """
+        Replace the cached events with a fresh fetch.
+        Only events that were added, changed or removed touch the index and
+        rendered fragments, and digests are built from the changes alone.
+        Events that are already past are left out, so they count as removed.
+        """
+        with timed('update') as timer, self._lock:
+            diff = self._apply_update(events)
+        EVENTS_PER_SECOND.labels(stage='update').set(per_second(len(events), timer.elapsed))
+        return diff
+    
+    def _apply_update(self, events: List[Event]) -> EventDiff:
+        """Diff a fresh fetch against the cache and apply the changes"""
+        cutoff = self._eviction_cutoff()
+        current: Dict[Tuple[str, str], Event] = {}
+        for event in events:
+            if cutoff is None or sort_date(event.date) >= cutoff:
+                current[event.key] = event
+        if self.repository is not None:
+            return self._update_repository(current)
+        
+        previous = self._events_by_key
+        diff = EventDiff()
+        stale: List[Tuple[Tuple[str, str], Event]] = []
+        fresh: List[Tuple[Tuple[str, str], Event]] = []
+        for key, event in current.items():
+            old = previous.get(key)
+            if old is None:
+                diff.added.append(event)
+                fresh.append((key, event))
+            elif old == event:
+                # Keep the cached object, which the indexes already refer to
+                current[key] = old
+            else:
+                diff.updated.append(event)
+                stale.append((key, old))
+                fresh.append((key, event))
+        for key, old in previous.items():
+            if key not in current:
+                diff.removed.append(old)
+                stale.append((key, old))
+        # Stale entries go first, since updated events keep their key
+        self._unindex_events(stale)
+        self._index_events(fresh)
+        
+        self._events_by_key = current
+        self._cached_events = list(current.values())
+        self._order = {key: position for position, key in enumerate(current)}
+        diff = self._finish_update(diff)
+        if self.snapshot_path:
+            self.save_snapshot()
+        return diff
+    
+    def _index_events(self, items: List[Tuple[Tuple[str, str], Event]]):
+        """Add (key, event) pairs to the lookup indexes"""
+        for key, event in items:
+            self._index.add(key, event)
+            self._search_index.add(key, event)
+            if self.gazetteer is not None:
+                coordinates = self.gazetteer.lookup(event.location)
+                if coordinates is not None:
+                    self._geo_index.add(key, coordinates)
+        self._time_index.add_many(items)
+    
+    def _unindex_events(self, items: List[Tuple[Tuple[str, str], Event]]):
+        """Remove (key, event) pairs from the lookup indexes and drop their fragments"""
+        for key, event in items:
+            self._index.remove(key, event)
+            self._search_index.remove(key, event)
+            self._geo_index.remove(key)
+            self._renderer.discard(event)
+        self._time_index.remove_many(items)
     
-    def update_events(self, events: List[Event]):
-        """Update the cached events"""
-        self._cached_events = events
+    def _update_repository(self, current: Dict[Tuple[str, str], Event]) -> EventDiff:
+        """Diff a fresh fetch against the repository and persist the changes"""
+        active = self.repository.active_keys()
+        # Events relisted after being removed count as added
+        previous = self.repository.get_many(current.keys() & active)
+        diff = EventDiff()
+        for key, event in current.items():
+            old = previous.get(key)
+            if old is None:
+                diff.added.append(event)
+            elif old != event:
+                diff.updated.append(event)
+        removed_keys = active - current.keys()
+        diff.removed = list(self.repository.get_many(removed_keys).values())
+        self.repository.sync(diff.changed, removed_keys)
+        for event in diff.updated + diff.removed:
+            self._renderer.discard(event)
+        return self._finish_update(diff)
+    
+    def _finish_update(self, diff: EventDiff) -> EventDiff:
+        """Route the changes to subscribers and record the refresh"""
+        if self._subscriptions is not None:
+            self._digests = self._subscriptions.build_digests(diff.changed)
+        self.last_diff = diff
         self._last_update = datetime.now()
+        self._notify_update(diff)
+        return diff
+    
+    def _notify_update(self, diff: EventDiff):
+        """Start a new generation and tell listeners what changed"""
+        self.generation += 1
+        for listener in self._update_listeners:
+            try:
+                listener(diff)
+            except Exception as e:
+                print(f"Error in update listener: {e}")
+    
+    def warm_start(self) -> bool:
+        """
+        Make events from a previous run available before the first refresh.
+        Returns True when there is something to serve.
+        """
+        if self.repository is not None:
+            return self.repository.count() > 0
+        return self.load_snapshot()
+    
+    def save_snapshot(self):
+        """Write the cached events and last update time to the snapshot file"""
+        try:
+            save_snapshot(self.snapshot_path, self._cached_events, self._last_update)
+        except OSError as e:
+            print(f"Error saving event snapshot: {e}")
+    
+    def load_snapshot(self) -> bool:
+        """
+        Restore the cache from the snapshot file without routing any digests.
+        Returns False when there is no usable snapshot.
+        """
+        if not self.snapshot_path:
+            return False
+        try:
+            snapshot = load_snapshot(self.snapshot_path)
+        except (OSError, SnapshotError) as e:
+            print(f"Ignoring event snapshot: {e}")
+            return False
+        if snapshot is None:
+            return False
+        
+        events, last_update = snapshot
+        with self._lock:
+            self._restore(events, last_update)
+        return True
+    
+    def _restore(self, events: List[Event], last_update: datetime):
+        """Replace the cache and indexes with snapshotted events"""
+        self._events_by_key = {event.key: event for event in events}
+        self._cached_events = list(self._events_by_key.values())
+        self._order = {key: position for position, key in enumerate(self._events_by_key)}
+        self._index.clear()
+        self._time_index.clear()
+        self._geo_index.clear()
+        self._search_index.clear()
+        self._index_events(list(self._events_by_key.items()))
+        self._renderer.new_generation()
+        self._last_update = last_update
+        # The snapshot may be old enough for some events to have passed
+        self.evict_past()
+        self._notify_update(EventDiff(added=list(self._cached_events)))
+    
+    def evict_past(self, now: datetime = None) -> List[Event]:
+        """Drop cached events that started more than retain_past ago"""
+        cutoff = self._eviction_cutoff(now)
+        if cutoff is None or self.repository is not None:
+            return []
+        evicted = []
+        with self._lock:
+            for key in self._time_index.evict_before(cutoff):
+                event = self._events_by_key.pop(key)
+                del self._order[key]
+                self._index.remove(key, event)
+                self._search_index.remove(key, event)
+                self._geo_index.remove(key)
+                self._renderer.discard(event)
+                evicted.append(event)
+            if evicted:
+                self._cached_events = list(self._events_by_key.values())
+                self._notify_update(EventDiff(removed=evicted))
+        return evicted
+    
+    def _eviction_cutoff(self, now: datetime = None):
+        """Events dated before this are past, or None when past events are kept"""
+        if self.retain_past is None:
+            return None
+        return sort_date(now or datetime.now()) - self.retain_past
     
+    def get_digests(self) -> Dict[str, List[Event]]:
+        """Get the per-user new or changed events routed during the last update"""
+        return self._digests
+    
+    @timed('match')
     def get_matching_events(self, preferences: UserPreferences) -> List[Event]:
         """Get events matching user preferences"""
-        if not self._cached_events:
-            return []
+        if self.repository is not None:
+            return self._query_repository(preferences)
+        with self._lock:
+            if not self._cached_events:
+                return []
             
-        matching_events = []
-        for event in self._cached_events:
-            if preferences.matches_event(event):
-                matching_events.append(event)
-                
-        return matching_events
+            # Intersect posting lists instead of scanning every cached event
+            keys = self._match_keys(preferences)
+            return [self._events_by_key[key] for key in sorted(keys, key=self._order.__getitem__)]
+    
+    @timed('search')
+    def search(self, query: str, categories: List[str] = None, locations: List[str] = None,
+               limit: int = 20) -> List[Event]:
+        """
+        Events containing every keyword of query, best match first.
+        Category and location filters work as in get_matching_events.
+        """
+        filters = None
+        if categories or locations:
+            filters = UserPreferences(user_id="search", categories=list(categories or ()),
+                                      locations=list(locations or ()))
+        if self.repository is not None:
+            if self.gazetteer is None or not locations:
+                return self.repository.search(query, categories, locations, limit)
+            # Rank every match, then keep those near enough
+            events = (event for event in self.repository.search(query, categories, None, None)
+                      if filters.matches_event(event, self.gazetteer))
+            return list(islice(events, limit))
+        with self._lock:
+            candidates = self._match_keys(filters) if filters is not None else None
+            return [self._events_by_key[key]
+                    for key, _ in self._search_index.search(query, candidates, limit)]
+    
+    def _query_repository(self, preferences: UserPreferences = None, start: datetime = None,
+                          end: datetime = None, limit: int = None) -> List[Event]:
+        """Stored events matching preferences in date order, by radius when possible"""
+        categories = preferences.categories if preferences else None
+        locations = preferences.locations if preferences else None
+        if self.gazetteer is None or not locations:
+            return self.repository.query(categories, locations, start=start, end=end, limit=limit)
+        
+        # Nearby places go by other names, so locations are matched after loading
+        events = (event for batch in self.repository.iter_batches(categories, None, start, end)
+                  for event in batch if preferences.matches_event(event, self.gazetteer))
+        return list(islice(events, limit))
+    
+    def _match_keys(self, preferences: UserPreferences):
+        """Keys of cached events matching preferences, by radius when possible"""
+        if self.gazetteer is None or not preferences.locations:
+            return self._index.match(preferences.categories, preferences.locations)
+        
+        # Events at unknown places can still match by name
+        keys = self._index.match((), preferences.locations)
+        for location in preferences.locations:
+            center = self.gazetteer.lookup(location)
+            if center is not None:
+                keys |= self._geo_index.query(center, preferences.max_distance)
+        if preferences.categories:
+            keys &= self._index.match(preferences.categories, ())
+        return keys
+    
+    def get_upcoming_events(self, preferences: UserPreferences = None,
+                            within: timedelta = None, limit: int = None,
+                            now: datetime = None) -> List[Event]:
+        """Events from now on, soonest first, e.g. within=timedelta(days=7)"""
+        now = now or datetime.now()
+        end = now + within if within is not None else None
+        return self.get_events_between(now, end, preferences, limit)
+    
+    def get_events_between(self, start: datetime = None, end: datetime = None,
+                           preferences: UserPreferences = None,
+                           limit: int = None) -> List[Event]:
+        """Events with start <= date < end in date order, optionally filtered by preferences"""
+        if self.repository is not None:
+            return self._query_repository(preferences, start, end, limit)
+        
+        with self._lock:
+            keys = self._time_index.between(start, end, None if preferences else limit)
+            events = (self._events_by_key[key] for key in keys)
+            if preferences is not None:
+                events = (event for event in events
+                          if preferences.matches_event(event, self.gazetteer))
+            return list(islice(events, limit))
+    
+    def get_events_by_day(self, start: datetime = None, end: datetime = None,
+                          preferences: UserPreferences = None) -> Dict[date, List[Event]]:
+        """Events between start and end bucketed by calendar day"""
+        days: Dict[date, List[Event]] = {}
+        for event in self.get_events_between(start, end, preferences):
+            days.setdefault(sort_date(event.date).date(), []).append(event)
+        return days
     
+    def batch_match(self, users: List[UserPreferences]) -> MatchMatrix:
+        """
+        Match every cached event against many users at once, e.g. for a
+        nightly digest over the whole user base. Returns a sparse
+        user x event matrix.
+        """
+        if self.repository is not None:
+            events = self.repository.query()
+        else:
+            # Updates replace the list rather than change it, so no lock is needed
+            events = self._cached_events
+        return match_users(users, events, self.gazetteer)
+    
+    @timed('send')
     def send_email_notification(self, user_prefs: UserPreferences, events: List[Event]):
         """Send email notification for matching events"""
         if not events or not user_prefs.email:
             return
             
         try:
-            msg = MIMEMultipart()
-            msg['From'] = self.smtp_config['username']
-            msg['To'] = user_prefs.email
-            msg['Subject'] = f"New Community Events Matching Your Interests!"
-            
-            body = self._format_email_body(events)
-            msg.attach(MIMEText(body, 'html'))
+            msg = self._build_message(user_prefs, events)
+            if self.delivery is not None:
+                self.delivery.submit(msg)
+                EMAILS.labels(result='queued').inc()
+                return
             
-            with smtplib.SMTP(self.smtp_config['host'], int(self.smtp_config['port'])) as server:
-                server.starttls()
-                server.login(self.smtp_config['username'], self.smtp_config['password'])
-                server.send_message(msg)
+            with timed('smtp'):
+                with smtplib.SMTP(self.smtp_config['host'], int(self.smtp_config['port'])) as server:
+                    server.starttls()
+                    server.login(self.smtp_config['username'], self.smtp_config['password'])
+                    server.send_message(msg)
+            EMAILS.labels(result='sent').inc()
                 
         except Exception as e:
+            EMAILS.labels(result='failed').inc()
             print(f"Error sending email notification: {e}")
     
+    def flush_notifications(self):
+        """Wait until all queued notifications have been delivered"""
+        if self.delivery is not None:
+            self.delivery.flush()
+    
+    def _build_message(self, user_prefs: UserPreferences, events: List[Event]) -> MIMEMultipart:
+        """Build the notification email for a user"""
+        msg = MIMEMultipart()
+        msg['From'] = self.smtp_config['username']
+        msg['To'] = user_prefs.email
+        msg['Subject'] = f"New Community Events Matching Your Interests!"
+        
+        body = self._format_email_body(events)
+        msg.attach(MIMEText(body, 'html'))
+        return msg
+    
+    @timed('render')
     def _format_email_body(self, events: List[Event]) -> str:
         """Format events into HTML email body"""
-        body = """
-        <html>
-            <body>
-                <h2>New Community Events</h2>
-                <p>Here are some events that match your interests:</p>
-        """
-        
-        for event in events:
-            body += f"""
-                <div style="margin-bottom: 20px;">
-                    <h3>{event.title}</h3>
-                    <p><strong>Date:</strong> {event.date.strftime('%B %d, %Y %I:%M %p')}</p>
-                    <p><strong>Location:</strong> {event.location}</p>
-                    <p><strong>Category:</strong> {event.category}</p>
-                    <p>{event.description}</p>
-                    {'<p><a href="' + event.url + '">More Information</a></p>' if event.url else ''}
-                </div>
-            """
-        
-        body += """
-            </body>
-        </html>
-        """
-        return body
+        return self._renderer.render(events)
     
     def should_update_cache(self, max_age_hours: int = 1) -> bool:
         """Check if the event cache needs updating"""
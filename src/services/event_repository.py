@@ -0,0 +1,305 @@
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+from sqlalchemy import (
+    JSON, Column, DateTime, Index, MetaData, String, Table, Text, and_, column,
+    create_engine, delete, func, literal_column, select, table, text, tuple_, update
+)
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from src.models.event import Event
+from src.services.search_index import TITLE_WEIGHT, tokenize
+
+metadata = MetaData()
+
+# The primary key leads with source, so it doubles as the per-source index
+events_table = Table(
+    "events", metadata,
+    Column("source", String(100), primary_key=True),
+    Column("id", String(200), primary_key=True),
+    Column("title", Text, nullable=False),
+    Column("description", Text, nullable=False),
+    Column("date", DateTime, nullable=False),
+    Column("location", String(200), nullable=False),
+    Column("category", String(100), nullable=False),
+    Column("url", Text),
+    Column("image_url", Text),
+    Column("source_urls", JSON, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+    # Set when a refresh no longer returns the event; kept as history
+    Column("removed_at", DateTime),
+    Index("ix_events_date", "date"),
+    Index("ix_events_category", "category"),
+    Index("ix_events_location", "location"),
+)
+
+# SQLite FTS5 index over titles and descriptions, kept in sync by triggers.
+# The events table's rowids may change on VACUUM, so each event gets a stable
+# docid in events_fts_keys and the FTS5 table stores its own copy of the text
+# under that docid.
+FULL_TEXT_DDL = (
+    """CREATE TABLE events_fts_keys (
+        docid INTEGER PRIMARY KEY,
+        source VARCHAR(100) NOT NULL,
+        id VARCHAR(200) NOT NULL,
+        UNIQUE (source, id))""",
+    "CREATE VIRTUAL TABLE events_fts USING fts5(title, description)",
+    """CREATE TRIGGER events_fts_insert AFTER INSERT ON events BEGIN
+        INSERT INTO events_fts_keys(source, id) VALUES (new.source, new.id);
+        INSERT INTO events_fts(rowid, title, description)
+        VALUES (last_insert_rowid(), new.title, new.description);
+    END""",
+    """CREATE TRIGGER events_fts_delete AFTER DELETE ON events BEGIN
+        DELETE FROM events_fts WHERE rowid = (
+            SELECT docid FROM events_fts_keys WHERE source = old.source AND id = old.id);
+        DELETE FROM events_fts_keys WHERE source = old.source AND id = old.id;
+    END""",
+    """CREATE TRIGGER events_fts_update AFTER UPDATE OF title, description ON events BEGIN
+        UPDATE events_fts SET title = new.title, description = new.description
+        WHERE rowid = (
+            SELECT docid FROM events_fts_keys WHERE source = new.source AND id = new.id);
+    END""",
+    # Index rows stored before the full-text table existed
+    "INSERT INTO events_fts_keys(source, id) SELECT source, id FROM events",
+    """INSERT INTO events_fts(rowid, title, description)
+        SELECT events_fts_keys.docid, events.title, events.description
+        FROM events JOIN events_fts_keys
+        ON events_fts_keys.source = events.source AND events_fts_keys.id = events.id""",
+)
+
+events_fts = table("events_fts", column("rowid"))
+events_fts_keys = table("events_fts_keys", column("docid"), column("source"), column("id"))
+
+EVENT_COLUMNS = ("id", "title", "description", "date", "location", "category",
+                 "source", "url", "image_url", "source_urls")
+
+class EventRepository:
+    """
+    Persistent event store backed by SQLAlchemy Core.
+    Writes are batched upserts and reads are streamed in batches, so callers
+    never need the whole table in memory.
+    """
+
+    def __init__(self, url="sqlite:///events.db", batch_size: int = 500):
+        """url may be a database URL or an existing Engine"""
+        self.engine: Engine = url if isinstance(url, Engine) else create_engine(url)
+        self.batch_size = batch_size
+        metadata.create_all(self.engine)
+        self.full_text = self._create_full_text_index()
+
+    def upsert(self, events: Iterable[Event]) -> int:
+        """Insert or update events by (source, id), returning the number written"""
+        with self.engine.begin() as conn:
+            return self._upsert(conn, events, datetime.now())
+
+    def mark_removed(self, keys: Iterable[Tuple[str, str]]) -> int:
+        """Flag events as no longer listed by their source"""
+        with self.engine.begin() as conn:
+            return self._mark_removed(conn, keys, datetime.now())
+
+    def sync(self, changed: Iterable[Event], removed: Iterable[Tuple[str, str]]):
+        """Apply one refresh's changes in a single transaction"""
+        now = datetime.now()
+        with self.engine.begin() as conn:
+            self._upsert(conn, changed, now)
+            self._mark_removed(conn, removed, now)
+
+    def delete(self, keys: Iterable[Tuple[str, str]]) -> int:
+        """Permanently delete events"""
+        deleted = 0
+        with self.engine.begin() as conn:
+            for batch in self._batches(keys):
+                deleted += conn.execute(
+                    delete(events_table).where(self._key_in(batch))
+                ).rowcount
+        return deleted
+
+    def get_many(self, keys: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], Event]:
+        """Look up events by key, including removed ones"""
+        found = {}
+        with self.engine.connect() as conn:
+            for batch in self._batches(keys):
+                for row in conn.execute(self._select().where(self._key_in(batch))):
+                    event = self._to_event(row)
+                    found[event.key] = event
+        return found
+
+    def active_keys(self) -> Set[Tuple[str, str]]:
+        """Keys of all events not marked as removed"""
+        query = select(events_table.c.source, events_table.c.id).where(
+            events_table.c.removed_at.is_(None)
+        )
+        with self.engine.connect() as conn:
+            return {tuple(row) for row in conn.execute(query)}
+
+    def count(self, include_removed: bool = False) -> int:
+        """Number of stored events"""
+        query = select(func.count()).select_from(events_table)
+        if not include_removed:
+            query = query.where(events_table.c.removed_at.is_(None))
+        with self.engine.connect() as conn:
+            return conn.execute(query).scalar_one()
+
+    def query(self, categories: Iterable[str] = None, locations: Iterable[str] = None,
+              start: datetime = None, end: datetime = None, limit: int = None,
+              include_removed: bool = False) -> List[Event]:
+        """
+        Events matching the filters, ordered by date.
+        Like UserPreferences.matches_event, an empty filter matches everything.
+        """
+        return [event for batch in self.iter_batches(categories, locations, start, end,
+                                                     limit, include_removed)
+                for event in batch]
+
+    def iter_batches(self, categories: Iterable[str] = None, locations: Iterable[str] = None,
+                     start: datetime = None, end: datetime = None, limit: int = None,
+                     include_removed: bool = False) -> Iterator[List[Event]]:
+        """Stream matching events from the database batch_size rows at a time"""
+        query = self._select().order_by(
+            events_table.c.date, events_table.c.source, events_table.c.id
+        )
+        if categories:
+            query = query.where(events_table.c.category.in_(set(categories)))
+        if locations:
+            query = query.where(events_table.c.location.in_(set(locations)))
+        if start is not None:
+            query = query.where(events_table.c.date >= start)
+        if end is not None:
+            query = query.where(events_table.c.date < end)
+        if not include_removed:
+            query = query.where(events_table.c.removed_at.is_(None))
+        if limit is not None:
+            query = query.limit(limit)
+
+        with self.engine.connect() as conn:
+            result = conn.execution_options(yield_per=self.batch_size).execute(query)
+            for rows in result.partitions():
+                yield [self._to_event(row) for row in rows]
+
+    def search(self, query: str, categories: Iterable[str] = None,
+               locations: Iterable[str] = None, limit: int = 20) -> List[Event]:
+        """
+        Active events containing every keyword of query, best match first.
+        Ranked by FTS5's bm25 on SQLite; other databases fall back to a
+        substring scan ordered by date.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        query = self._select().where(events_table.c.removed_at.is_(None))
+        if categories:
+            query = query.where(events_table.c.category.in_(set(categories)))
+        if locations:
+            query = query.where(events_table.c.location.in_(set(locations)))
+        if self.full_text:
+            match = " ".join(f'"{term}"' for term in terms)
+            query = (
+                query.join_from(events_table, events_fts_keys, and_(
+                    events_fts_keys.c.source == events_table.c.source,
+                    events_fts_keys.c.id == events_table.c.id,
+                ))
+                .join(events_fts, events_fts.c.rowid == events_fts_keys.c.docid)
+                .where(literal_column("events_fts").op("MATCH")(match))
+                .order_by(literal_column(f"bm25(events_fts, {float(TITLE_WEIGHT)}, 1.0)"))
+            )
+        else:
+            searchable = events_table.c.title + " " + events_table.c.description
+            query = query.where(and_(*[searchable.ilike(f"%{term}%") for term in terms]))
+            query = query.order_by(events_table.c.date, events_table.c.source, events_table.c.id)
+        with self.engine.connect() as conn:
+            return [self._to_event(row) for row in conn.execute(query.limit(limit))]
+
+    def close(self):
+        """Release pooled database connections"""
+        self.engine.dispose()
+
+    def _create_full_text_index(self) -> bool:
+        """Create the FTS5 table and triggers on SQLite; False when unavailable"""
+        if self.engine.dialect.name != "sqlite":
+            return False
+        try:
+            with self.engine.begin() as conn:
+                exists = conn.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'events_fts_keys'"
+                )).first()
+                if exists is None:
+                    for statement in FULL_TEXT_DDL:
+                        conn.execute(text(statement))
+        except OperationalError as e:
+            # SQLite built without FTS5
+            print(f"Full-text search index unavailable: {e}")
+            return False
+        return True
+
+    def _upsert(self, conn, events: Iterable[Event], now: datetime) -> int:
+        written = 0
+        statement = self._upsert_statement()
+        for batch in self._batches(events):
+            rows = [self._to_row(event, now) for event in batch]
+            if statement is None:
+                # Portable fallback for dialects without ON CONFLICT
+                conn.execute(delete(events_table).where(
+                    self._key_in([(row["source"], row["id"]) for row in rows])
+                ))
+                conn.execute(events_table.insert(), rows)
+            else:
+                conn.execute(statement, rows)
+            written += len(rows)
+        return written
+
+    def _mark_removed(self, conn, keys: Iterable[Tuple[str, str]], now: datetime) -> int:
+        marked = 0
+        for batch in self._batches(keys):
+            marked += conn.execute(
+                update(events_table)
+                .where(self._key_in(batch), events_table.c.removed_at.is_(None))
+                .values(removed_at=now)
+            ).rowcount
+        return marked
+
+    def _upsert_statement(self):
+        """INSERT ... ON CONFLICT DO UPDATE for dialects that support it"""
+        dialect = self.engine.dialect.name
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        elif dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            return None
+        statement = insert(events_table)
+        updated = {column.name: statement.excluded[column.name]
+                   for column in events_table.columns if not column.primary_key}
+        return statement.on_conflict_do_update(
+            index_elements=[events_table.c.source, events_table.c.id], set_=updated
+        )
+
+    def _batches(self, items: Iterable) -> Iterator[list]:
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _key_in(keys: List[Tuple[str, str]]):
+        return tuple_(events_table.c.source, events_table.c.id).in_(keys)
+
+    @staticmethod
+    def _select():
+        return select(*[events_table.c[name] for name in EVENT_COLUMNS])
+
+    @staticmethod
+    def _to_row(event: Event, now: datetime) -> dict:
+        row = {name: getattr(event, name) for name in EVENT_COLUMNS}
+        row["source_urls"] = list(event.source_urls)
+        row["updated_at"] = now
+        row["removed_at"] = None
+        return row
+
+    @staticmethod
+    def _to_event(row) -> Event:
+        data = dict(row._mapping)
+        data["source_urls"] = list(data["source_urls"] or [])
+        return Event(**data)
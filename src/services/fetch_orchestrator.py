@@ -0,0 +1,195 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Set
+from src.models.event import Event
+from src.services.metrics import (EVENTS_PER_SECOND, SOURCE_EVENTS, SOURCE_FAILURES,
+                                  SOURCE_SECONDS, per_second)
+from src.services.parse_stage import ParseStage
+from src.sources.base import EventSource, source_name
+
+@dataclass
+class SourceResult:
+    """Outcome of fetching a single event source"""
+    source: EventSource
+    events: List[Event] = field(default_factory=list)
+    error: Optional[BaseException] = None
+    duration: float = 0.0
+    timed_out: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """True when the source returned without error or timeout"""
+        return self.error is None and not self.timed_out
+
+@dataclass
+class FetchReport:
+    """Collected per-source results of one fetch cycle"""
+    results: List[SourceResult] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def events(self) -> List[Event]:
+        """All fetched events, in source order"""
+        events = []
+        for result in self.results:
+            events.extend(result.events)
+        return events
+
+    @property
+    def failures(self) -> List[SourceResult]:
+        """Results for sources that errored or timed out"""
+        return [result for result in self.results if not result.ok]
+
+class FetchOrchestrator:
+    """Fetches events from many sources concurrently"""
+
+    def __init__(self, max_workers: int = 8, source_timeout: float = 30.0,
+                 deadline: float = 120.0, poll_interval: float = 0.25,
+                 parse_stage: ParseStage = None):
+        """
+        max_workers bounds the number of sources fetched at once.
+        source_timeout applies to each source from the moment it starts running,
+        deadline applies to the whole cycle.
+        With a parse_stage, sources that can split fetching from parsing only
+        download on the fetch threads and are parsed on the stage's processes.
+        A source whose fetch timed out keeps its thread until the fetch returns;
+        until then later cycles report it as failed instead of starting another.
+        """
+        self.parse_stage = parse_stage
+        self.max_workers = max_workers
+        self.source_timeout = source_timeout
+        self.deadline = deadline
+        self.poll_interval = poll_interval
+        self._in_flight: Set[EventSource] = set()
+        self._in_flight_lock = threading.Lock()
+
+    def fetch_all(self, sources: List[EventSource]) -> FetchReport:
+        """Fetch all sources on a bounded thread pool"""
+        cycle_start = time.monotonic()
+        cycle_end = cycle_start + self.deadline
+        results = [SourceResult(source=source) for source in sources]
+        if not sources:
+            return FetchReport(results, 0.0)
+
+        started: Dict[int, float] = {}
+
+        def run(index: int) -> List[Event]:
+            started[index] = time.monotonic()
+            return self._fetch_tracked(sources[index])
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(sources)))
+        try:
+            pending = {executor.submit(run, index): index for index in range(len(sources))}
+            while pending:
+                now = time.monotonic()
+                if now >= cycle_end:
+                    for index in pending.values():
+                        self._mark_timed_out(results[index], started.get(index), now)
+                    break
+
+                # Give up on sources that have been running for too long
+                expiries = [cycle_end]
+                for future, index in list(pending.items()):
+                    if index not in started:
+                        continue
+                    expiry = started[index] + self.source_timeout
+                    if now >= expiry:
+                        self._mark_timed_out(results[index], started[index], now)
+                        del pending[future]
+                    else:
+                        expiries.append(expiry)
+                if not pending:
+                    break
+
+                timeout = min(min(expiries) - now, self.poll_interval)
+                done, _ = wait(pending, timeout=max(timeout, 0), return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    result = results[index]
+                    result.duration = time.monotonic() - started.get(index, now)
+                    try:
+                        result.events = list(future.result())
+                    except Exception as e:
+                        result.error = e
+        finally:
+            # Never block on stragglers; queued sources are cancelled
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return self._record_metrics(FetchReport(results, time.monotonic() - cycle_start))
+
+    async def fetch_all_async(self, sources: List[EventSource]) -> FetchReport:
+        """Fetch all sources from an asyncio event loop"""
+        cycle_start = time.monotonic()
+        results = [SourceResult(source=source) for source in sources]
+        if not sources:
+            return FetchReport(results, 0.0)
+
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def run(result: SourceResult):
+            async with semaphore:
+                start = time.monotonic()
+                try:
+                    events = await asyncio.wait_for(
+                        asyncio.to_thread(self._fetch_tracked, result.source),
+                        timeout=self.source_timeout
+                    )
+                    result.events = list(events)
+                except asyncio.TimeoutError:
+                    result.timed_out = True
+                except Exception as e:
+                    result.error = e
+                finally:
+                    result.duration = time.monotonic() - start
+
+        tasks = [asyncio.create_task(run(result)) for result in results]
+        _, pending = await asyncio.wait(tasks, timeout=self.deadline)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            for result, task in zip(results, tasks):
+                if task in pending:
+                    result.timed_out = True
+                    result.events = []
+
+        return self._record_metrics(FetchReport(results, time.monotonic() - cycle_start))
+
+    def _fetch_tracked(self, source: EventSource) -> List[Event]:
+        """Fetch one source unless an abandoned fetch of it is still running"""
+        with self._in_flight_lock:
+            if source in self._in_flight:
+                raise RuntimeError("Previous fetch is still running")
+            self._in_flight.add(source)
+        try:
+            return self._fetch_source(source)
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.discard(source)
+
+    def _fetch_source(self, source: EventSource) -> List[Event]:
+        """Fetch one source, through the parse stage when it supports it"""
+        if self.parse_stage is not None and source.parser_spec() is not None:
+            return self.parse_stage.fetch(source)
+        return source.fetch_events()
+
+    def _record_metrics(self, report: FetchReport) -> FetchReport:
+        """Record per-source fetch latency, event counts and failures"""
+        for result in report.results:
+            name = source_name(result.source)
+            SOURCE_SECONDS.labels(source=name, stage='fetch').observe(result.duration)
+            if result.ok:
+                SOURCE_EVENTS.labels(source=name).inc(len(result.events))
+            else:
+                reason = 'timeout' if result.timed_out else 'error'
+                SOURCE_FAILURES.labels(source=name, reason=reason).inc()
+        EVENTS_PER_SECOND.labels(stage='fetch').set(per_second(len(report.events), report.duration))
+        return report
+
+    def _mark_timed_out(self, result: SourceResult, start: Optional[float], now: float):
+        """Record a source that did not finish in time"""
+        result.timed_out = True
+        result.duration = now - start if start is not None else 0.0
@@ -0,0 +1,214 @@
+import json
+import math
+import os
+import tempfile
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+Coordinates = Tuple[float, float]
+
+def haversine_km(a: Coordinates, b: Coordinates) -> float:
+    """Great-circle distance between two (lat, lon) points in kilometers"""
+    lat1, lon1 = map(math.radians, a)
+    lat2, lon2 = map(math.radians, b)
+    h = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+def gazetteer_key(location: str) -> str:
+    """Case- and whitespace-insensitive lookup key for a place name"""
+    return " ".join((location or "").lower().split())
+
+class Gazetteer:
+    """
+    Offline place name -> (lat, lon) lookup backed by a JSON file.
+    Misses can be resolved by an optional geocoder callable; its answers,
+    including "not found", are cached and written back with save().
+    """
+
+    def __init__(self, path: str = None, places: Dict[str, Coordinates] = None,
+                 geocoder: Callable[[str], Optional[Coordinates]] = None):
+        self.path = path
+        self.geocoder = geocoder
+        self._places: Dict[str, Optional[Coordinates]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.update(json.load(f))
+            self._dirty = False
+        if places:
+            self.update(places)
+
+    def __len__(self) -> int:
+        return sum(1 for coordinates in self._places.values() if coordinates is not None)
+
+    def update(self, places: Dict[str, Optional[Coordinates]]):
+        """Add or replace known places"""
+        with self._lock:
+            for name, coordinates in places.items():
+                self._places[gazetteer_key(name)] = (
+                    tuple(map(float, coordinates)) if coordinates is not None else None
+                )
+            self._dirty = True
+
+    def lookup(self, location: str) -> Optional[Coordinates]:
+        """
+        Coordinates of a location, or None if unknown.
+        "<venue> - <city>" locations fall back to the venue, then the city.
+        """
+        key = gazetteer_key(location)
+        if not key:
+            return None
+        candidates = [key] + [part.strip() for part in key.split(" - ")[:2] if part.strip() != key]
+        for candidate in candidates:
+            if candidate in self._places:
+                coordinates = self._places[candidate]
+                if coordinates is not None:
+                    return coordinates
+                continue
+            coordinates = self._geocode(candidate)
+            if coordinates is not None:
+                return coordinates
+        return None
+
+    def distance_km(self, a: str, b: str) -> Optional[float]:
+        """Distance between two locations, or None if either is unknown"""
+        first, second = self.lookup(a), self.lookup(b)
+        if first is None or second is None:
+            return None
+        return haversine_km(first, second)
+
+    def within(self, origin: str, location: str, max_distance: float) -> bool:
+        """
+        True when location is within max_distance km of origin.
+        Unknown locations only match by name.
+        """
+        if origin == location:
+            return True
+        distance = self.distance_km(origin, location)
+        return distance is not None and distance <= max_distance
+
+    def save(self, path: str = None):
+        """Write the places, including geocoded ones, back to the JSON file"""
+        path = path or self.path
+        if not path or not self._dirty:
+            return
+        with self._lock:
+            data = {name: list(coordinates) if coordinates is not None else None
+                    for name, coordinates in sorted(self._places.items())}
+            self._dirty = False
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=1)
+            os.replace(tmp_path, path)
+        except OSError:
+            os.remove(tmp_path)
+            raise
+
+    def _geocode(self, key: str) -> Optional[Coordinates]:
+        """Ask the geocoder about an unseen place and remember the answer"""
+        if self.geocoder is None:
+            return None
+        try:
+            coordinates = self.geocoder(key)
+        except Exception as e:
+            print(f"Error geocoding {key}: {e}")
+            return None
+        self.update({key: coordinates})
+        return self._places[key]
+
+class GeoIndex:
+    """
+    Uniform lat/lon grid of keyed points.
+    A radius query only visits the cells overlapping the circle's bounding
+    box and measures exact distances for the points inside them.
+    """
+
+    def __init__(self, cell_degrees: float = 0.25):
+        self.cell_degrees = cell_degrees
+        self._columns = math.ceil(360 / cell_degrees)
+        self._cells: Dict[Tuple[int, int], Dict[Hashable, Coordinates]] = defaultdict(dict)
+        self._points: Dict[Hashable, Tuple[Tuple[int, int], Coordinates]] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._points
+
+    def add(self, key: Hashable, coordinates: Coordinates):
+        """Insert or move a point"""
+        self.remove(key)
+        cell = self._cell(*coordinates)
+        self._cells[cell][key] = coordinates
+        self._points[key] = (cell, coordinates)
+
+    def remove(self, key: Hashable):
+        """Remove a point if present"""
+        entry = self._points.pop(key, None)
+        if entry is None:
+            return
+        cell = entry[0]
+        del self._cells[cell][key]
+        if not self._cells[cell]:
+            del self._cells[cell]
+
+    def clear(self):
+        """Drop all points"""
+        self._cells.clear()
+        self._points.clear()
+
+    def query(self, center: Coordinates, radius_km: float) -> Set[Hashable]:
+        """Keys of points within radius_km of center"""
+        return {key for key, _ in self.query_distances(center, radius_km)}
+
+    def query_distances(self, center: Coordinates, radius_km: float) -> List[Tuple[Hashable, float]]:
+        """(key, distance) for every point within radius_km of center"""
+        found = []
+        for cell in self._cells_near(center, radius_km):
+            for key, coordinates in self._cells.get(cell, {}).items():
+                distance = haversine_km(center, coordinates)
+                if distance <= radius_km:
+                    found.append((key, distance))
+        return found
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        row = math.floor((min(max(lat, -90.0), 90.0) + 90) / self.cell_degrees)
+        column = math.floor((lon + 180) / self.cell_degrees) % self._columns
+        return row, column
+
+    def _cells_near(self, center: Coordinates, radius_km: float) -> Iterable[Tuple[int, int]]:
+        """Cells overlapping the bounding box of a circle"""
+        lat, lon = center
+        lat_span = radius_km / KM_PER_DEGREE
+        low_lat, high_lat = max(lat - lat_span, -90.0), min(lat + lat_span, 90.0)
+        # Longitude degrees shrink towards the poles; use the widest latitude in the box
+        widest = max(abs(low_lat), abs(high_lat))
+        cos_lat = math.cos(math.radians(widest))
+        if high_lat >= 90.0 or low_lat <= -90.0 or cos_lat <= 1e-9:
+            lon_span = 180.0
+        else:
+            lon_span = min(radius_km / (KM_PER_DEGREE * cos_lat), 180.0)
+
+        first_row, _ = self._cell(low_lat, lon)
+        last_row, _ = self._cell(high_lat, lon)
+        if lon_span >= 180.0:
+            columns = range(self._columns)
+        else:
+            first_column = math.floor((lon - lon_span + 180) / self.cell_degrees)
+            last_column = math.floor((lon + lon_span + 180) / self.cell_degrees)
+            columns = [column % self._columns for column in range(first_column, last_column + 1)]
+
+        # Very large circles cover more cells than are occupied
+        if (last_row - first_row + 1) * len(columns) > len(self._cells):
+            rows = range(first_row, last_row + 1)
+            column_set = set(columns)
+            return [cell for cell in list(self._cells)
+                    if cell[0] in rows and cell[1] in column_set]
+        return [(row, column) for row in range(first_row, last_row + 1) for column in columns]
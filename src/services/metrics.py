@@ -0,0 +1,327 @@
+import functools
+import math
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+# Seconds; spans a parsed event (sub-millisecond) to a slow source fetch
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+                   0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Sample = Tuple[str, Dict[str, str], float]
+
+def per_second(count: float, seconds: float) -> float:
+    """Throughput of count items handled in seconds"""
+    return count / seconds if seconds > 0 else 0.0
+
+class Timer:
+    """
+    Observes the seconds spent in a with block, or in every call of a
+    decorated function. As a context manager, elapsed holds the duration
+    after the block.
+    """
+
+    __slots__ = ('_value', '_start', 'elapsed')
+
+    def __init__(self, value: "HistogramValue"):
+        self._value = value
+        self._start = 0.0
+        self.elapsed = 0.0
+
+    def __enter__(self) -> "Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.elapsed = time.perf_counter() - self._start
+        self._value.observe(self.elapsed)
+
+    def __call__(self, func: Callable) -> Callable:
+        value = self._value
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                value.observe(time.perf_counter() - start)
+        return wrapper
+
+class CounterValue:
+    """A monotonically increasing count for one label set"""
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        """Increase the count by amount"""
+        with self._lock:
+            self.value += amount
+
+class GaugeValue:
+    """A value that can go up and down, for one label set"""
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float):
+        """Replace the value"""
+        self.value = float(value)
+
+    def inc(self, amount: float = 1.0):
+        """Increase the value by amount (negative to decrease)"""
+        with self._lock:
+            self.value += amount
+
+class HistogramValue:
+    """Bucketed observations for one label set"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        # Per-bucket counts; the last one collects observations above every bound
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """Record one observation"""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self) -> Timer:
+        """Timer observing into this histogram"""
+        return Timer(self)
+
+class Metric:
+    """
+    A named metric with one value per combination of label values.
+    Metrics without labels can be used directly as their single value.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels):
+        """The value for a combination of label values, created on first use"""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        value = self._values.get(key)
+        if value is None:
+            with self._lock:
+                value = self._values.setdefault(key, self._new_value())
+        return value
+
+    def values(self) -> Iterator[Tuple[Dict[str, str], object]]:
+        """(labels, value) for every label set seen so far"""
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield dict(zip(self.labelnames, key)), value
+
+    def samples(self) -> List[Sample]:
+        """(name, labels, value) lines of the exposition format"""
+        return [(self.name, labels, value.value) for labels, value in self.values()]
+
+    def _new_value(self):
+        raise NotImplementedError
+
+class Counter(Metric):
+    kind = "counter"
+
+    def _new_value(self) -> CounterValue:
+        return CounterValue()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def _new_value(self) -> GaugeValue:
+        return GaugeValue()
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_value(self) -> HistogramValue:
+        return HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def time(self) -> Timer:
+        return self.labels().time()
+
+    def samples(self) -> List[Sample]:
+        samples = []
+        for labels, value in self.values():
+            with value._lock:
+                counts, total, count = list(value.counts), value.sum, value.count
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                samples.append((f"{self.name}_bucket", {**labels, 'le': format_value(bound)},
+                                cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, count))
+        return samples
+
+class MetricsRegistry:
+    """The set of metrics exported together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        """Add a metric; names must be unique"""
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Metric:
+        """Look up a registered metric"""
+        return self._metrics[name]
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+def escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+def escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{escape_label_value(value)}"' for name, value in labels.items())
+    return "{" + pairs + "}"
+
+def format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+def write_metrics(path: str, registry: MetricsRegistry = None):
+    """Write the metrics to a file atomically, e.g. for node_exporter's textfile collector"""
+    text = (registry or REGISTRY).render()
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except OSError:
+        os.remove(tmp_path)
+        raise
+
+def start_metrics_server(port: int, host: str = "127.0.0.1",
+                         registry: MetricsRegistry = None) -> ThreadingHTTPServer:
+    """
+    Serve the metrics at /metrics from a background thread.
+    Only local clients can connect unless host is set, e.g. to "0.0.0.0"
+    for a Prometheus server scraping from another machine.
+    """
+    registry = registry or REGISTRY
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', PROMETHEUS_CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Scrapes every few seconds would drown out the application's output
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+# Metrics of the event pipeline
+REGISTRY = MetricsRegistry()
+
+SOURCE_SECONDS = REGISTRY.histogram(
+    'cea_source_seconds', "Time spent per source and stage (fetch per source, parse per page)",
+    ('source', 'stage'))
+SOURCE_EVENTS = REGISTRY.counter(
+    'cea_source_events_total', "Events returned by each source", ('source',))
+SOURCE_FAILURES = REGISTRY.counter(
+    'cea_source_failures_total', "Source fetches that errored or timed out", ('source', 'reason'))
+PARSE_ERRORS = REGISTRY.counter(
+    'cea_parse_errors_total', "Events that could not be parsed", ('source',))
+STAGE_SECONDS = REGISTRY.histogram(
+    'cea_stage_seconds', "Time spent per pipeline stage", ('stage',))
+EVENTS_PER_SECOND = REGISTRY.gauge(
+    'cea_events_per_second', "Events handled per second by the last run of a stage", ('stage',))
+EMAILS = REGISTRY.counter(
+    'cea_emails_total', "Notification emails by outcome", ('result',))
+EMAILS_PER_SECOND = REGISTRY.gauge(
+    'cea_emails_per_second', "Emails sent per second by the last digest batch")
+
+def timed(stage: str) -> Timer:
+    """Timer for a pipeline stage, usable as decorator or context manager"""
+    return STAGE_SECONDS.labels(stage=stage).time()
@@ -0,0 +1,90 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Hashable, Iterable, Optional
+from src.models.event import Event
+
+def event_fingerprints(events: Iterable[Event]) -> FrozenSet[int]:
+    """Hashes of the full event contents, so edits count as changes too"""
+    return frozenset(hash(event.to_tuple()) for event in events)
+
+def change_fraction(previous: FrozenSet[int], current: FrozenSet[int]) -> float:
+    """Jaccard distance between two fetches: 0 when identical, 1 when disjoint"""
+    union = len(previous | current)
+    if not union:
+        return 0.0
+    return 1.0 - len(previous & current) / union
+
+@dataclass
+class SourceActivity:
+    """What has been observed about one source's fetches"""
+    interval: float
+    fingerprints: Optional[FrozenSet[int]] = None
+    observed_at: Optional[float] = None
+    # Estimated fraction of the source's events that change per second
+    change_rate: Optional[float] = None
+    fetches: int = 0
+    changes: int = 0
+
+class AdaptivePolling:
+    """
+    Picks a polling interval per source from how fast its events change.
+    Each successful fetch is compared with the previous one; the changed
+    fraction per second is smoothed into a change rate, and the interval is
+    chosen so about target_change of the events change between fetches,
+    kept within [min_interval, max_interval].
+    """
+
+    def __init__(self, min_interval: float = 300.0, max_interval: float = 86400.0,
+                 initial_interval: float = 3600.0, target_change: float = 0.1,
+                 smoothing: float = 0.5, clock: Callable[[], float] = time.monotonic):
+        if min_interval > max_interval:
+            raise ValueError("min_interval must not exceed max_interval")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = self._clamp(initial_interval)
+        self.target_change = target_change
+        self.smoothing = smoothing
+        self.clock = clock
+        self._sources: Dict[Hashable, SourceActivity] = {}
+        self._lock = threading.Lock()
+
+    def interval(self, source: Hashable) -> float:
+        """Current polling interval of a source in seconds"""
+        activity = self._sources.get(source)
+        return activity.interval if activity is not None else self.initial_interval
+
+    def activity(self, source: Hashable) -> Optional[SourceActivity]:
+        """Observations for a source, or None if it was never fetched"""
+        return self._sources.get(source)
+
+    def observe(self, source: Hashable, events: Iterable[Event]) -> float:
+        """Record a successful fetch and return the source's new interval"""
+        fingerprints = event_fingerprints(events)
+        now = self.clock()
+        with self._lock:
+            activity = self._sources.get(source)
+            if activity is None:
+                activity = self._sources[source] = SourceActivity(self.initial_interval)
+            if activity.fingerprints is not None and now > activity.observed_at:
+                changed = change_fraction(activity.fingerprints, fingerprints)
+                if changed:
+                    activity.changes += 1
+                sample = changed / (now - activity.observed_at)
+                if activity.change_rate is None:
+                    activity.change_rate = sample
+                else:
+                    activity.change_rate += self.smoothing * (sample - activity.change_rate)
+                activity.interval = self._interval_for(activity.change_rate)
+            activity.fingerprints = fingerprints
+            activity.observed_at = now
+            activity.fetches += 1
+            return activity.interval
+
+    def _interval_for(self, change_rate: float) -> float:
+        if change_rate <= 0:
+            return self.max_interval
+        return self._clamp(self.target_change / change_rate)
+
+    def _clamp(self, interval: float) -> float:
+        return min(max(interval, self.min_interval), self.max_interval)
@@ -0,0 +1,201 @@
+import threading
+import time
+from typing import Dict, List, Optional
+from src.models.event import Event
+from src.models.user_preferences import UserPreferences
+from src.services.deduplicator import EventDeduplicator
+from src.services.event_processor import EventDiff, EventProcessor
+from src.services.fetch_orchestrator import FetchOrchestrator, FetchReport
+from src.services.metrics import EMAILS_PER_SECOND, per_second
+from src.services.polling_policy import AdaptivePolling
+from src.services.scheduler import Scheduler
+from src.sources.base import EventSource, source_name
+from src.sources.http_cache import HTTPCache
+
+class RefreshPipeline:
+    """
+    Fetches sources, refreshes the event cache and sends digests as separate
+    steps, so each can run on its own cadence.
+    The latest events of every source are kept between fetches; a source
+    that fails keeps serving its previous events instead of having them
+    all reported as removed. With a polling policy, each scheduled source
+    is refetched at the interval its observed change rate calls for.
+    The users are subscribed to the processor once; assign a new list to
+    users to change them.
+    """
+
+    def __init__(self, sources: List[EventSource], processor: EventProcessor,
+                 users: List[UserPreferences], fetcher: FetchOrchestrator = None,
+                 deduplicator: EventDeduplicator = None, http_cache: HTTPCache = None,
+                 polling: AdaptivePolling = None):
+        self.sources = sources
+        self.processor = processor
+        self.users = users
+        self.fetcher = fetcher or FetchOrchestrator()
+        self.deduplicator = deduplicator or EventDeduplicator()
+        self.http_cache = http_cache
+        self.polling = polling
+        self._scheduler: Optional[Scheduler] = None
+        self._fetch_jobs: Dict[EventSource, str] = {}
+        self._lock = threading.Lock()
+        self._latest: Dict[EventSource, List[Event]] = {}
+        self._fetch_generation = 0
+        self._refreshed_generation = 0
+        # Pending digest events per user, keyed by event so updates replace
+        self._outbox: Dict[str, Dict[tuple, Event]] = {}
+
+    @property
+    def users(self) -> List[UserPreferences]:
+        return self._users
+
+    @users.setter
+    def users(self, users: List[UserPreferences]):
+        """Replace the users and rebuild the processor's subscription index"""
+        self._users = users
+        self.processor.subscribe_users(users)
+
+    def fetch_all(self) -> FetchReport:
+        """Fetch every source concurrently"""
+        report = self.fetcher.fetch_all(self.sources)
+        self._record(report)
+        return report
+
+    def fetch_source(self, source: EventSource) -> FetchReport:
+        """Fetch a single source"""
+        report = self.fetcher.fetch_all([source])
+        self._record(report)
+        return report
+
+    def refresh(self, force: bool = False) -> Optional[EventDiff]:
+        """
+        Merge the latest events of all sources into the processor's cache
+        and queue the resulting digests.
+        Skipped (returning None) until every source has been tried once, and
+        when nothing was fetched since the last refresh unless forced. Events
+        that have started since the last update are evicted either way.
+        """
+        with self._lock:
+            ready = len(self._latest) == len(self.sources) and (
+                force or self._fetch_generation != self._refreshed_generation)
+            if ready:
+                self._refreshed_generation = self._fetch_generation
+                events = [event for source in self.sources for event in self._latest[source]]
+        if not ready:
+            evicted = self.processor.evict_past()
+            if evicted:
+                print(f"Events evicted: {len(evicted)}")
+            return None
+
+        if self.http_cache is not None:
+            stats = self.http_cache.stats()
+            print(f"HTTP cache hit rate: {stats['hit_rate']:.0%} "
+                  f"({stats['hits']}/{stats['requests']} requests)")
+
+        # Merge the same event reported by several sources
+        all_events = self.deduplicator.deduplicate(events)
+        if self.deduplicator.last_merged:
+            print(f"Merged {self.deduplicator.last_merged} duplicate events")
+
+        # Update processor's event cache, routing each event to its subscribers
+        diff = self.processor.update_events(all_events)
+        print(f"Events added: {len(diff.added)}, updated: {len(diff.updated)}, "
+              f"removed: {len(diff.removed)}")
+        with self._lock:
+            for user_id, digest in self.processor.get_digests().items():
+                pending = self._outbox.setdefault(user_id, {})
+                for event in digest:
+                    pending[event.key] = event
+        return diff
+
+    def send_digests(self, users: List[UserPreferences] = None):
+        """Email the pending digests of the given users (default: everyone)"""
+        users = self.users if users is None else users
+        start = time.perf_counter()
+        sent = 0
+        for user in users:
+            with self._lock:
+                pending = self._outbox.pop(user.user_id, None)
+            if pending and user.notification_preferences.get('email'):
+                self.processor.send_email_notification(user, list(pending.values()))
+                sent += 1
+
+        # Wait for queued emails to go out before reporting
+        self.processor.flush_notifications()
+        if sent:
+            EMAILS_PER_SECOND.set(per_second(sent, time.perf_counter() - start))
+        if self.processor.delivery is not None:
+            metrics = self.processor.delivery.metrics
+            print(f"Emails sent: {metrics.sent}, failed: {metrics.failed}, "
+                  f"throughput: {metrics.throughput:.1f}/s")
+
+    def pending_digests(self) -> Dict[str, List[Event]]:
+        """Digest events queued but not yet sent, per user"""
+        with self._lock:
+            return {user_id: list(pending.values()) for user_id, pending in self._outbox.items()}
+
+    def run_once(self):
+        """Fetch everything, refresh and send all digests in one go"""
+        print("Fetching and processing events...")
+        self.fetch_all()
+        self.refresh(force=True)
+        self.send_digests()
+
+    def schedule(self, scheduler: Scheduler, source_interval: float = 3600.0,
+                 refresh_interval: float = 300.0, digest_interval: float = 3600.0,
+                 digest_batch_size: int = 500, jitter: float = 60.0,
+                 initial_delay: float = 0.0):
+        """
+        Register one fetch job per source, a refresh job and one digest job
+        per batch of users, each with its own cadence.
+        With a polling policy, source_interval is only used for sources it
+        has not observed yet.
+        """
+        self._scheduler = scheduler
+        for index, source in enumerate(self.sources):
+            name = f"fetch:{index}:{source_name(source)}"
+            interval = source_interval
+            if self.polling is not None and self.polling.activity(source) is not None:
+                interval = self.polling.interval(source)
+            scheduler.add_job(name, lambda source=source: self.fetch_source(source),
+                              interval=interval, jitter=jitter, delay=initial_delay)
+            self._fetch_jobs[source] = name
+        scheduler.add_job("refresh", self.refresh, interval=refresh_interval)
+        batch_size = max(digest_batch_size, 1)
+        for start in range(0, len(self.users), batch_size):
+            batch = self.users[start:start + batch_size]
+            scheduler.add_job(f"digest:{start // batch_size}",
+                              lambda batch=batch: self.send_digests(batch),
+                              interval=digest_interval, jitter=jitter,
+                              delay=refresh_interval)
+
+    def _record(self, report: FetchReport):
+        """Keep the events of sources that succeeded and log failures"""
+        for result in report.failures:
+            if result.timed_out:
+                print(f"Timed out fetching events from {source_name(result.source)} "
+                      f"after {result.duration:.1f}s")
+            else:
+                print(f"Error fetching events from {source_name(result.source)}: {result.error}")
+        with self._lock:
+            for result in report.results:
+                if result.ok:
+                    self._latest[result.source] = result.events
+                else:
+                    self._latest.setdefault(result.source, [])
+            self._fetch_generation += 1
+
+        if self.polling is not None:
+            for result in report.results:
+                if result.ok:
+                    self._adapt_interval(result.source, self.polling.observe(result.source, result.events))
+
+    def _adapt_interval(self, source: EventSource, interval: float):
+        """Move a source's scheduled fetches to its new interval"""
+        name = self._fetch_jobs.get(source)
+        job = self._scheduler.get_job(name) if name is not None else None
+        if job is None or job.interval == interval:
+            return
+        print(f"Polling {source_name(source)} every {interval:.0f}s "
+              f"(was {job.interval:.0f}s)")
+        # The source was just fetched, so its next fetch is a full interval away
+        self._scheduler.reschedule(name, interval=interval, delay=interval)
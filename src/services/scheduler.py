@@ -0,0 +1,178 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+@dataclass
+class Job:
+    """A function run every interval seconds, plus up to jitter seconds"""
+    name: str
+    func: Callable[[], object]
+    interval: float
+    jitter: float = 0.0
+    next_run: float = 0.0
+    running: bool = False
+    runs: int = 0
+    skipped: int = 0
+    failures: int = 0
+    last_duration: float = 0.0
+    last_error: Optional[BaseException] = None
+    # Bumped whenever the job is rescheduled, invalidating older heap entries
+    version: int = field(default=0, repr=False)
+
+class Scheduler:
+    """
+    In-process scheduler built on a heap of due times.
+    A dispatcher thread sleeps until the earliest job is due and hands it to
+    a worker pool, so jobs start on time rather than on a polling tick. A
+    job that is still running when it comes due again is skipped for that
+    round instead of overlapping with itself.
+    """
+
+    def __init__(self, workers: int = 4, clock: Callable[[], float] = time.monotonic,
+                 rng: random.Random = None):
+        self.clock = clock
+        self._rng = rng or random.Random()
+        self._jobs: Dict[str, Job] = {}
+        self._heap: List[Tuple[float, int, int, Job]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=workers,
+                                            thread_name_prefix="scheduler")
+        self._dispatcher: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def add_job(self, name: str, func: Callable[[], object], interval: float,
+                jitter: float = 0.0, delay: float = 0.0) -> Job:
+        """
+        Run func every interval seconds, first after delay seconds.
+        Each run is pushed back by a random 0..jitter seconds so jobs with
+        the same cadence spread out instead of firing together.
+        """
+        with self._condition:
+            if name in self._jobs:
+                raise ValueError(f"Job {name} is already scheduled")
+            job = Job(name, func, interval, jitter)
+            self._jobs[name] = job
+            self._push(job, self.clock() + delay)
+            return job
+
+    def remove_job(self, name: str):
+        """Stop scheduling a job; a run in progress is not interrupted"""
+        with self._condition:
+            job = self._jobs.pop(name, None)
+            if job is not None:
+                job.version += 1
+
+    def reschedule(self, name: str, interval: float = None, delay: float = None):
+        """
+        Change a job's interval and, with delay, when it next runs.
+        Without a delay the next run keeps its place, limited by the new interval.
+        """
+        with self._condition:
+            job = self._jobs[name]
+            now = self.clock()
+            if interval is not None:
+                job.interval = interval
+            if delay is None:
+                due = min(job.next_run, now + job.interval)
+            else:
+                due = now + delay
+            self._push(job, due, jitter=False)
+
+    def trigger(self, name: str):
+        """Run a job as soon as possible"""
+        self.reschedule(name, delay=0.0)
+
+    def get_job(self, name: str) -> Optional[Job]:
+        """Look up a scheduled job"""
+        return self._jobs.get(name)
+
+    def jobs(self) -> List[Job]:
+        """All scheduled jobs, soonest first"""
+        with self._condition:
+            return sorted(self._jobs.values(), key=lambda job: job.next_run)
+
+    def start(self):
+        """Start dispatching jobs on a background thread"""
+        with self._condition:
+            if self._dispatcher is not None:
+                return
+            self._stopped = False
+            self._dispatcher = threading.Thread(target=self._dispatch_loop,
+                                                name="scheduler-dispatch", daemon=True)
+            self._dispatcher.start()
+
+    def run_forever(self):
+        """Dispatch jobs until stop() is called or the process is interrupted"""
+        self.start()
+        # stop() may clear self._dispatcher from another thread at any point
+        dispatcher = self._dispatcher
+        try:
+            while dispatcher is not None and dispatcher.is_alive():
+                dispatcher.join(timeout=1.0)
+        except KeyboardInterrupt:
+            self.stop()
+
+    def stop(self, wait: bool = True):
+        """Stop dispatching; with wait, also let running jobs finish"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+            dispatcher, self._dispatcher = self._dispatcher, None
+        if dispatcher is not None and dispatcher is not threading.current_thread():
+            dispatcher.join()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _push(self, job: Job, due: float, jitter: bool = True):
+        """Queue the job's next run; caller holds the condition"""
+        job.version += 1
+        if jitter and job.jitter:
+            due += self._rng.uniform(0, job.jitter)
+        job.next_run = due
+        heapq.heappush(self._heap, (job.next_run, next(self._sequence), job.version, job))
+        self._condition.notify()
+
+    def _dispatch_loop(self):
+        with self._condition:
+            while not self._stopped:
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                due, _, version, job = self._heap[0]
+                if version != job.version or self._jobs.get(job.name) is not job:
+                    heapq.heappop(self._heap)
+                    continue
+                now = self.clock()
+                if due > now:
+                    self._condition.wait(due - now)
+                    continue
+
+                heapq.heappop(self._heap)
+                if job.running:
+                    job.skipped += 1
+                else:
+                    job.running = True
+                    self._executor.submit(self._run, job)
+                self._push(job, now + job.interval)
+
+    def _run(self, job: Job):
+        start = self.clock()
+        error = None
+        try:
+            job.func()
+        except Exception as e:
+            error = e
+            print(f"Error in scheduled job {job.name}: {e}")
+        finally:
+            with self._condition:
+                job.running = False
+                job.runs += 1
+                job.last_duration = self.clock() - start
+                job.last_error = error
+                if error is not None:
+                    job.failures += 1
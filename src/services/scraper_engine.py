@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Tuple
+from src.models.event import Event
+from src.services.parse_stage import ParseStage
+from src.sources.base import EventSource
+from src.sources.http_cache import HTTPCache
+from src.sources.site_config import ConfiguredSiteScraper, SiteConfig
+
+class MultiSiteScraperEngine(EventSource):
+    """
+    Scrapes many configured sites as a single event source.
+    Pages are downloaded on a thread pool, at most max_connections at a
+    time per site, and parsed on a process pool so parsing uses every core.
+    A page that fails, or is not done site_timeout seconds after its own
+    fetch started, is served from its last successful scrape, so one site
+    going down does not look like all of its events being removed. Pages
+    waiting for a worker are never timed out.
+    """
+
+    def __init__(self, configs: List[SiteConfig], max_workers: int = 32,
+                 parse_workers: int = None, http_cache: HTTPCache = None,
+                 parse_stage: ParseStage = None, site_timeout: float = None):
+        self.scrapers = [ConfiguredSiteScraper(config, http_cache) for config in configs]
+        self._limits = {config.name: threading.BoundedSemaphore(config.max_connections)
+                        for config in configs}
+        self.max_workers = max_workers
+        self.parse_stage = parse_stage or ParseStage(parse_workers)
+        self.site_timeout = site_timeout
+        self.errors: Dict[str, Exception] = {}
+        # Events of each page's last successful scrape
+        self._last_good: Dict[str, List[Event]] = {}
+
+    def fetch_events(self) -> List[Event]:
+        """
+        Fetch and parse every configured page, returning events in config order.
+        Raises when every page failed, so the caller keeps the previous events.
+        """
+        jobs = [(scraper, url) for scraper in self.scrapers for url in scraper.config.urls]
+        if not jobs:
+            return []
+
+        errors: Dict[str, Exception] = {}
+        results: Dict[int, List[Event]] = {}
+        queued = deque(range(len(jobs)))
+        # Future of each running page -> (job index, when its fetch started)
+        running: Dict[Future, Tuple[int, float]] = {}
+        # A page is only submitted when a worker is free, so it starts right away.
+        # Timed out pages are abandoned and free their slot for the pages behind them.
+        fetchers = ThreadPoolExecutor(max_workers=len(jobs))
+        try:
+            while queued or running:
+                while queued and len(running) < self.max_workers:
+                    index = queued.popleft()
+                    future = fetchers.submit(self._scrape, *jobs[index])
+                    running[future] = (index, time.monotonic())
+
+                timeout = None
+                if self.site_timeout:
+                    now = time.monotonic()
+                    for future, (index, started) in list(running.items()):
+                        if now - started >= self.site_timeout:
+                            del running[future]
+                            errors[jobs[index][1]] = TimeoutError(
+                                f"No response within {self.site_timeout}s")
+                    if not running:
+                        continue
+                    oldest = min(started for _, started in running.values())
+                    timeout = max(oldest + self.site_timeout - now, 0)
+
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, _ = running.pop(future)
+                    try:
+                        results[index] = future.result()
+                    except Exception as e:
+                        errors[jobs[index][1]] = e
+        finally:
+            # Leave stuck downloads behind rather than wait for them
+            fetchers.shutdown(wait=False)
+
+        events = []
+        for index, (_, url) in enumerate(jobs):
+            if index in results:
+                self._last_good[url] = results[index]
+                events.extend(results[index])
+            else:
+                print(f"Error scraping {url}: {errors[url]}")
+                events.extend(self._last_good.get(url, ()))
+        self.errors = errors
+        if len(errors) == len(jobs):
+            raise RuntimeError(f"All {len(jobs)} scraped pages failed")
+        return events
+
+    def validate_event(self, event: Event) -> bool:
+        """Events are validated by the per-site scrapers"""
+        return super().validate_event(event)
+
+    def close(self):
+        """Shut down the parse worker processes"""
+        self.parse_stage.close()
+
+    def _scrape(self, scraper: ConfiguredSiteScraper, url: str) -> List[Event]:
+        """Download a page under the site's connection limit, then parse it"""
+        with self._limits[scraper.config.name]:
+            page = scraper.fetch_raw_page(url)
+        if page.events is not None:
+            return page.events
+
+        events = self.parse_stage.parse(scraper, page.text)
+        scraper.store_parsed(page, events)
+        return events
@@ -0,0 +1,209 @@
+import heapq
+import itertools
+import math
+import re
+from collections import Counter
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+from src.models.event import Event
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Too common in listings to tell events apart
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "the", "this", "to", "with",
+})
+
+# Title terms count this many times over description terms
+TITLE_WEIGHT = 2
+
+# Each query term's postings and inverse document frequency
+Weights = List[Tuple[Dict[Hashable, int], float]]
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens without stopwords"""
+    return [token for token in TOKEN_PATTERN.findall((text or "").lower())
+            if token not in STOPWORDS]
+
+def event_terms(event: Event) -> Counter:
+    """Weighted term frequencies of an event's title and description"""
+    terms = Counter(tokenize(event.description))
+    for token in tokenize(event.title):
+        terms[token] += TITLE_WEIGHT
+    return terms
+
+def length_bucket(length: int) -> int:
+    """Quarter-octave bucket of an event length, for bounding scores by length"""
+    return int(math.log2(length) * 4)
+
+def bucket_floor(bucket: int) -> float:
+    """Shortest length in a bucket"""
+    return 2 ** (bucket / 4)
+
+class SearchIndex:
+    """
+    Inverted index over event titles and descriptions with BM25 ranking.
+    Postings map each term to the keys of the events containing it and the
+    term's weighted frequency there. Events are added and removed one at a
+    time, so the index follows the cache's diffs.
+
+    Each term's postings are also grouped by frequency and length bucket,
+    which bounds the score of every event in a group. Top-k queries read
+    groups best bound first and stop once no unread event can beat the
+    k-th best score (Fagin's threshold algorithm), so a common term does not
+    score every event that contains it.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[Hashable, int]] = {}
+        # term -> (frequency, length bucket) -> keys of those events
+        self._impacts: Dict[str, Dict[Tuple[int, int], Set[Hashable]]] = {}
+        self._lengths: Dict[Hashable, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, key: Hashable, event: Event):
+        """Index an event; replace a previous version with remove() first"""
+        terms = event_terms(event)
+        length = sum(terms.values())
+        bucket = length_bucket(length) if length else 0
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[key] = frequency
+            self._impacts.setdefault(term, {}).setdefault((frequency, bucket), set()).add(key)
+        self._lengths[key] = length
+        self._total_length += length
+
+    def remove(self, key: Hashable, event: Event):
+        """Remove an event previously added under key"""
+        length = self._lengths.pop(key, None)
+        if length is None:
+            return
+        self._total_length -= length
+        bucket = length_bucket(length) if length else 0
+        for term in event_terms(event):
+            postings = self._postings.get(term)
+            if postings is None or key not in postings:
+                continue
+            group = (postings.pop(key), bucket)
+            impacts = self._impacts[term]
+            impacts[group].discard(key)
+            if not impacts[group]:
+                del impacts[group]
+            if not postings:
+                del self._postings[term]
+                del self._impacts[term]
+
+    def clear(self):
+        """Drop all events"""
+        self._postings.clear()
+        self._impacts.clear()
+        self._lengths.clear()
+        self._total_length = 0
+
+    def document_frequency(self, term: str) -> int:
+        """Number of events containing a term"""
+        return len(self._postings.get(term, ()))
+
+    def search(self, query: str, candidates: Optional[Set[Hashable]] = None,
+               limit: int = 20, match_all: bool = True) -> List[Tuple[Hashable, float]]:
+        """
+        (key, score) of the best matching events, best first.
+        With match_all every query term must occur in the event, otherwise
+        any term will do. candidates restricts the results to those keys.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self._lengths or limit <= 0:
+            return []
+        postings = [self._postings.get(term, {}) for term in terms]
+        if match_all and not all(postings):
+            return []
+        weights = self._weights(postings)
+
+        sizes = [len(posting) for posting in postings]
+        walk_size = min(sizes) if match_all else sum(sizes)
+        if candidates is not None and len(candidates) < walk_size:
+            # Few candidates: scoring them all is cheaper than walking postings
+            test = all if match_all else any
+            keys = [key for key in candidates if test(key in posting for posting in postings)]
+            return heapq.nlargest(limit, self._scores(keys, weights), key=lambda item: item[1])
+        return self._top(limit, terms, weights, candidates, match_all)
+
+    def _weights(self, postings: List[Dict[Hashable, int]]) -> Weights:
+        """Each query term's postings with its inverse document frequency"""
+        count = len(self._lengths)
+        return [(posting, math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5)))
+                for posting in postings]
+
+    def _top(self, limit: int, terms: List[str], weights: Weights,
+             candidates: Optional[Set[Hashable]], match_all: bool) -> List[Tuple[Hashable, float]]:
+        """
+        Best events found by reading the query terms' groups, best bound
+        first, until the k-th best score is at least the sum of the terms'
+        next bounds, which no unread event can exceed.
+        """
+        k1 = self.k1
+        length_scale = k1 * self.b * len(self._lengths) / max(self._total_length, 1)
+        length_base = k1 * (1 - self.b)
+
+        # Per term, its groups by falling bound: the score of a term falls as
+        # events get longer, so a bucket's shortest length bounds its events
+        groups = []
+        for term, (_, idf) in zip(terms, weights):
+            bounds = [(idf * frequency * (k1 + 1)
+                       / (frequency + length_base + length_scale * bucket_floor(bucket)), keys)
+                      for (frequency, bucket), keys in self._impacts.get(term, {}).items()]
+            bounds.sort(key=lambda group: group[0], reverse=True)
+            groups.append(bounds)
+        cursors = [0] * len(groups)
+
+        best: List[Tuple[float, int, Hashable]] = []
+        seen: Set[Hashable] = set()
+        order = itertools.count()
+        postings = [posting for posting, _ in weights]
+        while True:
+            heads = [term_groups[cursor][0] if cursor < len(term_groups) else 0.0
+                     for term_groups, cursor in zip(groups, cursors)]
+            exhausted = [cursor == len(term_groups) for term_groups, cursor in zip(groups, cursors)]
+            # With match_all, every match was seen once any one term's events all were
+            if all(exhausted) or (match_all and any(exhausted)):
+                break
+            if len(best) == limit and best[0][0] >= sum(heads):
+                break
+            index = max(range(len(heads)), key=heads.__getitem__)
+            keys = [key for key in groups[index][cursors[index]][1] if key not in seen]
+            cursors[index] += 1
+            seen.update(keys)
+            if candidates is not None:
+                keys = [key for key in keys if key in candidates]
+            if match_all and len(postings) > 1:
+                keys = [key for key in keys if all(key in posting for posting in postings)]
+            for key, score in self._scores(keys, weights):
+                # Ties keep the event read first
+                entry = (score, -next(order), key)
+                if len(best) < limit:
+                    heapq.heappush(best, entry)
+                elif score > best[0][0]:
+                    heapq.heapreplace(best, entry)
+        best.sort(key=lambda entry: entry[:2], reverse=True)
+        return [(key, score) for score, _, key in best]
+
+    def _scores(self, keys: Iterable[Hashable],
+                weights: Weights) -> Iterator[Tuple[Hashable, float]]:
+        """(key, BM25 score) of each event for the query's postings and their idfs"""
+        count = len(self._lengths)
+        k1, b = self.k1, self.b
+        length_scale = k1 * b * count / max(self._total_length, 1)
+        length_base = k1 * (1 - b)
+        lengths = self._lengths
+        for key in keys:
+            length_norm = length_base + length_scale * lengths[key]
+            score = 0.0
+            for posting, idf in weights:
+                frequency = posting.get(key)
+                if frequency:
+                    score += idf * frequency * (k1 + 1) / (frequency + length_norm)
+            yield key, score
@@ -0,0 +1,71 @@
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+from datetime import datetime
+from typing import List, Optional, Tuple
+from src.models.event import Event
+
+SNAPSHOT_MAGIC = b"CEAS"
+# Bump whenever the row layout of Event.to_tuple() changes; snapshots of any
+# other version are rejected and the processor starts cold
+SNAPSHOT_VERSION = 2
+# magic, format version, payload length
+SNAPSHOT_HEADER = struct.Struct("<4sHQ")
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot file is truncated, corrupt or in an unknown format"""
+
+def save_snapshot(path: str, events: List[Event], last_update: Optional[datetime]):
+    """
+    Write events and the last update time to a binary snapshot.
+    Events are stored as tuples pickled with protocol 5, behind a versioned
+    header; the file is replaced atomically so readers never see a partial write.
+    """
+    payload = pickle.dumps(
+        {'last_update': last_update, 'events': [event.to_tuple() for event in events]},
+        protocol=5
+    )
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(payload)))
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def load_snapshot(path: str) -> Optional[Tuple[List[Event], Optional[datetime]]]:
+    """
+    Read a snapshot written by save_snapshot, or None if there is none.
+    The file is memory-mapped and unpickled straight from the mapping.
+    """
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return None
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        if size < SNAPSHOT_HEADER.size:
+            raise SnapshotError(f"Snapshot {path} is truncated")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            magic, version, length = SNAPSHOT_HEADER.unpack_from(mapped)
+            if magic != SNAPSHOT_MAGIC:
+                raise SnapshotError(f"{path} is not an event snapshot")
+            if version != SNAPSHOT_VERSION:
+                raise SnapshotError(f"Unsupported snapshot version {version}")
+            if size != SNAPSHOT_HEADER.size + length:
+                raise SnapshotError(f"Snapshot {path} is truncated")
+            with memoryview(mapped)[SNAPSHOT_HEADER.size:] as payload:
+                try:
+                    data = pickle.loads(payload)
+                except (pickle.UnpicklingError, EOFError, AttributeError, ImportError,
+                        IndexError, TypeError, ValueError) as e:
+                    raise SnapshotError(f"Snapshot {path} is corrupt: {e}") from e
+    try:
+        return [Event.from_tuple(row) for row in data['events']], data['last_update']
+    except (KeyError, TypeError, ValueError) as e:
+        raise SnapshotError(f"Snapshot {path} is corrupt: {e}") from e
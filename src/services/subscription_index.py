@@ -0,0 +1,117 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+from src.models.event import Event
+from src.models.user_preferences import UserPreferences
+from src.services.geo import Gazetteer, GeoIndex, gazetteer_key
+
+class SubscriptionIndex:
+    """Routes events to the users whose preferences they match"""
+
+    def __init__(self, users: Iterable[UserPreferences] = (), gazetteer: Gazetteer = None):
+        """With a gazetteer, users also get events within max_distance of their locations"""
+        self.gazetteer = gazetteer
+        self._users: Dict[str, UserPreferences] = {}
+        self._memberships: Dict[str, list] = {}
+        # Users are split by which filters they set, so routing never has
+        # to union in the (potentially huge) set of unfiltered users
+        self._by_category: Dict[str, Set[str]] = defaultdict(set)
+        self._by_location: Dict[str, Set[str]] = defaultdict(set)
+        self._category_only: Dict[str, Set[str]] = defaultdict(set)
+        self._location_only: Dict[str, Set[str]] = defaultdict(set)
+        self._match_all: Set[str] = set()
+        # Geocoded user locations, keyed by (user_id, location)
+        self._centers = GeoIndex()
+        self._max_distance = 0.0
+        for user in users:
+            self.add(user)
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def get_user(self, user_id: str) -> Optional[UserPreferences]:
+        """Look up the preferences registered for a user"""
+        return self._users.get(user_id)
+
+    def add(self, user: UserPreferences):
+        """Register a user's preferences, replacing any previous ones"""
+        if user.user_id in self._users:
+            self.remove(user.user_id)
+        self._users[user.user_id] = user
+
+        # Remember where the user was filed in case the preferences are mutated later
+        memberships = self._buckets(user)
+        self._memberships[user.user_id] = memberships
+        for bucket, values in memberships:
+            for value in values:
+                bucket[value].add(user.user_id)
+        if not user.categories and not user.locations:
+            self._match_all.add(user.user_id)
+        if self.gazetteer is not None:
+            for location in set(user.locations):
+                center = self.gazetteer.lookup(location)
+                if center is not None:
+                    self._centers.add((user.user_id, gazetteer_key(location)), center)
+                    self._max_distance = max(self._max_distance, user.max_distance)
+
+    def remove(self, user_id: str):
+        """Unregister a user"""
+        user = self._users.pop(user_id, None)
+        if user is None:
+            return
+        for bucket, values in self._memberships.pop(user_id):
+            for value in values:
+                subscribers = bucket.get(value)
+                if subscribers is not None:
+                    subscribers.discard(user_id)
+                    if not subscribers:
+                        del bucket[value]
+        self._match_all.discard(user_id)
+        for location in set(user.locations):
+            self._centers.remove((user_id, gazetteer_key(location)))
+
+    def route(self, event: Event) -> Set[str]:
+        """Return the ids of users whose preferences match the event"""
+        by_category = self._by_category.get(event.category, ())
+        by_location = self._by_location.get(event.location, ())
+        if len(by_category) > len(by_location):
+            by_category, by_location = by_location, by_category
+        user_ids = {user_id for user_id in by_category if user_id in by_location}
+
+        user_ids.update(self._category_only.get(event.category, ()))
+        user_ids.update(self._location_only.get(event.location, ()))
+        user_ids.update(self._match_all)
+        if len(self._centers):
+            user_ids.update(self._route_by_distance(event))
+        return user_ids
+
+    def _route_by_distance(self, event: Event) -> Set[str]:
+        """Users with a location within their max_distance of the event"""
+        coordinates = self.gazetteer.lookup(event.location)
+        if coordinates is None:
+            return set()
+        user_ids = set()
+        for (user_id, _), distance in self._centers.query_distances(coordinates, self._max_distance):
+            user = self._users[user_id]
+            if distance <= user.max_distance and (
+                    not user.categories or event.category in user.categories):
+                user_ids.add(user_id)
+        return user_ids
+
+    def build_digests(self, events: Iterable[Event]) -> Dict[str, List[Event]]:
+        """Map each user id to its matching events in a single pass over events"""
+        digests: Dict[str, List[Event]] = defaultdict(list)
+        for event in events:
+            for user_id in self.route(event):
+                digests[user_id].append(event)
+        return dict(digests)
+
+    def _buckets(self, user: UserPreferences):
+        """Posting lists a user belongs to, paired with the values to file under"""
+        if user.categories and user.locations:
+            return [(self._by_category, set(user.categories)),
+                    (self._by_location, set(user.locations))]
+        if user.categories:
+            return [(self._category_only, set(user.categories))]
+        if user.locations:
+            return [(self._location_only, set(user.locations))]
+        return []
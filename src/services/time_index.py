@@ -0,0 +1,104 @@
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+# Batches larger than this are merged with one sort instead of insort,
+# which shifts the list once per entry
+BULK_THRESHOLD = 64
+
+def sort_date(value: datetime) -> datetime:
+    """Naive local time, so aware and naive event dates can be ordered together"""
+    if value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+class TimeIndex:
+    """
+    Event keys kept sorted by event date.
+    Range queries bisect to the first entry and slice, so they cost
+    O(log n + k). Keys must be orderable to break ties between equal dates.
+    Batches go through add_many and remove_many, which rebuild the list in
+    one pass instead of shifting it once per event.
+    """
+
+    def __init__(self):
+        self._entries: List[Tuple[datetime, Hashable]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, key: Hashable, event):
+        """Insert an event's key at its date"""
+        insort(self._entries, (sort_date(event.date), key))
+
+    def remove(self, key: Hashable, event):
+        """Remove a key previously added for the event"""
+        self._discard((sort_date(event.date), key))
+
+    def add_many(self, items: Iterable[Tuple[Hashable, object]]):
+        """Insert (key, event) pairs, sorting once for large batches"""
+        entries = [(sort_date(event.date), key) for key, event in items]
+        if len(entries) <= BULK_THRESHOLD:
+            for entry in entries:
+                insort(self._entries, entry)
+        else:
+            # Timsort merges the sorted run and the new entries in O(n + m log m)
+            self._entries.extend(entries)
+            self._entries.sort()
+
+    def remove_many(self, items: Iterable[Tuple[Hashable, object]]):
+        """Remove (key, event) pairs, filtering once for large batches"""
+        entries = [(sort_date(event.date), key) for key, event in items]
+        if len(entries) <= BULK_THRESHOLD:
+            for entry in entries:
+                self._discard(entry)
+        else:
+            stale = set(entries)
+            self._entries = [entry for entry in self._entries if entry not in stale]
+
+    def clear(self):
+        """Drop all entries"""
+        self._entries.clear()
+
+    def between(self, start: datetime = None, end: datetime = None,
+                limit: int = None) -> List[Hashable]:
+        """Keys of events with start <= date < end, in date order"""
+        low, high = self._bounds(start, end)
+        if limit is not None:
+            high = min(high, low + limit)
+        return [key for _, key in self._entries[low:high]]
+
+    def upcoming(self, now: datetime = None, within: timedelta = None,
+                 limit: int = None) -> List[Hashable]:
+        """Keys of events from now on, optionally only those within a period"""
+        now = now or datetime.now()
+        return self.between(now, now + within if within is not None else None, limit)
+
+    def by_day(self, start: datetime = None, end: datetime = None) -> Dict[date, List[Hashable]]:
+        """Keys between start and end bucketed by calendar day, in date order"""
+        low, high = self._bounds(start, end)
+        days = defaultdict(list)
+        for when, key in self._entries[low:high]:
+            days[when.date()].append(key)
+        return dict(days)
+
+    def evict_before(self, cutoff: datetime) -> List[Hashable]:
+        """Remove and return the keys of events dated before cutoff"""
+        position = bisect_left(self._entries, (sort_date(cutoff),))
+        evicted = [key for _, key in self._entries[:position]]
+        del self._entries[:position]
+        return evicted
+
+    def _bounds(self, start: datetime, end: datetime) -> Tuple[int, int]:
+        """Slice of entries with start <= date < end"""
+        # (date,) sorts before every (date, key), so bisect lands on the first match
+        low = 0 if start is None else bisect_left(self._entries, (sort_date(start),))
+        high = len(self._entries) if end is None else bisect_left(self._entries, (sort_date(end),))
+        return low, high
+
+    def _discard(self, entry: Tuple[datetime, Hashable]):
+        """Remove one entry if present"""
+        position = bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position] == entry:
+            del self._entries[position]
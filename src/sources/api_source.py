@@ -0,0 +1,70 @@
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+from src.models.event import Event
+from src.services.metrics import PARSE_ERRORS, SOURCE_SECONDS
+from src.sources.base import EventSource, source_name
+from src.sources.pagination import iter_pages
+
+# request_page(cursor) sends the request for a page and returns the response
+PageRequester = Callable[[Optional[Any]], Any]
+# read_page(response) returns the page's raw events and the cursor of the next page
+PageReader = Callable[[Any], Tuple[List[dict], Optional[Any]]]
+
+class PagedAPISource(EventSource):
+    """
+    Base for JSON APIs that page through their results. Subclasses set
+    session, rate_limiter, http_cache and max_pages, and parse one raw event
+    with _parse_event.
+    """
+
+    def _get(self, url: str, **kwargs):
+        """Rate limited GET, made conditional when an HTTP cache is configured"""
+        session = self.http_cache.wrap(self.session) if self.http_cache else self.session
+        return self.rate_limiter.get(session, url, **kwargs)
+
+    def iter_paged_events(self, request_page: PageRequester,
+                          read_page: PageReader) -> Iterator[Event]:
+        """
+        Yield events page by page, prefetching the next page in the background.
+        Every page is revalidated on its own: a page answered with 304 reuses
+        the events parsed from it last time, while changed pages are parsed
+        and their events stored with them.
+        """
+        def fetch_page(cursor):
+            response = request_page(cursor)
+            response.raise_for_status()
+            items, next_cursor = read_page(response)
+            return (response, items), next_cursor
+
+        for response, items in iter_pages(fetch_page, max_pages=self.max_pages):
+            cached = self._cached_events(response)
+            if cached is not None:
+                yield from cached
+                continue
+            parsed = self._parse_page(items)
+            if self.http_cache:
+                self.http_cache.store_events(response, parsed)
+            yield from parsed
+
+    def _parse_page(self, items: List[dict]) -> List[Event]:
+        """The valid events of one page, counting those that fail to parse"""
+        parsed = []
+        with SOURCE_SECONDS.labels(source=source_name(self), stage='parse').time():
+            for event_data in items:
+                try:
+                    event = self._parse_event(event_data)
+                    if self.validate_event(event):
+                        parsed.append(event)
+                except Exception as e:
+                    PARSE_ERRORS.labels(source=source_name(self)).inc()
+                    print(f"Error parsing {source_name(self)} event: {e}")
+        return parsed
+
+    def _cached_events(self, response) -> Optional[List[Event]]:
+        """Events parsed from this page before, if it was answered with 304"""
+        if not self.http_cache:
+            return None
+        return self.http_cache.cached_events(response)
+
+    def _parse_event(self, event_data: dict) -> Event:
+        """Build an event from one raw API event"""
+        raise NotImplementedError
@@ -1,7 +1,22 @@
+import hashlib
 from abc import ABC, abstractmethod
-from typing import List
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 from src.models.event import Event
 
+@dataclass
+class RawPage:
+    """A downloaded page waiting to be parsed"""
+    url: str
+    text: str = None
+    events: List[Event] = None  # Set when the page is known not to need parsing
+    response: Any = None
+
+def source_name(source) -> str:
+    """Readable name for a source, used in job names, metric labels and logs"""
+    return getattr(source, 'source_name', None) or type(source).__name__
+
 class EventSource(ABC):
     """Base interface for event sources"""
     
@@ -17,6 +32,26 @@ class EventSource(ABC):
             return False
         return True
     
+    def parser_spec(self) -> Optional[Tuple[type, tuple, Dict[str, Any]]]:
+        """
+        Class and constructor arguments that rebuild this source's parser in
+        another process. Sources that return None cannot split fetching from
+        parsing and are always fetched with fetch_events.
+        """
+        return None
+    
+    def fetch_raw(self) -> List[RawPage]:
+        """Download pages without parsing them"""
+        raise NotImplementedError
+    
+    def parse_raw(self, text: str) -> List[Event]:
+        """Parse the events out of a downloaded page"""
+        raise NotImplementedError
+    
+    def store_parsed(self, page: RawPage, events: List[Event]):
+        """Hook called with the events parsed from a raw page"""
+        pass
+    
     def standardize_location(self, location: str) -> str:
         """Standardize location format"""
         # Basic implementation - could be enhanced with geocoding
@@ -27,6 +62,16 @@ class EventSource(ABC):
         # To be implemented by specific sources based on their date formats
         raise NotImplementedError
     
+    def make_event_id(self, source: str, title: str, date: datetime, location: str) -> str:
+        """Build a deterministic event id from its normalized identifying fields"""
+        key = "\x1f".join([
+            source,
+            self.clean_text(title).lower(),
+            date.isoformat(),
+            self.standardize_location(location)
+        ])
+        return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+    
     def clean_text(self, text: str) -> str:
         """Clean and standardize text fields"""
         if not text:
@@ -1,15 +1,20 @@
 import os
 import requests
 from datetime import datetime
-from typing import List
-import time
-from src.sources.base import EventSource
+from typing import Iterator, List
+from src.sources.api_source import PagedAPISource
+from src.sources.http_cache import HTTPCache
+from src.sources.rate_limiter import RateLimiter, default_rate_limiter
 from src.models.event import Event
 
-class EventbriteSource(EventSource):
+class EventbriteSource(PagedAPISource):
     """Event source for Eventbrite API"""
     
-    def __init__(self):
+    def __init__(self, max_pages: int = None, rate_limiter: RateLimiter = None,
+                 http_cache: HTTPCache = None):
+        self.max_pages = max_pages
+        self.rate_limiter = rate_limiter or default_rate_limiter
+        self.http_cache = http_cache
         self.api_key = os.getenv('EVENTBRITE_API_KEY')
         if not self.api_key:
             raise ValueError("EVENTBRITE_API_KEY environment variable is required")
@@ -24,35 +29,35 @@ class EventbriteSource(EventSource):
     def fetch_events(self) -> List[Event]:
         """Fetch events from Eventbrite API"""
         try:
-            # Search for events
-            endpoint = f"{self.base_url}/events/search/"
-            params = {
-                'expand': 'venue,category',  # Include venue and category details
-                'status': 'live',           # Only live events
-                'sort_by': 'date',
-            }
-            
-            response = self.session.get(endpoint, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            events = []
-            for event_data in data.get('events', []):
-                try:
-                    event = self._parse_event(event_data)
-                    if self.validate_event(event):
-                        events.append(event)
-                    time.sleep(0.1)  # Rate limiting
-                except Exception as e:
-                    print(f"Error parsing Eventbrite event: {e}")
-                    continue
-                    
-            return events
-            
+            return list(self.iter_events())
         except requests.RequestException as e:
             print(f"Error fetching Eventbrite events: {e}")
             return []
     
+    def iter_events(self) -> Iterator[Event]:
+        """Yield events page by page, prefetching the next page in the background"""
+        # Search for events
+        endpoint = f"{self.base_url}/events/search/"
+        params = {
+            'expand': 'venue,category',  # Include venue and category details
+            'status': 'live',           # Only live events
+            'sort_by': 'date',
+        }
+        
+        def request_page(continuation):
+            page_params = dict(params)
+            if continuation:
+                page_params['continuation'] = continuation
+            return self._get(endpoint, params=page_params)
+        
+        def read_page(response):
+            data = response.json()
+            pagination = data.get('pagination') or {}
+            next_page = pagination.get('continuation') if pagination.get('has_more_items') else None
+            return data.get('events', []), next_page
+        
+        return self.iter_paged_events(request_page, read_page)
+    
     def _parse_event(self, event_data: dict) -> Event:
         """Parse event data from Eventbrite API response"""
         venue = event_data.get('venue', {})
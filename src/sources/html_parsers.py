@@ -0,0 +1,190 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:  # optional dependency
+    etree = lxml_html = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxHTMLParser
+except ImportError:  # optional dependency
+    SelectolaxHTMLParser = None
+
+# Parsed card: field name -> stripped text (None when the element is missing)
+Card = Dict[str, Optional[str]]
+
+@dataclass(frozen=True)
+class CardSelectors:
+    """
+    Where to find an event card and its fields.
+    Selectors are limited to "tag.class" (either part optional), which every
+    backend can compile into its own native lookup.
+    """
+    card: str = "div.event-card"
+    fields: Dict[str, str] = field(default_factory=lambda: {
+        'title': "h2.event-title",
+        'description': "p.event-description",
+        'date': "span.event-date",
+        'location': "span.event-location",
+        'category': "span.event-category",
+    })
+    link: str = "a.event-link"
+
+def split_selector(selector: str) -> Tuple[Optional[str], Optional[str]]:
+    """Split a "tag.class" selector into its tag and class parts"""
+    tag, _, css_class = selector.strip().partition(".")
+    return tag or None, css_class or None
+
+class ParserBackend:
+    """Extracts event cards from a listing page"""
+
+    name = "base"
+
+    def __init__(self, selectors: CardSelectors = None):
+        self.selectors = selectors or CardSelectors()
+
+    def extract(self, html: str) -> List[Card]:
+        """Return the text of each configured field for every card on the page"""
+        raise NotImplementedError
+
+class BeautifulSoupBackend(ParserBackend):
+    """BeautifulSoup backend; with strain=True only event cards are built"""
+
+    name = "html.parser"
+
+    def __init__(self, selectors: CardSelectors = None, features: str = "html.parser",
+                 strain: bool = True):
+        super().__init__(selectors)
+        self.features = features
+        self.name = features
+        card_tag, card_class = split_selector(self.selectors.card)
+        self._card = (card_tag, card_class)
+        self._strainer = (SoupStrainer(card_tag, class_=self._class_matcher(card_class))
+                          if strain else None)
+        self._fields = {name: split_selector(selector)
+                        for name, selector in self.selectors.fields.items()}
+        self._link = split_selector(self.selectors.link)
+
+    @staticmethod
+    def _class_matcher(css_class: Optional[str]):
+        """
+        Match one class of a multi-class attribute. While straining, the
+        attribute arrives as the raw string, so a plain class_ filter would
+        miss cards like class="event-card featured".
+        """
+        if css_class is None:
+            return None
+
+        def matches(value) -> bool:
+            if not value:
+                return False
+            classes = value.split() if isinstance(value, str) else value
+            return css_class in classes
+        return matches
+
+    def extract(self, html: str) -> List[Card]:
+        soup = BeautifulSoup(html, self.features, parse_only=self._strainer)
+        tag, css_class = self._card
+        return [self.extract_card(element)
+                for element in soup.find_all(tag, class_=css_class)]
+
+    def extract_card(self, element) -> Card:
+        """Read the configured fields from one card element"""
+        card = {}
+        for name, (tag, css_class) in self._fields.items():
+            found = element.find(tag, class_=css_class)
+            card[name] = found.text.strip() if found is not None else None
+        tag, css_class = self._link
+        link = element.find(tag, class_=css_class)
+        card['url'] = link.get('href') if link is not None else None
+        return card
+
+class LxmlBackend(ParserBackend):
+    """lxml backend using XPath expressions compiled once per selector"""
+
+    name = "lxml"
+
+    def __init__(self, selectors: CardSelectors = None):
+        if lxml_html is None:
+            raise ImportError("lxml is required for the lxml parser backend")
+        super().__init__(selectors)
+        self._card = etree.XPath("//" + self._xpath_step(self.selectors.card))
+        self._fields = {name: etree.XPath(".//" + self._xpath_step(selector) + "[1]")
+                        for name, selector in self.selectors.fields.items()}
+        self._link = etree.XPath(".//" + self._xpath_step(self.selectors.link) + "[1]/@href")
+
+    @staticmethod
+    def _xpath_step(selector: str) -> str:
+        tag, css_class = split_selector(selector)
+        step = tag or "*"
+        if css_class:
+            step += ("[contains(concat(' ', normalize-space(@class), ' '), "
+                     f"' {css_class} ')]")
+        return step
+
+    def extract(self, html: str) -> List[Card]:
+        if not html.strip():
+            return []
+        root = lxml_html.fromstring(html)
+        cards = []
+        for element in self._card(root):
+            card = {}
+            for name, xpath in self._fields.items():
+                found = xpath(element)
+                card[name] = found[0].text_content().strip() if found else None
+            link = self._link(element)
+            card['url'] = str(link[0]) if link else None
+            cards.append(card)
+        return cards
+
+class SelectolaxBackend(ParserBackend):
+    """selectolax (lexbor) backend using CSS selectors"""
+
+    name = "selectolax"
+
+    def __init__(self, selectors: CardSelectors = None):
+        if SelectolaxHTMLParser is None:
+            raise ImportError("selectolax is required for the selectolax parser backend")
+        super().__init__(selectors)
+
+    def extract(self, html: str) -> List[Card]:
+        tree = SelectolaxHTMLParser(html)
+        cards = []
+        for element in tree.css(self.selectors.card):
+            card = {}
+            for name, selector in self.selectors.fields.items():
+                found = element.css_first(selector)
+                card[name] = found.text().strip() if found is not None else None
+            link = element.css_first(self.selectors.link)
+            card['url'] = link.attributes.get('href') if link is not None else None
+            cards.append(card)
+        return cards
+
+def available_backends() -> List[str]:
+    """Names of the parser backends usable in this environment"""
+    names = ["html.parser"]
+    if lxml_html is not None:
+        names.append("lxml")
+    if SelectolaxHTMLParser is not None:
+        names.append("selectolax")
+    return names
+
+def get_parser_backend(name: str = "auto", selectors: CardSelectors = None) -> ParserBackend:
+    """
+    Create a parser backend by name.
+    "auto" picks the fastest installed one: selectolax, then lxml, then
+    BeautifulSoup's built-in html.parser.
+    """
+    if name == "auto":
+        name = available_backends()[-1]
+    if name == "selectolax":
+        return SelectolaxBackend(selectors)
+    if name == "lxml":
+        return LxmlBackend(selectors)
+    if name in ("html.parser", "bs4"):
+        return BeautifulSoupBackend(selectors)
+    if name == "bs4-lxml":
+        return BeautifulSoupBackend(selectors, features="lxml")
+    raise ValueError(f"Unknown parser backend: {name}")
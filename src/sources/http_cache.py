@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+from requests.utils import parse_header_links
+from src.models.event import Event
+
+class CachedResponse:
+    """Stand-in for a requests.Response rebuilt from a cache entry after a 304"""
+
+    from_cache = True
+
+    def __init__(self, cache_key: str, entry: dict):
+        self.cache_key = cache_key
+        self.url = entry.get('url')
+        self.status_code = 200
+        self.headers = entry.get('headers', {})
+        self.text = entry.get('body', '')
+
+    @property
+    def links(self) -> Dict[str, dict]:
+        """Links of the stored Link header, keyed like requests.Response.links"""
+        header = self.headers.get('Link')
+        if not header:
+            return {}
+        return {link.get('rel') or link.get('url'): link for link in parse_header_links(header)}
+
+    @property
+    def content(self) -> bytes:
+        return self.text.encode('utf-8')
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        pass
+
+class CachedSession:
+    """Wraps a requests session so GETs go through an HTTPCache"""
+
+    def __init__(self, session, cache: "HTTPCache"):
+        self.session = session
+        self.cache = cache
+
+    def get(self, url: str, **kwargs):
+        return self.cache.get(self.session, url, **kwargs)
+
+class HTTPCache:
+    """On-disk cache of response validators, bodies and the events parsed from them"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.requests = 0
+        self.hits = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, params: dict = None) -> str:
+        """Cache key for a URL and its query parameters"""
+        query = urlencode(sorted((params or {}).items()), doseq=True)
+        return hashlib.sha256(f"{url}?{query}".encode('utf-8')).hexdigest()
+
+    def wrap(self, session) -> CachedSession:
+        """Return a session-like object whose GETs are conditional"""
+        return CachedSession(session, self)
+
+    def get(self, session, url: str, params: dict = None, headers: dict = None, **kwargs):
+        """
+        Issue a conditional GET. On 304 the stored body is returned as a
+        CachedResponse; otherwise successful responses refresh the entry.
+        """
+        cache_key = self.key(url, params)
+        entry = self.load(cache_key)
+        request_headers = dict(headers or {})
+        if entry:
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        request_kwargs = dict(kwargs)
+        if params is not None:
+            request_kwargs['params'] = params
+        if request_headers:
+            request_kwargs['headers'] = request_headers
+        response = session.get(url, **request_kwargs)
+
+        not_modified = entry is not None and response.status_code == 304
+        with self._lock:
+            self.requests += 1
+            if not_modified:
+                self.hits += 1
+        if not_modified:
+            return CachedResponse(cache_key, entry)
+
+        response.from_cache = False
+        response.cache_key = cache_key
+        if response.status_code == 200:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                stored_headers = {'Content-Type': response.headers.get('Content-Type', '')}
+                if response.headers.get('Link'):
+                    # Replayed pages still need to know where the next page is
+                    stored_headers['Link'] = response.headers['Link']
+                self._write(cache_key, {
+                    'url': url,
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'headers': stored_headers,
+                    'body': response.text,
+                })
+        return response
+
+    def cached_events(self, response) -> Optional[List[Event]]:
+        """Events parsed from an unchanged response, or None if it must be parsed"""
+        if getattr(response, 'from_cache', False) is not True:
+            return None
+        entry = self.load(response.cache_key)
+        if not entry or entry.get('events') is None:
+            return None
+        return [Event.from_dict(data) for data in entry['events']]
+
+    def store_events(self, response, events: List[Event]):
+        """Remember the events parsed from a response so a later 304 can reuse them"""
+        cache_key = getattr(response, 'cache_key', None)
+        if not isinstance(cache_key, str):
+            return
+        entry = self.load(cache_key)
+        if entry is None:
+            return
+        entry['events'] = [event.to_dict() for event in events]
+        self._write(cache_key, entry)
+
+    def load(self, cache_key: str) -> Optional[dict]:
+        """Read a cache entry from disk"""
+        try:
+            with open(self._path(cache_key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def stats(self) -> Dict[str, float]:
+        """Conditional request counts and hit rate"""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'hits': self.hits,
+                'misses': self.requests - self.hits,
+                'hit_rate': self.hits / self.requests if self.requests else 0.0
+            }
+
+    def _path(self, cache_key: str) -> str:
+        return os.path.join(self.directory, f"{cache_key}.json")
+
+    def _write(self, cache_key: str, entry: dict):
+        """Write an entry atomically so readers never see a partial file"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(cache_key))
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
@@ -1,15 +1,20 @@
 import os
 import requests
 from datetime import datetime
-from typing import List
-import time
-from src.sources.base import EventSource
+from typing import Iterator, List
+from src.sources.api_source import PagedAPISource
+from src.sources.http_cache import HTTPCache
+from src.sources.rate_limiter import RateLimiter, default_rate_limiter
 from src.models.event import Event
 
-class MeetupSource(EventSource):
+class MeetupSource(PagedAPISource):
     """Event source for Meetup.com API"""
     
-    def __init__(self):
+    def __init__(self, max_pages: int = None, rate_limiter: RateLimiter = None,
+                 http_cache: HTTPCache = None):
+        self.max_pages = max_pages
+        self.rate_limiter = rate_limiter or default_rate_limiter
+        self.http_cache = http_cache
         self.api_key = os.getenv('MEETUP_API_KEY')
         if not self.api_key:
             raise ValueError("MEETUP_API_KEY environment variable is required")
@@ -24,34 +29,34 @@ class MeetupSource(EventSource):
     def fetch_events(self) -> List[Event]:
         """Fetch events from Meetup.com API"""
         try:
-            # Get events for specified location/topic
-            endpoint = f"{self.base_url}/find/upcoming_events"
-            params = {
-                'page': 20,  # Number of results
-                'fields': 'group_key_photo',  # Include group photo
-            }
-            
-            response = self.session.get(endpoint, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            events = []
-            for event_data in data.get('events', []):
-                try:
-                    event = self._parse_event(event_data)
-                    if self.validate_event(event):
-                        events.append(event)
-                    time.sleep(0.1)  # Rate limiting
-                except Exception as e:
-                    print(f"Error parsing Meetup event: {e}")
-                    continue
-                    
-            return events
-            
+            return list(self.iter_events())
         except requests.RequestException as e:
             print(f"Error fetching Meetup events: {e}")
             return []
     
+    def iter_events(self) -> Iterator[Event]:
+        """Yield events page by page, prefetching the next page in the background"""
+        # Get events for specified location/topic
+        endpoint = f"{self.base_url}/find/upcoming_events"
+        params = {
+            'page': 20,  # Number of results per page
+            'fields': 'group_key_photo',  # Include group photo
+        }
+        
+        def request_page(next_url):
+            if next_url:
+                # The next link already carries the query parameters
+                return self._get(next_url)
+            return self._get(endpoint, params=params)
+        
+        def read_page(response):
+            data = response.json()
+            # Meetup paginates through the Link response header
+            links = response.links if isinstance(response.links, dict) else {}
+            return data.get('events', []), links.get('next', {}).get('url')
+        
+        return self.iter_paged_events(request_page, read_page)
+    
     def _parse_event(self, event_data: dict) -> Event:
         """Parse event data from Meetup API response"""
         venue = event_data.get('venue', {})
@@ -0,0 +1,67 @@
+import queue
+import threading
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+# fetch_page(cursor) returns the page's items and the cursor of the next page
+PageFetcher = Callable[[Optional[Any]], Tuple[List[Any], Optional[Any]]]
+
+_DONE = object()
+
+def iter_pages(fetch_page: PageFetcher, max_pages: int = None,
+               prefetch: bool = True) -> Iterator[List[Any]]:
+    """
+    Yield pages of results, following cursors until there are no more.
+    With prefetch enabled the next page is requested in a background thread
+    while the caller works through the current one; at most one page is
+    buffered, so memory stays bounded however many pages a query returns.
+    """
+    if not prefetch:
+        yield from _fetch_pages(fetch_page, max_pages)
+        return
+
+    buffer: "queue.Queue" = queue.Queue(maxsize=1)
+    stopped = threading.Event()
+
+    def produce():
+        try:
+            for page in _fetch_pages(fetch_page, max_pages):
+                if not _put(buffer, page, stopped):
+                    return
+            _put(buffer, _DONE, stopped)
+        except BaseException as e:
+            _put(buffer, e, stopped)
+
+    worker = threading.Thread(target=produce, name="page-prefetch", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # The caller may stop early; let the producer give up its next put
+        stopped.set()
+
+def _fetch_pages(fetch_page: PageFetcher, max_pages: int = None) -> Iterator[List[Any]]:
+    """Fetch pages one after another in the calling thread"""
+    cursor = None
+    fetched = 0
+    while True:
+        items, cursor = fetch_page(cursor)
+        fetched += 1
+        yield items
+        if not cursor or (max_pages is not None and fetched >= max_pages):
+            return
+
+def _put(buffer: "queue.Queue", item, stopped: threading.Event) -> bool:
+    """Put into the buffer unless the consumer has gone away"""
+    while not stopped.is_set():
+        try:
+            buffer.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+from urllib.parse import urlparse
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at a fixed rate"""
+
+    def __init__(self, rate: float, capacity: float = None, clock=time.monotonic):
+        """rate is tokens per second, capacity is the largest allowed burst"""
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens now and return how long the caller must wait before using them"""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def block_for(self, seconds: float):
+        """Hold back all callers for the given number of seconds"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+
+    def drain(self):
+        """Drop all saved-up tokens, e.g. when the provider says the quota is spent"""
+        with self._lock:
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = self._clock()
+
+class RateLimiter:
+    """Per-host token buckets shared by every source talking to that host"""
+
+    def __init__(self, default_rate: float = 10.0, default_capacity: float = None,
+                 host_rates: Dict[str, float] = None):
+        self.default_rate = default_rate
+        self.default_capacity = default_capacity
+        self.host_rates = dict(host_rates or {})
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        """Return the bucket for the URL's host, creating it on first use"""
+        host = urlparse(url).netloc or url
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.host_rates.get(host, self.default_rate),
+                                     self.default_capacity)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url: str):
+        """Block the calling thread until a request to url is allowed"""
+        wait = self.bucket_for(url).reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, url: str):
+        """Wait on the event loop until a request to url is allowed"""
+        wait = self.bucket_for(url).reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def update_from_response(self, url: str, status_code: int, headers: Mapping[str, str]):
+        """Honor Retry-After and X-RateLimit-* headers from a response"""
+        bucket = self.bucket_for(url)
+        retry_after = parse_retry_after(headers.get('Retry-After'))
+        if retry_after is not None:
+            bucket.block_for(retry_after)
+        elif status_code == 429:
+            bucket.drain()
+
+        remaining = headers.get('X-RateLimit-Remaining')
+        if remaining is not None and str(remaining).strip() == '0':
+            bucket.drain()
+            reset = parse_rate_limit_reset(headers.get('X-RateLimit-Reset'))
+            if reset is not None:
+                bucket.block_for(reset)
+
+    def get(self, session, url: str, **kwargs):
+        """Issue a rate limited GET through a requests session"""
+        self.acquire(url)
+        response = session.get(url, **kwargs)
+        headers = getattr(response, 'headers', None)
+        if isinstance(headers, Mapping):
+            self.update_from_response(url, getattr(response, 'status_code', 200), headers)
+        return response
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either in seconds or as an HTTP date"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+def parse_rate_limit_reset(value: Optional[str]) -> Optional[float]:
+    """Parse X-RateLimit-Reset, which providers send as seconds or an epoch time"""
+    if value is None:
+        return None
+    try:
+        reset = float(value)
+    except (TypeError, ValueError):
+        return None
+    # Values this large can only be absolute epoch timestamps
+    if reset > 1e9:
+        reset -= time.time()
+    return max(reset, 0.0)
+
+# Shared by all sources so every thread and task respects the same per-host budget
+default_rate_limiter = RateLimiter()
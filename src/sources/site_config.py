@@ -0,0 +1,127 @@
+import json
+import os
+import requests
+from requests.adapters import HTTPAdapter
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Dict, List, Optional
+from src.models.event import Event
+from src.sources.base import EventSource, RawPage
+from src.sources.html_parsers import CardSelectors, Card
+from src.sources.http_cache import HTTPCache
+from src.sources.web_scraper import CommunityWebScraper
+
+try:
+    import yaml
+except ImportError:  # optional dependency, only needed for YAML configs
+    yaml = None
+
+DEFAULT_FIELDS = CardSelectors().fields
+
+@dataclass
+class SiteConfig:
+    """Selectors and limits for scraping one community site"""
+    name: str
+    urls: List[str]
+    card: str = "div.event-card"
+    fields: Dict[str, str] = field(default_factory=lambda: dict(DEFAULT_FIELDS))
+    link: str = "a.event-link"
+    date_formats: List[str] = field(default_factory=lambda: [
+        "%Y-%m-%d %H:%M", "%B %d, %Y %I:%M %p"
+    ])
+    default_category: Optional[str] = None
+    min_description_length: int = 10
+    max_connections: int = 2
+    parser: str = "auto"
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    def selectors(self) -> CardSelectors:
+        """Card selectors for the parser backend"""
+        return CardSelectors(card=self.card, fields=dict(self.fields), link=self.link)
+
+    def to_dict(self):
+        """Convert config to dictionary format"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Create a SiteConfig from a dictionary, accepting a single url"""
+        data = dict(data)
+        if 'url' in data:
+            data['urls'] = [data.pop('url')] + list(data.get('urls', []))
+        if not data.get('name') or not data.get('urls'):
+            raise ValueError("Site config requires a name and at least one url")
+        return cls(**data)
+
+def load_site_configs(path: str) -> List[SiteConfig]:
+    """Load site configs from a JSON or YAML file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if os.path.splitext(path)[1].lower() in ('.yaml', '.yml'):
+            if yaml is None:
+                raise ImportError("PyYAML is required to load YAML site configs")
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get('sites', [])
+    return [SiteConfig.from_dict(site) for site in data]
+
+class ConfiguredSiteScraper(CommunityWebScraper):
+    """Web scraper whose selectors and date formats come from a SiteConfig"""
+
+    def __init__(self, config: SiteConfig, http_cache: HTTPCache = None):
+        super().__init__(config.urls[0], http_cache=http_cache, parser=config.parser,
+                         selectors=config.selectors())
+        self.config = config
+        self.source_name = config.name
+        self.headers.update(config.headers)
+        # Keep no more pooled connections per host than the site allows
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=config.max_connections)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def fetch_events(self) -> List[Event]:
+        """Fetch events from every listing page of the site"""
+        events = []
+        for url in self.config.urls:
+            try:
+                events.extend(self.fetch_page(url))
+            except requests.RequestException as e:
+                print(f"Error fetching events from {self.config.name}: {e}")
+        return events
+
+    def fetch_raw(self) -> List[RawPage]:
+        """Download every listing page of the site without parsing"""
+        pages = []
+        for url in self.config.urls:
+            try:
+                pages.append(self.fetch_raw_page(url))
+            except requests.RequestException as e:
+                print(f"Error fetching events from {self.config.name}: {e}")
+        return pages
+
+    def parser_spec(self):
+        """Rebuild this site's parser in a worker process"""
+        return (ConfiguredSiteScraper, (self.config,), {})
+
+    def _build_event(self, card: Card) -> Event:
+        """Fill in the site's default category before building the event"""
+        if card.get('category') is None and self.config.default_category:
+            card = dict(card, category=self.config.default_category)
+        return super()._build_event(card)
+
+    def parse_date(self, date_str: str) -> datetime:
+        """Parse a date using the site's configured formats"""
+        date_str = date_str.strip()
+        for date_format in self.config.date_formats:
+            try:
+                return datetime.strptime(date_str, date_format)
+            except ValueError:
+                continue
+        raise ValueError(f"Unable to parse date: {date_str}")
+
+    def validate_event(self, event: Event) -> bool:
+        """Validate using the site's minimum description length"""
+        if not EventSource.validate_event(self, event):
+            return False
+        return len(event.description) >= self.config.min_description_length
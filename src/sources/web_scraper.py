@@ -2,15 +2,25 @@ import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
 from typing import List
-import uuid
-from src.sources.base import EventSource
+from src.services.metrics import PARSE_ERRORS, SOURCE_SECONDS
+from src.sources.base import EventSource, RawPage, source_name
+from src.sources.html_parsers import Card, CardSelectors, get_parser_backend
+from src.sources.http_cache import HTTPCache
 from src.models.event import Event
 
 class CommunityWebScraper(EventSource):
     """Example web scraper for community events"""
     
-    def __init__(self, base_url: str):
+    REQUIRED_FIELDS = ('title', 'description', 'date', 'location', 'category')
+    
+    def __init__(self, base_url: str, http_cache: HTTPCache = None, parser: str = "auto",
+                 selectors: CardSelectors = None):
+        """parser names the HTML backend: auto, html.parser, lxml or selectolax"""
         self.base_url = base_url
+        self.http_cache = http_cache
+        self.parser_name = parser
+        self.parser = get_parser_backend(parser, selectors)
+        self.source_name = "community_web"
         self.session = requests.Session()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
@@ -19,29 +29,77 @@ class CommunityWebScraper(EventSource):
     def fetch_events(self) -> List[Event]:
         """Fetch events from the community website"""
         try:
-            response = self.session.get(self.base_url, headers=self.headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            events = []
-            # Example: looking for event cards/containers
-            event_elements = soup.find_all('div', class_='event-card')
-            
-            for element in event_elements:
-                try:
-                    event = self._parse_event(element)
-                    if self.validate_event(event):
-                        events.append(event)
-                except Exception as e:
-                    print(f"Error parsing event: {e}")
-                    continue
-                    
-            return events
-            
+            return self.fetch_page(self.base_url)
         except requests.RequestException as e:
             print(f"Error fetching events: {e}")
             return []
     
+    def fetch_page(self, url: str) -> List[Event]:
+        """Fetch and parse one listing page"""
+        page = self.fetch_raw_page(url)
+        if page.events is not None:
+            return page.events
+        
+        with SOURCE_SECONDS.labels(source=source_name(self), stage='parse').time():
+            events = self.parse_page(page.text)
+        self.store_parsed(page, events)
+        return events
+    
+    def fetch_raw_page(self, url: str) -> RawPage:
+        """Download one listing page, leaving parsing to the caller"""
+        response = self.get_page(url)
+        
+        # Page unchanged since the last scrape: skip parsing entirely
+        if self.http_cache:
+            cached = self.http_cache.cached_events(response)
+            if cached is not None:
+                return RawPage(url, events=cached)
+        return RawPage(url, text=response.text, response=response)
+    
+    def fetch_raw(self) -> List[RawPage]:
+        """Download the listing page without parsing it"""
+        return [self.fetch_raw_page(self.base_url)]
+    
+    def parse_raw(self, text: str) -> List[Event]:
+        """Parse a listing page downloaded by fetch_raw"""
+        return self.parse_page(text)
+    
+    def store_parsed(self, page: RawPage, events: List[Event]):
+        """Remember parsed events so an unchanged page is not parsed again"""
+        if self.http_cache and page.response is not None:
+            self.http_cache.store_events(page.response, events)
+    
+    def parser_spec(self):
+        """Rebuild this scraper's parser in a worker process"""
+        return (CommunityWebScraper, (self.base_url,),
+                {'parser': self.parser_name, 'selectors': self.parser.selectors})
+    
+    def get_page(self, url: str):
+        """Download a listing page, conditionally when an HTTP cache is configured"""
+        if self.http_cache:
+            response = self.http_cache.get(self.session, url, headers=self.headers)
+        else:
+            response = self.session.get(url, headers=self.headers)
+        response.raise_for_status()
+        return response
+    
+    def parse_page(self, html: str) -> List[Event]:
+        """Parse the valid events out of a listing page"""
+        events = []
+        # Example: looking for event cards/containers
+        cards = self.parser.extract(html)
+        
+        for card in cards:
+            try:
+                event = self._build_event(card)
+                if self.validate_event(event):
+                    events.append(event)
+            except Exception as e:
+                PARSE_ERRORS.labels(source=source_name(self)).inc()
+                print(f"Error parsing event: {e}")
+                continue
+        return events
+    
     def _parse_event(self, element: BeautifulSoup) -> Event:
         """Parse event data from HTML element"""
         # Example parsing logic - adjust based on actual HTML structure
@@ -55,15 +113,34 @@ class CommunityWebScraper(EventSource):
         url_element = element.find('a', class_='event-link')
         url = url_element['href'] if url_element else None
         
+        return self._build_event({
+            'title': title,
+            'description': description,
+            'date': date_str,
+            'location': location,
+            'category': category,
+            'url': url
+        })
+    
+    def _build_event(self, card: Card) -> Event:
+        """Create an event from the field texts extracted from a card"""
+        for name in self.REQUIRED_FIELDS:
+            if card.get(name) is None:
+                raise ValueError(f"Missing event field: {name}")
+        title = card['title']
+        location = card['location']
+        date = self.parse_date(card['date'])
+        
         return Event(
-            id=str(uuid.uuid4()),
+            # Same event on every scrape gets the same id, so refreshes can be diffed
+            id=self.make_event_id(self.source_name, title, date, location),
             title=self.clean_text(title),
-            description=self.clean_text(description),
-            date=self.parse_date(date_str),
+            description=self.clean_text(card['description']),
+            date=date,
             location=self.standardize_location(location),
-            category=category.lower(),
-            source="community_web",
-            url=url
+            category=card['category'].lower(),
+            source=self.source_name,
+            url=card.get('url')
         )
     
     def parse_date(self, date_str: str) -> datetime:
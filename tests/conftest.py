@@ -19,6 +19,23 @@ def base_url():
     """Base URL for web scraper testing"""
     return "http://example.com/events"
 
+@pytest.fixture(scope="session")
+def make_event():
+    """Factory for test events; any field can be overridden by keyword"""
+    def make(event_id="1", **fields):
+        data = {
+            'id': str(event_id),
+            'title': f"Event {event_id}",
+            'description': "Description",
+            'date': datetime(2024, 1, 1, 18, 30),
+            'location': "downtown",
+            'category': "technology",
+            'source': "test",
+        }
+        data.update(fields)
+        return Event(**data)
+    return make
+
 @pytest.fixture(scope="function")
 def future_datetime():
     """Generate a future datetime for testing"""
@@ -158,4 +158,111 @@ def test_eventbrite_invalid_response():
     source.session.get = Mock(return_value=mock_response)
     
     events = source.fetch_events()
-    assert len(events) == 0
\ No newline at end of file
+    assert len(events) == 0
+
+def make_eventbrite_page(ids, continuation=None):
+    """Recorded-style Eventbrite page with optional continuation token"""
+    return {
+        "pagination": {
+            "has_more_items": continuation is not None,
+            "continuation": continuation
+        },
+        "events": [{
+            "id": event_id,
+            "name": {"text": f"Event {event_id}"},
+            "description": {"text": "Description"},
+            "start": {"local": "2024-05-01T09:00:00"},
+            "venue": {"name": "Venue", "address": {"city": "New York"}},
+            "category": {"name": "Technology"},
+            "url": f"http://eventbrite.com/e/{event_id}"
+        } for event_id in ids]
+    }
+
+def make_meetup_response(ids, next_url=None):
+    """Recorded-style Meetup response with an optional Link: rel=next header"""
+    response = Mock()
+    response.json.return_value = {
+        "events": [{
+            "id": event_id,
+            "name": f"Event {event_id}",
+            "time": 1714500000000,
+            "venue": {"name": "Venue", "city": "New York"},
+            "link": f"http://meetup.com/event/{event_id}"
+        } for event_id in ids]
+    }
+    response.links = {"next": {"url": next_url, "rel": "next"}} if next_url else {}
+    return response
+
+@patch.dict('os.environ', {'EVENTBRITE_API_KEY': 'fake_key'})
+def test_eventbrite_follows_continuation():
+    """Test Eventbrite pages are followed through continuation tokens"""
+    source = EventbriteSource()
+    pages = [
+        make_eventbrite_page(["1", "2"], continuation="c1"),
+        make_eventbrite_page(["3"], continuation="c2"),
+        make_eventbrite_page(["4"]),
+    ]
+    responses = []
+    for page in pages:
+        response = Mock()
+        response.json.return_value = page
+        responses.append(response)
+    source.session.get = Mock(side_effect=responses)
+    
+    events = source.fetch_events()
+    
+    assert [event.id for event in events] == ["1", "2", "3", "4"]
+    continuations = [call.kwargs['params'].get('continuation')
+                     for call in source.session.get.call_args_list]
+    assert continuations == [None, "c1", "c2"]
+
+@patch.dict('os.environ', {'EVENTBRITE_API_KEY': 'fake_key'})
+def test_eventbrite_max_pages():
+    """Test pagination stops at max_pages"""
+    source = EventbriteSource(max_pages=2)
+    response = Mock()
+    response.json.return_value = make_eventbrite_page(["1"], continuation="again")
+    source.session.get = Mock(return_value=response)
+    
+    assert len(source.fetch_events()) == 2
+    assert source.session.get.call_count == 2
+
+@patch.dict('os.environ', {'MEETUP_API_KEY': 'fake_key'})
+def test_meetup_follows_link_header():
+    """Test Meetup pages are followed through the Link header"""
+    source = MeetupSource()
+    next_url = "https://api.meetup.com/find/upcoming_events?page=20&scroll=since:2"
+    source.session.get = Mock(side_effect=[
+        make_meetup_response(["1", "2"], next_url=next_url),
+        make_meetup_response(["3"]),
+    ])
+    
+    events = source.fetch_events()
+    
+    assert [event.id for event in events] == ["1", "2", "3"]
+    assert source.session.get.call_args_list[1].args == (next_url,)
+
+@patch.dict('os.environ', {'MEETUP_API_KEY': 'fake_key'})
+def test_meetup_error_on_later_page():
+    """Test a failing page aborts the fetch like a failing first request"""
+    source = MeetupSource()
+    source.session.get = Mock(side_effect=[
+        make_meetup_response(["1"], next_url="https://api.meetup.com/next"),
+        requests.RequestException("API Error"),
+    ])
+    
+    assert source.fetch_events() == []
+
+@patch.dict('os.environ', {'MEETUP_API_KEY': 'fake_key'})
+def test_meetup_iter_events_is_lazy():
+    """Test streaming only fetches ahead by a bounded number of pages"""
+    source = MeetupSource()
+    source.session.get = Mock(side_effect=lambda *args, **kwargs: make_meetup_response(
+        ["1"], next_url="https://api.meetup.com/next"
+    ))
+    
+    events = source.iter_events()
+    next(events)
+    events.close()
+    
+    assert source.session.get.call_count <= 3
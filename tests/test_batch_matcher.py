@@ -0,0 +1,87 @@
+import random
+from datetime import datetime
+import numpy as np
+import pytest
+from unittest.mock import patch
+from src.models.user_preferences import UserPreferences
+from src.services.batch_matcher import match_users
+from src.services.geo import Gazetteer
+
+CATEGORIES = ["technology", "music", "arts", "sports"]
+LOCATIONS = ["downtown", "park", "library", "harbor"]
+
+@pytest.fixture
+def random_events(make_event):
+    def make(rng, count, locations=LOCATIONS):
+        return [make_event(index, date=datetime(2024, 1, 1), location=rng.choice(locations),
+                           category=rng.choice(CATEGORIES))
+                for index in range(count)]
+    return make
+
+def random_users(rng, count):
+    return [UserPreferences(
+        user_id=f"user{index}",
+        categories=rng.sample(CATEGORIES + ["cooking"], rng.randint(0, 2)),
+        locations=rng.sample(LOCATIONS + ["suburbs"], rng.randint(0, 2))
+    ) for index in range(count)]
+
+def test_match_users_agrees_with_matches_event(random_events):
+    """Test the vectorized matrix equals object-by-object matching"""
+    rng = random.Random(7)
+    events = random_events(rng, 200)
+    users = random_users(rng, 100)
+    matrix = match_users(users, events)
+
+    expected = np.array([[user.matches_event(event) for event in events] for user in users])
+    assert matrix.shape == (100, 200)
+    assert np.array_equal(matrix.to_dense(), expected)
+    assert matrix.nnz == expected.sum()
+    for user in users:
+        assert matrix.events_for(user.user_id) == [e for e in events if user.matches_event(e)]
+
+def test_match_users_in_blocks(random_events):
+    """Test matching a few users at a time gives the same matrix as one block"""
+    rng = random.Random(3)
+    events = random_events(rng, 50)
+    users = random_users(rng, 37)
+    whole = match_users(users, events)
+    with patch('src.services.batch_matcher.BLOCK_CELLS', 5 * len(events)):
+        blocked = match_users(users, events)
+    assert np.array_equal(blocked.indptr, whole.indptr)
+    assert np.array_equal(blocked.indices, whole.indices)
+
+def test_match_users_digests_skip_users_without_matches(random_events):
+    """Test digests only include users with at least one match"""
+    rng = random.Random(1)
+    events = random_events(rng, 10)
+    users = [UserPreferences(user_id="all"),
+             UserPreferences(user_id="none", categories=["cooking"])]
+    digests = match_users(users, events).to_digests()
+    assert digests == {"all": events}
+
+def test_match_users_empty_inputs(random_events):
+    """Test empty user or event lists give an empty matrix"""
+    users = [UserPreferences(user_id="user1")]
+    matrix = match_users(users, [])
+    assert matrix.shape == (1, 0)
+    assert matrix.nnz == 0
+    assert list(matrix.row("user1")) == []
+    assert match_users([], random_events(random.Random(0), 3)).shape == (0, 3)
+
+def test_match_users_by_distance(random_events):
+    """Test radius matching agrees with matches_event given a gazetteer"""
+    gazetteer = Gazetteer("config/gazetteer.example.json")
+    places = ["midtown", "hoboken", "newark", "philadelphia", "stamford", "Secret Loft"]
+    rng = random.Random(11)
+    events = random_events(rng, 100, places)
+    users = [UserPreferences(
+        user_id=f"user{index}",
+        categories=rng.sample(CATEGORIES, rng.randint(0, 2)),
+        locations=rng.sample(places + ["brooklyn"], rng.randint(0, 2)),
+        max_distance=rng.choice([5.0, 20.0, 150.0])
+    ) for index in range(60)]
+
+    matrix = match_users(users, events, gazetteer)
+    expected = np.array([[user.matches_event(event, gazetteer) for event in events]
+                         for user in users])
+    assert np.array_equal(matrix.to_dense(), expected)
@@ -0,0 +1,42 @@
+import json
+from benchmarks.generators import make_events, make_listing_page, make_users
+from benchmarks.suite import Case, compare, main, time_case
+
+def result(seconds):
+    return {'seconds': seconds}
+
+def test_generators_are_seeded():
+    """Test the same seed always produces the same inputs"""
+    assert make_events(50, seed=7) == make_events(50, seed=7)
+    assert make_events(50, seed=7) != make_events(50, seed=8)
+    assert make_users(50, seed=7) == make_users(50, seed=7)
+    assert make_listing_page(20, seed=7) == make_listing_page(20, seed=7)
+    assert make_listing_page(20).count('class="event-card"') == 20
+
+def test_time_case_prepares_every_repeat():
+    """Test prepare runs untimed before each timed call"""
+    calls = []
+    case = Case("demo", lambda: lambda: calls.append("run"), operations=4,
+                prepare=lambda: calls.append("prepare"))
+    timing = time_case(case, repeat=3)
+    assert calls == ["prepare", "run"] * 3
+    assert timing['repeat'] == 3
+    assert timing['per_operation_us'] == timing['seconds'] / 4 * 1e6
+
+def test_compare_flags_regressions():
+    """Test slowdowns beyond the threshold are regressions and speedups improvements"""
+    baseline = {'results': {'same': result(1.0), 'slower': result(1.0),
+                            'faster': result(1.0), 'gone': result(1.0)}}
+    current = {'results': {'same': result(1.1), 'slower': result(1.3),
+                           'faster': result(0.5), 'new': result(1.0)}}
+    regressed, improved = compare(baseline, current, threshold=0.15)
+    assert regressed == ['slower']
+    assert improved == ['faster']
+
+def test_compare_saved_results_exit_status(tmp_path):
+    """Test --compare exits with 1 only when something regressed"""
+    baseline, current = tmp_path / "baseline.json", tmp_path / "current.json"
+    baseline.write_text(json.dumps({'results': {'case': result(1.0)}}))
+    current.write_text(json.dumps({'results': {'case': result(2.0)}}))
+    assert main(['--compare', str(baseline), str(current)]) == 1
+    assert main(['--compare', str(baseline), str(baseline)]) == 0
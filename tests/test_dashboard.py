@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta
+import pytest
+from src.models.user_preferences import UserPreferences
+from src.services.dashboard import create_app, decode_cursor, encode_cursor
+from src.services.event_processor import EventProcessor
+
+@pytest.fixture
+def make_events(make_event):
+    def make(count, category="technology"):
+        start = datetime.now().replace(microsecond=0) + timedelta(days=1)
+        # Listed newest first, so the API has to sort them
+        return [make_event(i, date=start + timedelta(hours=i), location="Hall",
+                           category=category, source="stub")
+                for i in reversed(range(count))]
+    return make
+
+@pytest.fixture
+def processor(make_events):
+    processor = EventProcessor({})
+    processor.update_events(make_events(5))
+    return processor
+
+@pytest.fixture
+def users():
+    return [
+        UserPreferences(user_id="tech", categories=["technology"]),
+        UserPreferences(user_id="hidden", notification_preferences={"email": True, "dashboard": False}),
+    ]
+
+@pytest.fixture
+def app(processor, users):
+    return create_app(processor, users, page_size=2)
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+def test_keyset_pagination_in_date_order(client):
+    """Test pages follow each other by cursor and cover every match once"""
+    ids, after = [], None
+    while True:
+        query = {'after': after} if after else {}
+        data = client.get('/api/users/tech/events', query_string=query).get_json()
+        ids += [event['id'] for event in data['events']]
+        after = data['next']
+        if after is None:
+            break
+    assert ids == ['0', '1', '2', '3', '4']
+
+def test_cursor_survives_removed_event(client, processor, make_events):
+    """Test a cursor pointing at an event that went away still resumes after it"""
+    first = client.get('/api/users/tech/events').get_json()
+    assert [event['id'] for event in first['events']] == ['0', '1']
+    processor.update_events([event for event in make_events(5) if event.id != '1'])
+    second = client.get('/api/users/tech/events', query_string={'after': first['next']}).get_json()
+    assert [event['id'] for event in second['events']] == ['2', '3']
+
+def test_etag_not_modified_until_update(client, processor, make_events):
+    """Test unchanged pages revalidate with 304 until the events change"""
+    response = client.get('/api/users/tech/events')
+    etag = response.headers['ETag']
+    assert etag
+
+    again = client.get('/api/users/tech/events', headers={'If-None-Match': etag})
+    assert again.status_code == 304
+
+    processor.update_events(make_events(6))
+    changed = client.get('/api/users/tech/events', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+
+def test_matches_computed_once_per_generation(app, client, processor, monkeypatch, make_events):
+    """Test repeated requests are served from the caches until update_events"""
+    calls = []
+    original = processor.get_matching_events
+    monkeypatch.setattr(processor, 'get_matching_events',
+                        lambda user: calls.append(user.user_id) or original(user))
+    feed = app.extensions['dashboard_feed']
+
+    for limit in (1, 2, 2, 3):
+        client.get('/api/users/tech/events', query_string={'limit': limit})
+    assert calls == ['tech']
+    assert feed.pages.hits == 1
+
+    processor.update_events(make_events(3))
+    assert len(feed.pages) == 0
+    data = client.get('/api/users/tech/events').get_json()
+    assert calls == ['tech', 'tech']
+    assert [event['id'] for event in data['events']] == ['0', '1']
+
+def test_update_during_request_does_not_pin_stale_page(client, processor, monkeypatch, make_events):
+    """Test a page built across an update is never revalidated as current"""
+    original = processor.get_matching_events
+
+    def update_first(user):
+        # An update lands after the request read the generation
+        monkeypatch.setattr(processor, 'get_matching_events', original)
+        processor.update_events(make_events(2))
+        return original(user)
+
+    monkeypatch.setattr(processor, 'get_matching_events', update_first)
+    generation = processor.generation
+    racing = client.get('/api/users/tech/events')
+    assert racing.get_json()['version'].endswith(f"-{generation}")
+
+    current = client.get('/api/users/tech/events',
+                         headers={'If-None-Match': racing.headers['ETag']})
+    assert current.status_code == 200
+    assert current.get_json()['version'].endswith(f"-{processor.generation}")
+
+def test_errors(client):
+    """Test unknown users, opted-out users and bad parameters are rejected"""
+    assert client.get('/api/users/nobody/events').status_code == 404
+    assert client.get('/api/users/hidden/events').status_code == 403
+    assert client.get('/api/users/tech/events?limit=0').status_code == 400
+    assert client.get('/api/users/tech/events?limit=abc').status_code == 400
+    assert client.get('/api/users/tech/events?after=garbage').status_code == 400
+
+def test_cursor_round_trip():
+    """Test cursors decode to the key they were made from"""
+    key = (datetime(2030, 5, 1, 18, 30), "meetup", "a/b")
+    assert decode_cursor(encode_cursor(key)) == key
+    with pytest.raises(ValueError):
+        decode_cursor("bm90IGpzb24")
@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta
+import pytest
+from src.services.deduplicator import EventDeduplicator, normalize_location, normalize_title
+
+@pytest.fixture
+def listing(make_event):
+    """An event as listed by one source, on May 1st 2024 unless dated otherwise"""
+    def make(event_id, title, location, source, date=datetime(2024, 5, 1, 18, 0), **fields):
+        return make_event(event_id, title=title, location=location, source=source,
+                          date=date, **fields)
+    return make
+
+def test_normalization():
+    """Test titles and locations are normalized for comparison"""
+    assert normalize_title("  Python Meetup: May!! ") == "python meetup may"
+    assert normalize_location("Tech Hub - New York") == "tech hub"
+    assert normalize_location("tech hub") == "tech hub"
+    assert normalize_location(None) == ""
+
+def test_merges_cross_source_duplicates(listing):
+    """Test the same event from several sources becomes one canonical event"""
+    events = [
+        listing("1", "Python Meetup", "Tech Hub - New York", "eventbrite",
+                url="http://eventbrite.com/e/1"),
+        listing("2", "Python Meetup!", "Tech Hub - New York", "meetup",
+                url="http://meetup.com/e/2", image_url="http://example.com/img.jpg",
+                description="A much longer description of the meetup"),
+        listing("3", "Python  meetups", "tech hub", "community_web",
+                url="http://example.com/3"),
+        listing("4", "Art Workshop", "Tech Hub - New York", "meetup"),
+    ]
+    deduplicator = EventDeduplicator()
+    result = deduplicator.deduplicate(events)
+
+    assert [event.id for event in result] == ["1", "4"]
+    merged = result[0]
+    assert merged.source == "eventbrite"
+    assert merged.url == "http://eventbrite.com/e/1"
+    assert merged.source_urls == [
+        "http://eventbrite.com/e/1", "http://meetup.com/e/2", "http://example.com/3"
+    ]
+    assert merged.image_url == "http://example.com/img.jpg"
+    assert merged.description == "A much longer description of the meetup"
+    assert deduplicator.last_merged == 2
+    # Inputs are left untouched
+    assert events[0].source_urls == []
+
+def test_different_day_or_venue_is_not_merged(listing):
+    """Test blocking keeps events on other days or at other venues apart"""
+    events = [
+        listing("1", "Python Meetup", "Tech Hub", "meetup"),
+        listing("2", "Python Meetup", "Tech Hub", "meetup", date=datetime(2024, 5, 8, 18, 0)),
+        listing("3", "Python Meetup", "Library", "meetup"),
+    ]
+    deduplicator = EventDeduplicator()
+    assert deduplicator.deduplicate(events) == events
+    assert deduplicator.last_merged == 0
+
+def test_dissimilar_titles_are_not_merged(listing):
+    """Test the title threshold separates different events at one venue"""
+    events = [
+        listing("1", "Python Meetup", "Tech Hub", "meetup"),
+        listing("2", "Rust Meetup", "Tech Hub", "eventbrite"),
+    ]
+    assert len(EventDeduplicator().deduplicate(events)) == 2
+    assert len(EventDeduplicator(title_threshold=0.5).deduplicate(events)) == 1
+
+def test_sessions_at_other_times_are_not_merged(listing):
+    """Test same-day sessions are kept apart unless they start within the tolerance"""
+    events = [
+        listing("1", "Python Meetup", "Tech Hub", "meetup"),
+        listing("2", "Python Meetup", "Tech Hub", "eventbrite",
+                date=datetime(2024, 5, 1, 10, 0)),
+        listing("3", "Python Meetup", "Tech Hub", "community_web",
+                date=datetime(2024, 5, 1, 18, 15)),
+    ]
+    deduplicator = EventDeduplicator()
+    assert [event.id for event in deduplicator.deduplicate(events)] == ["1", "2"]
+    assert deduplicator.last_merged == 1
+    strict = EventDeduplicator(time_tolerance=timedelta(minutes=10))
+    assert len(strict.deduplicate(events)) == 3
+
+def test_events_from_one_source_are_not_merged(listing):
+    """Test a source's own listings stay separate however alike they look"""
+    events = [
+        listing("1", "Python Meetup", "Tech Hub", "meetup", url="http://meetup.com/e/1"),
+        listing("2", "Python Meetup", "Tech Hub", "meetup", url="http://meetup.com/e/2"),
+        listing("3", "Python Meetup", "Tech Hub - New York", "eventbrite",
+                url="http://eventbrite.com/e/3"),
+    ]
+    result = EventDeduplicator().deduplicate(events)
+    assert [event.id for event in result] == ["1", "2"]
+    assert result[0].source_urls == ["http://meetup.com/e/1", "http://eventbrite.com/e/3"]
+    assert result[1] == events[1]
+
+def test_duplicates_across_midnight_are_merged(listing):
+    """Test duplicates either side of a day or bucket edge still meet"""
+    events = [
+        listing("1", "Late Show", "Tech Hub", "meetup", date=datetime(2024, 5, 1, 23, 50)),
+        listing("2", "Late Show", "Tech Hub", "eventbrite", date=datetime(2024, 5, 2, 0, 10)),
+        listing("3", "Late Show", "Tech Hub", "community_web",
+                date=datetime(2024, 5, 2, 0, 40)),
+    ]
+    result = EventDeduplicator().deduplicate(events)
+    assert [event.id for event in result] == ["1", "3"]
+
+def test_placeholder_venues_are_blocked_by_title(listing, monkeypatch):
+    """Test venue-less events are only compared with events of a similar title"""
+    compared = []
+    similar = EventDeduplicator._similar
+
+    def counting(self, title, other):
+        compared.append((title, other))
+        return similar(self, title, other)
+
+    monkeypatch.setattr(EventDeduplicator, "_similar", counting)
+    events = [
+        listing("1", "Python Meetup", "TBD - Unknown", "meetup"),
+        listing("2", "Rust Meetup", "TBD - Unknown", "eventbrite"),
+        listing("3", "Python Meetups", "TBD - Unknown", "eventbrite"),
+        listing("4", "Python Meetup", "Tech Hub", "community_web"),
+    ]
+    result = EventDeduplicator().deduplicate(events)
+
+    assert [event.id for event in result] == ["1", "2", "4"]
+    assert compared == [("python meetups", "python meetup")]
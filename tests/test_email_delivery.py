@@ -0,0 +1,237 @@
+import socketserver
+import threading
+from unittest.mock import Mock
+import pytest
+from email.mime.text import MIMEText
+from src.services.email_delivery import (
+    DeliveryMetrics, EmailDeliveryPipeline, SMTPConnectionPool
+)
+from src.services.event_processor import EventProcessor
+
+class StubSMTPHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP dialogue: enough for smtplib login and send_message"""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        sent_on_connection = 0
+        self.reply("220 stub ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self.reply("250-stub")
+                self.reply("250 AUTH PLAIN")
+            elif verb == "HELO":
+                self.reply("250 stub")
+            elif verb == "AUTH":
+                with server.lock:
+                    server.logins += 1
+                self.reply("235 Authentication successful")
+            elif verb == "MAIL":
+                if server.drop_after and sent_on_connection >= server.drop_after:
+                    return  # Simulate the server hanging up mid-session
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                if "refused" in command:
+                    self.reply("550 No such user")
+                else:
+                    self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while True:
+                    data_line = self.rfile.readline()
+                    if data_line in (b".\r\n", b""):
+                        break
+                    data.append(data_line)
+                with server.lock:
+                    server.messages.append(b"".join(data))
+                sent_on_connection += 1
+                self.reply("250 OK")
+            elif verb in ("RSET", "NOOP"):
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+class StubSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubSMTPHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.logins = 0
+        self.messages = []
+        self.drop_after = 0
+
+@pytest.fixture
+def smtp_server():
+    """Local stand-in SMTP server"""
+    server = StubSMTPServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def stub_smtp_config(smtp_server):
+    return {
+        'host': '127.0.0.1',
+        'port': str(smtp_server.server_address[1]),
+        'username': 'test@example.com',
+        'password': 'password'
+    }
+
+def make_message(recipient):
+    msg = MIMEText("<p>hello</p>", 'html')
+    msg['From'] = 'test@example.com'
+    msg['To'] = recipient
+    msg['Subject'] = 'Test'
+    return msg
+
+def test_pipeline_reuses_connections(smtp_server, stub_smtp_config):
+    """Test many messages are sent over a handful of authenticated connections"""
+    pool = SMTPConnectionPool(stub_smtp_config, size=2, use_tls=False)
+    pipeline = EmailDeliveryPipeline(pool, workers=2, queue_size=5)
+
+    for i in range(20):
+        pipeline.submit(make_message(f"user{i}@example.com"))
+    pipeline.flush()
+    pipeline.close()
+
+    assert len(smtp_server.messages) == 20
+    assert pipeline.metrics.sent == 20
+    assert pipeline.metrics.failed == 0
+    assert smtp_server.connections <= 2
+    assert smtp_server.logins == smtp_server.connections
+    assert pipeline.metrics.connections_opened == smtp_server.connections
+
+def test_pipeline_reconnects_after_disconnect(smtp_server, stub_smtp_config):
+    """Test a dropped connection is replaced and the message retried"""
+    smtp_server.drop_after = 3
+    pool = SMTPConnectionPool(stub_smtp_config, size=1, use_tls=False)
+    pipeline = EmailDeliveryPipeline(pool, workers=1, retry_delay=0)
+
+    for i in range(7):
+        pipeline.submit(make_message(f"user{i}@example.com"))
+    pipeline.close()
+
+    assert len(smtp_server.messages) == 7
+    assert pipeline.metrics.sent == 7
+    assert pipeline.metrics.retries == 2
+    assert smtp_server.connections == 3
+
+def test_pipeline_permanent_failure_keeps_connection(smtp_server, stub_smtp_config):
+    """Test a refused recipient fails without reconnecting"""
+    pool = SMTPConnectionPool(stub_smtp_config, size=1, use_tls=False)
+    pipeline = EmailDeliveryPipeline(pool, workers=1)
+
+    pipeline.submit(make_message("refused@example.com"))
+    pipeline.submit(make_message("ok@example.com"))
+    pipeline.close()
+
+    assert pipeline.metrics.sent == 1
+    assert pipeline.metrics.failed == 1
+    assert pipeline.metrics.retries == 0
+    assert smtp_server.connections == 1
+
+def test_pipeline_gives_up_when_server_unreachable(stub_smtp_config, smtp_server):
+    """Test messages are counted as failed once retries are exhausted"""
+    smtp_server.shutdown()
+    smtp_server.server_close()
+    pool = SMTPConnectionPool(stub_smtp_config, size=1, use_tls=False, timeout=1)
+    pipeline = EmailDeliveryPipeline(pool, workers=1, max_retries=1, retry_delay=0)
+
+    pipeline.submit(make_message("user@example.com"))
+    pipeline.close()
+
+    assert pipeline.metrics.failed == 1
+    assert pipeline.metrics.retries == 1
+
+def test_pool_recycles_worn_out_connections(smtp_server, stub_smtp_config):
+    """Test connections are replaced after max_messages_per_connection sends"""
+    pool = SMTPConnectionPool(stub_smtp_config, size=1, use_tls=False,
+                              max_messages_per_connection=2)
+    pipeline = EmailDeliveryPipeline(pool, workers=1)
+    for i in range(5):
+        pipeline.submit(make_message(f"user{i}@example.com"))
+    pipeline.close()
+
+    assert len(smtp_server.messages) == 5
+    assert smtp_server.connections == 3
+
+def test_pool_refuses_acquire_after_close(stub_smtp_config):
+    """Test a closed pool cannot hand out connections"""
+    pool = SMTPConnectionPool(stub_smtp_config, use_tls=False)
+    pool.close()
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+def test_delivery_metrics():
+    """Test metrics export"""
+    now = [100.0]
+    metrics = DeliveryMetrics(clock=lambda: now[0])
+    with metrics.delivering():
+        now[0] += 1.0
+        with metrics.delivering():
+            now[0] += 1.0
+            metrics.increment('sent', 3)
+    # Idle time between batches does not count against throughput
+    now[0] += 3600.0
+    with metrics.delivering():
+        now[0] += 1.0
+        metrics.increment('sent', 3)
+    data = metrics.to_dict()
+    assert data['sent'] == 6
+    assert data['elapsed'] == 3603.0
+    assert data['active_seconds'] == 3.0
+    assert data['throughput'] == 2.0
+
+def test_retries_back_off_exponentially(stub_smtp_config):
+    """Test each retry waits up to twice as long as the previous one, capped"""
+    pool = SMTPConnectionPool(stub_smtp_config, use_tls=False)
+    pool.acquire = Mock(side_effect=OSError("connection refused"))
+    sleeps = []
+    rng = Mock()
+    rng.uniform.side_effect = lambda low, high: high
+    pipeline = EmailDeliveryPipeline(pool, workers=1, max_retries=4, retry_delay=1.0,
+                                     max_retry_delay=5.0, rng=rng, sleep=sleeps.append)
+
+    pipeline._deliver(make_message("user@example.com"))
+
+    assert sleeps == [1.0, 2.0, 4.0, 5.0]
+    assert [call.args for call in rng.uniform.call_args_list] == [
+        (0, 1.0), (0, 2.0), (0, 4.0), (0, 5.0)
+    ]
+    assert pipeline.metrics.failed == 1
+
+def test_processor_queues_notifications(smtp_server, stub_smtp_config, future_datetime,
+                                        make_event):
+    """Test EventProcessor hands notifications to the delivery pipeline"""
+    from src.models.user_preferences import UserPreferences
+
+    pool = SMTPConnectionPool(stub_smtp_config, size=2, use_tls=False)
+    processor = EventProcessor(stub_smtp_config,
+                               delivery=EmailDeliveryPipeline(pool, workers=2))
+    event = make_event(1, title="Tech Conference", date=future_datetime)
+    for i in range(3):
+        prefs = UserPreferences(user_id=str(i), email=f"user{i}@example.com")
+        processor.send_email_notification(prefs, [event])
+    processor.flush_notifications()
+    processor.delivery.close()
+
+    assert len(smtp_server.messages) == 3
+    assert b"Tech Conference" in smtp_server.messages[0]
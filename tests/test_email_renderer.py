@@ -0,0 +1,52 @@
+from dataclasses import replace
+from unittest.mock import patch
+from src.services.email_renderer import EmailRenderer
+
+def test_render_wraps_fragments_in_order(make_event):
+    """Test digests are assembled from fragments inside the fixed wrapper"""
+    events = [make_event("1", url="http://example.com/1"), make_event("2")]
+    body = EmailRenderer().render(events)
+
+    assert body.index("Event 1") < body.index("Event 2")
+    assert body.count('<div style="margin-bottom: 20px;">') == 2
+    assert '<a href="http://example.com/1">More Information</a>' in body
+    assert body.count("More Information") == 1
+    assert "<html>" in body and "</html>" in body
+    assert "January 01, 2024 06:30 PM" in body
+
+def test_fragments_rendered_once_per_event(make_event):
+    """Test an event shared across digests is only rendered once, even reloaded as a copy"""
+    renderer = EmailRenderer()
+    shared = make_event("1")
+    with patch.object(EmailRenderer, '_render_fragment',
+                      wraps=EmailRenderer._render_fragment) as render_fragment:
+        for _ in range(5):
+            renderer.render([shared, make_event("2")])
+        assert render_fragment.call_count == 2
+
+        # Same key, different contents: the stale fragment is not reused
+        renamed = replace(shared, title="Renamed")
+        assert "Renamed" in renderer.render([renamed])
+        assert render_fragment.call_count == 3
+
+        renderer.new_generation()
+        renderer.render([renamed])
+        assert render_fragment.call_count == 4
+    assert renderer.generation == 1
+
+def test_render_ignores_template_syntax_in_events(make_event):
+    """Test event text containing $ placeholders is inserted verbatim"""
+    event = make_event("1")
+    event.title = "Only ${events} $5"
+    assert "Only ${events} $5" in EmailRenderer().render([event])
+
+def test_discard_drops_single_fragment(make_event):
+    """Test discarding an event only forgets its own fragment"""
+    renderer = EmailRenderer()
+    first, second = make_event("1"), make_event("2")
+    renderer.render([first, second])
+
+    renderer.discard(make_event("1"))
+    renderer.discard(make_event("3"))
+    assert first.key not in renderer._fragments
+    assert second.key in renderer._fragments
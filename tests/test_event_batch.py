@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from src.models.event_batch import EventBatch
+
+@pytest.fixture
+def events(make_event):
+    return [
+        make_event(1, title="Tech Meetup", description="Monthly technology meetup",
+                   date=datetime(2024, 1, 1, 18, 30, 15, 123456), url="http://example.com/1"),
+        make_event(2, title="Jazz Night", description="Live jazz",
+                   date=datetime(2024, 1, 2, 20, 0, tzinfo=timezone(timedelta(hours=-5))),
+                   location="park", category="music", image_url="http://example.com/2.png",
+                   source_urls=["http://example.com/2", "http://other.example.com/2"]),
+        make_event(3, title="Code Review Club", description="Bring a pull request",
+                   date=datetime(1969, 12, 31, 23, 0), source="other"),
+    ]
+
+def test_batch_round_trip(events):
+    """Test rows read back as the events that were added"""
+    batch = EventBatch(events)
+    assert len(batch) == 3
+    assert batch.to_events() == events
+    assert batch[-1] == events[-1]
+    assert batch.date(1) == events[1].date
+    assert batch.key(2) == ("other", "3")
+    with pytest.raises(IndexError):
+        batch[3]
+
+def test_batch_dictionary_encodes_categories(events):
+    """Test repeated categorical values are stored once"""
+    batch = EventBatch(events)
+    assert batch._categories.values == ["technology", "music"]
+    assert list(batch._categories.codes) == [0, 1, 0]
+    assert batch._sources.values == ["test", "other"]
+
+def test_batch_match_agrees_with_preferences(events):
+    """Test code-based matching follows matches_event semantics"""
+    batch = EventBatch(events)
+    assert batch.match(["technology"], ["downtown"]) == [0, 2]
+    assert batch.match(["music"], []) == [1]
+    assert batch.match([], ["park", "nowhere"]) == [1]
+    assert batch.match(["sports"], []) == []
+    assert batch.match([], []) == [0, 1, 2]
@@ -0,0 +1,31 @@
+from src.services.event_index import EventIndex
+
+def test_match_intersects_posting_lists(make_event):
+    """Test category and location postings are intersected"""
+    index = EventIndex()
+    index.add(1, make_event("1", category="music", location="park"))
+    index.add(2, make_event("2", category="music", location="downtown"))
+    index.add(3, make_event("3", category="arts", location="park"))
+
+    assert index.match(["music"], ["park"]) == {1}
+    assert index.match(["music", "arts"], ["park"]) == {1, 3}
+    assert index.match([], ["park"]) == {1, 3}
+    assert index.match(["music"], []) == {1, 2}
+    assert index.match([], []) == {1, 2, 3}
+    assert index.match(["cooking"], []) == set()
+
+def test_remove_drops_empty_postings(make_event):
+    """Test removing events keeps posting lists compact"""
+    index = EventIndex()
+    event = make_event("1", category="music", location="park")
+    index.add(1, event)
+    index.remove(1, event)
+
+    assert len(index) == 0
+    assert index.match(["music"], []) == set()
+    assert index._by_category == {}
+    assert index._by_location == {}
+
+    # Removing an unknown key is a no-op
+    index.remove(2, event)
+    assert len(index) == 0
@@ -0,0 +1,124 @@
+from dataclasses import replace
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import inspect, text
+from src.services.event_repository import EventRepository
+
+@pytest.fixture
+def stored_event(make_event):
+    """Events a given number of days into 2024, with their source URLs"""
+    def make(index, days=1, **fields):
+        url = f"http://example.com/{index}"
+        return make_event(index, date=datetime(2024, 1, 1) + timedelta(days=days),
+                          url=url, source_urls=[url], **fields)
+    return make
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = EventRepository(f"sqlite:///{tmp_path / 'events.db'}", batch_size=3)
+    yield repository
+    repository.close()
+
+def test_upsert_round_trip(repository, stored_event):
+    """Test stored events load back unchanged"""
+    events = [stored_event(i) for i in range(5)]
+    assert repository.upsert(events) == 5
+    assert repository.get_many([event.key for event in events]) == {
+        event.key: event for event in events
+    }
+
+def test_upsert_updates_existing_rows(repository, stored_event):
+    """Test upserting an existing key replaces it instead of duplicating"""
+    event = stored_event(1)
+    repository.upsert([event])
+    changed = replace(event, title="Renamed")
+    repository.upsert([changed])
+
+    assert repository.count() == 1
+    assert repository.get_many([event.key])[event.key] == changed
+
+def test_query_filters_and_orders_by_date(repository, stored_event):
+    """Test queries filter like matches_event and return events by date"""
+    repository.upsert([
+        stored_event(1, days=3),
+        stored_event(2, category="music", days=1),
+        stored_event(3, location="park", days=2),
+        stored_event(4, days=0),
+    ])
+
+    assert [e.id for e in repository.query(["technology"], ["downtown"])] == ["4", "1"]
+    assert [e.id for e in repository.query(["technology"])] == ["4", "3", "1"]
+    assert [e.id for e in repository.query()] == ["4", "2", "3", "1"]
+    assert [e.id for e in repository.query(start=datetime(2024, 1, 3))] == ["3", "1"]
+    assert [e.id for e in repository.query(limit=2)] == ["4", "2"]
+
+def test_reads_are_batched(repository, stored_event):
+    """Test iter_batches yields at most batch_size events at a time"""
+    repository.upsert([stored_event(i, days=i) for i in range(7)])
+    batches = list(repository.iter_batches())
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+
+def test_removed_events_are_kept_as_history(repository, stored_event):
+    """Test removed events drop out of queries but can still be read"""
+    events = [stored_event(1), stored_event(2)]
+    repository.sync(events, [])
+    repository.sync([], [events[0].key])
+
+    assert repository.active_keys() == {events[1].key}
+    assert [e.id for e in repository.query()] == ["2"]
+    assert [e.id for e in repository.query(include_removed=True)] == ["1", "2"]
+    assert repository.count(include_removed=True) == 2
+
+def test_upsert_restores_removed_events(repository, stored_event):
+    """Test a relisted event becomes active again"""
+    event = stored_event(1)
+    repository.sync([event], [])
+    repository.mark_removed([event.key])
+    repository.upsert([event])
+    assert repository.active_keys() == {event.key}
+
+def test_delete(repository, stored_event):
+    """Test events can be purged"""
+    repository.upsert([stored_event(1), stored_event(2)])
+    assert repository.delete([("test", "1")]) == 1
+    assert repository.active_keys() == {("test", "2")}
+
+def test_schema_has_lookup_indexes(repository):
+    """Test the columns used for filtering are indexed"""
+    indexed = {column for index in inspect(repository.engine).get_indexes("events")
+               for column in index['column_names']}
+    assert {"date", "category", "location"} <= indexed
+    assert inspect(repository.engine).get_pk_constraint("events")['constrained_columns'] == \
+        ["source", "id"]
+
+def test_full_text_search(repository, stored_event):
+    """Test FTS5 search follows upserts and removals and combines with filters"""
+    jazz = stored_event(1, category="music", title="Jazz Night", description="Live jazz")
+    workshop = stored_event(2, title="Python Workshop", description="Learn python")
+    meetup = stored_event(3, title="Meetup", description="Talks on python and jazz")
+    repository.upsert([jazz, workshop, meetup])
+
+    assert repository.full_text
+    assert [event.id for event in repository.search("python")] == ["2", "3"]
+    assert [event.id for event in repository.search("jazz", categories=["technology"])] == ["3"]
+    assert [event.id for event in repository.search("python workshop")] == ["2"]
+
+    repository.upsert([replace(workshop, title="Rust Workshop", description="Learn rust")])
+    repository.mark_removed([meetup.key])
+    assert repository.search("python") == []
+    assert [event.id for event in repository.search("rust")] == ["2"]
+
+def test_full_text_search_survives_vacuum(repository, stored_event):
+    """Test search stays correct after VACUUM renumbers the events table's rowids"""
+    events = [stored_event(i, title=f"Talk {i}", description=f"topic{i}") for i in range(6)]
+    repository.upsert(events)
+    repository.delete([events[0].key, events[2].key])
+    with repository.engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("VACUUM"))
+
+    repository.upsert([replace(events[3], description="topic3 renamed")])
+    repository.delete([events[4].key])
+    for event in events:
+        expected = [] if event in (events[0], events[2], events[4]) else [event.id]
+        assert [found.id for found in repository.search(f"topic{event.id}")] == expected
+    assert [found.id for found in repository.search("renamed")] == ["3"]
@@ -0,0 +1,158 @@
+import asyncio
+import threading
+import time
+from datetime import datetime
+from src.models.event import Event
+from src.sources.base import EventSource
+from src.services.fetch_orchestrator import FetchOrchestrator
+
+class StubSource(EventSource):
+    """Event source returning canned events after an optional delay"""
+    def __init__(self, name, delay=0.0, error=None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+
+    def fetch_events(self):
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [Event(
+            id=self.name,
+            title=f"{self.name} event",
+            description="Description",
+            date=datetime(2024, 1, 1),
+            location="downtown",
+            category="test",
+            source=self.name
+        )]
+
+    def validate_event(self, event):
+        return super().validate_event(event)
+
+def test_fetch_all_collects_results_in_source_order():
+    """Test results are returned per source in the order given"""
+    sources = [StubSource("a", delay=0.05), StubSource("b"), StubSource("c")]
+    report = FetchOrchestrator(max_workers=3).fetch_all(sources)
+
+    assert [result.source for result in report.results] == sources
+    assert [event.id for event in report.events] == ["a", "b", "c"]
+    assert report.failures == []
+
+def test_fetch_all_runs_sources_concurrently():
+    """Test slow sources overlap instead of adding up"""
+    sources = [StubSource(str(i), delay=0.2) for i in range(5)]
+    start = time.monotonic()
+    report = FetchOrchestrator(max_workers=5).fetch_all(sources)
+
+    assert len(report.events) == 5
+    assert time.monotonic() - start < 0.8
+
+def test_fetch_all_isolates_errors():
+    """Test a failing source does not affect the others"""
+    sources = [StubSource("ok"), StubSource("bad", error=RuntimeError("boom"))]
+    report = FetchOrchestrator().fetch_all(sources)
+
+    assert [event.id for event in report.events] == ["ok"]
+    assert len(report.failures) == 1
+    assert str(report.failures[0].error) == "boom"
+
+def test_fetch_all_source_timeout():
+    """Test a slow source is abandoned after its timeout"""
+    sources = [StubSource("slow", delay=1.0), StubSource("fast")]
+    start = time.monotonic()
+    report = FetchOrchestrator(source_timeout=0.1, poll_interval=0.02).fetch_all(sources)
+
+    assert time.monotonic() - start < 0.5
+    assert [event.id for event in report.events] == ["fast"]
+    assert report.results[0].timed_out
+    assert report.failures == [report.results[0]]
+
+def test_fetch_all_skips_source_still_running():
+    """Test a timed-out source is not fetched again until its thread returns"""
+    release = threading.Event()
+    calls = []
+
+    class HangingSource(StubSource):
+        def fetch_events(self):
+            calls.append(self)
+            release.wait(5)
+            return super().fetch_events()
+
+    source = HangingSource("hung")
+    orchestrator = FetchOrchestrator(source_timeout=0.1, poll_interval=0.02)
+    assert orchestrator.fetch_all([source]).results[0].timed_out
+
+    report = orchestrator.fetch_all([source])
+    assert isinstance(report.results[0].error, RuntimeError)
+    assert len(calls) == 1
+
+    release.set()
+    deadline = time.monotonic() + 2
+    while source in orchestrator._in_flight and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert [event.id for event in orchestrator.fetch_all([source]).events] == ["hung"]
+    assert len(calls) == 2
+
+def test_fetch_all_global_deadline():
+    """Test the cycle deadline cuts off queued and running sources"""
+    sources = [StubSource(str(i), delay=0.3) for i in range(4)]
+    start = time.monotonic()
+    report = FetchOrchestrator(max_workers=1, deadline=0.1,
+                               poll_interval=0.02).fetch_all(sources)
+
+    assert time.monotonic() - start < 0.3
+    assert report.events == []
+    assert all(result.timed_out for result in report.results)
+
+def test_fetch_all_bounds_concurrency():
+    """Test no more than max_workers sources run at once"""
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    class CountingSource(StubSource):
+        def fetch_events(self):
+            with lock:
+                active.append(self)
+                peak.append(len(active))
+            try:
+                return super().fetch_events()
+            finally:
+                with lock:
+                    active.remove(self)
+
+    sources = [CountingSource(str(i), delay=0.05) for i in range(6)]
+    report = FetchOrchestrator(max_workers=2).fetch_all(sources)
+
+    assert len(report.events) == 6
+    assert max(peak) <= 2
+
+def test_fetch_all_empty():
+    """Test fetching with no sources"""
+    report = FetchOrchestrator().fetch_all([])
+    assert report.results == []
+    assert report.events == []
+
+def test_fetch_all_async():
+    """Test the asyncio fetch mode with timeouts and errors"""
+    sources = [
+        StubSource("ok"),
+        StubSource("slow", delay=1.0),
+        StubSource("bad", error=RuntimeError("boom")),
+    ]
+    orchestrator = FetchOrchestrator(source_timeout=0.1)
+    report = asyncio.run(orchestrator.fetch_all_async(sources))
+
+    assert [event.id for event in report.events] == ["ok"]
+    assert report.results[1].timed_out
+    assert isinstance(report.results[2].error, RuntimeError)
+
+def test_fetch_all_async_deadline():
+    """Test the asyncio fetch mode honours the global deadline"""
+    sources = [StubSource(str(i), delay=0.5) for i in range(3)]
+    orchestrator = FetchOrchestrator(max_workers=1, deadline=0.1)
+    report = asyncio.run(orchestrator.fetch_all_async(sources))
+
+    assert report.events == []
+    assert all(result.timed_out for result in report.results)
@@ -0,0 +1,77 @@
+import json
+import random
+import pytest
+from src.services.geo import Gazetteer, GeoIndex, haversine_km
+
+def test_haversine_known_distance():
+    """Test the distance between London and Paris"""
+    assert haversine_km((51.5074, -0.1278), (48.8566, 2.3522)) == pytest.approx(343.5, abs=1)
+    assert haversine_km((10.0, 20.0), (10.0, 20.0)) == 0
+
+def test_geo_index_matches_brute_force():
+    """Test radius queries return exactly the points a full scan would"""
+    rng = random.Random(3)
+    points = {index: (rng.uniform(-89, 89), rng.uniform(-180, 180)) for index in range(2000)}
+    index = GeoIndex(cell_degrees=0.5)
+    for key, coordinates in points.items():
+        index.add(key, coordinates)
+
+    for _ in range(100):
+        center = (rng.uniform(-90, 90), rng.uniform(-180, 180))
+        radius = rng.choice([1, 50, 500, 3000, 15000])
+        expected = {key for key, point in points.items() if haversine_km(center, point) <= radius}
+        assert index.query(center, radius) == expected
+
+def test_geo_index_wraps_the_antimeridian():
+    """Test points across the dateline are found"""
+    index = GeoIndex()
+    index.add("east", (0.0, 179.9))
+    index.add("west", (0.0, -179.9))
+    assert index.query((0.0, 179.95), 50) == {"east", "west"}
+
+def test_geo_index_move_and_remove():
+    """Test points can be moved and removed"""
+    index = GeoIndex()
+    index.add("a", (40.0, -74.0))
+    index.add("a", (51.5, -0.1))
+    assert index.query((40.0, -74.0), 10) == set()
+    assert index.query((51.5, -0.1), 10) == {"a"}
+    index.remove("a")
+    index.remove("a")
+    assert len(index) == 0
+
+def test_gazetteer_lookup_falls_back_to_venue_and_city():
+    """Test lookups normalise names and fall back through "<venue> - <city>\""""
+    gazetteer = Gazetteer(places={"Central Park": (40.78, -73.96), "new york": (40.71, -74.0)})
+    assert gazetteer.lookup("  central   PARK ") == (40.78, -73.96)
+    assert gazetteer.lookup("Central Park - New York") == (40.78, -73.96)
+    assert gazetteer.lookup("Unknown Hall - New York") == (40.71, -74.0)
+    assert gazetteer.lookup("Nowhere") is None
+
+def test_gazetteer_within():
+    """Test radius checks and the by-name fallback for unknown places"""
+    gazetteer = Gazetteer("config/gazetteer.example.json")
+    assert gazetteer.within("midtown", "hoboken", 10)
+    assert not gazetteer.within("midtown", "philadelphia", 50)
+    assert gazetteer.within("Mystery Venue", "Mystery Venue", 1)
+    assert not gazetteer.within("Mystery Venue", "midtown", 1000)
+
+def test_gazetteer_caches_geocoder_answers(tmp_path):
+    """Test geocoded places, including misses, are cached and saved"""
+    calls = []
+
+    def geocoder(name):
+        calls.append(name)
+        return (52.52, 13.405) if name == "berlin" else None
+
+    path = tmp_path / "places.json"
+    gazetteer = Gazetteer(str(path), geocoder=geocoder)
+    assert gazetteer.lookup("Berlin") == (52.52, 13.405)
+    assert gazetteer.lookup("Atlantis") is None
+    assert gazetteer.lookup("berlin") == (52.52, 13.405)
+    assert gazetteer.lookup("atlantis") is None
+    assert calls == ["berlin", "atlantis"]
+
+    gazetteer.save()
+    assert json.loads(path.read_text()) == {"atlantis": None, "berlin": [52.52, 13.405]}
+    assert Gazetteer(str(path)).lookup("Berlin") == (52.52, 13.405)
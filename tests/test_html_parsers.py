@@ -0,0 +1,92 @@
+from unittest.mock import Mock
+import pytest
+from src.sources.html_parsers import (
+    BeautifulSoupBackend, CardSelectors, available_backends, get_parser_backend, split_selector
+)
+from src.sources.web_scraper import CommunityWebScraper
+
+LISTING_HTML = """
+<html><body>
+<nav><div class="menu">Not an event</div></nav>
+<div class="event-card featured">
+    <h2 class="event-title">Python  Meetup</h2>
+    <p class="event-description">Monthly <b>Python</b> programming meetup</p>
+    <span class="event-date">2024-01-01 18:30</span>
+    <span class="event-location">Downtown Tech Hub</span>
+    <span class="event-category">Technology</span>
+    <a class="event-link" href="http://example.com/event1">Details</a>
+</div>
+<div class="event-card">
+    <h2 class="event-title">Art Workshop</h2>
+    <p class="event-description">Beginner's art workshop</p>
+    <span class="event-date">2024-01-02 14:00</span>
+    <span class="event-location">Community Center</span>
+</div>
+</body></html>
+"""
+
+EXPECTED_CARDS = [
+    {
+        'title': "Python  Meetup",
+        'description': "Monthly Python programming meetup",
+        'date': "2024-01-01 18:30",
+        'location': "Downtown Tech Hub",
+        'category': "Technology",
+        'url': "http://example.com/event1",
+    },
+    {
+        'title': "Art Workshop",
+        'description': "Beginner's art workshop",
+        'date': "2024-01-02 14:00",
+        'location': "Community Center",
+        'category': None,
+        'url': None,
+    },
+]
+
+@pytest.mark.parametrize("name", available_backends())
+def test_backends_extract_the_same_cards(name):
+    """Test every installed backend extracts identical field texts"""
+    assert get_parser_backend(name).extract(LISTING_HTML) == EXPECTED_CARDS
+
+@pytest.mark.parametrize("name", available_backends())
+def test_backends_handle_pages_without_cards(name):
+    """Test empty and card-less pages"""
+    backend = get_parser_backend(name)
+    assert backend.extract("") == []
+    assert backend.extract("<p>No events today</p>") == []
+
+def test_unstrained_soup_matches_strained():
+    """Test the SoupStrainer mode does not change results"""
+    assert BeautifulSoupBackend(strain=False).extract(LISTING_HTML) == EXPECTED_CARDS
+
+def test_custom_selectors():
+    """Test backends follow configured selectors"""
+    selectors = CardSelectors(card="li.listing", fields={'title': "h3"}, link="a")
+    html = '<ul><li class="listing"><h3>Jazz Night</h3><a href="/jazz">More</a></li></ul>'
+    for name in available_backends():
+        assert get_parser_backend(name, selectors).extract(html) == [
+            {'title': "Jazz Night", 'url': "/jazz"}
+        ]
+
+def test_selector_and_backend_lookup():
+    """Test selector splitting and backend name resolution"""
+    assert split_selector("div.event-card") == ("div", "event-card")
+    assert split_selector("h3") == ("h3", None)
+    assert split_selector(".title") == (None, "title")
+    assert get_parser_backend("auto").name == available_backends()[-1]
+    with pytest.raises(ValueError):
+        get_parser_backend("regex")
+
+@pytest.mark.parametrize("name", available_backends())
+def test_scraper_with_backend(name):
+    """Test the scraper builds the same events with any backend"""
+    scraper = CommunityWebScraper("http://example.com/events", parser=name)
+    response = Mock()
+    response.text = LISTING_HTML
+    scraper.session.get = Mock(return_value=response)
+
+    events = scraper.fetch_events()
+    # The second card has no category and is skipped
+    assert [event.title for event in events] == ["Python Meetup"]
+    assert events[0].url == "http://example.com/event1"
@@ -0,0 +1,155 @@
+import json
+from unittest.mock import Mock, patch
+import pytest
+from src.sources.eventbrite import EventbriteSource
+from src.sources.meetup import MeetupSource
+from src.sources.http_cache import HTTPCache
+from src.sources.web_scraper import CommunityWebScraper
+
+SAMPLE_HTML = """
+<div class="event-card">
+    <h2 class="event-title">Python Meetup</h2>
+    <p class="event-description">Monthly Python programming meetup</p>
+    <span class="event-date">2024-01-01 18:30</span>
+    <span class="event-location">Downtown Tech Hub</span>
+    <span class="event-category">Technology</span>
+</div>
+"""
+
+def make_response(status_code=200, text="", headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.text = text
+    response.headers = headers or {}
+    response.json = lambda: json.loads(text)
+    response.links = {}
+    return response
+
+@pytest.fixture
+def http_cache(tmp_path):
+    return HTTPCache(str(tmp_path / "cache"))
+
+def test_conditional_get_sends_validators(http_cache):
+    """Test stored validators are sent back and a 304 replays the body"""
+    session = Mock()
+    session.get.return_value = make_response(
+        text="hello", headers={'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+    )
+    first = http_cache.get(session, "http://example.com/events", params={'q': 'x'})
+    assert first.from_cache is False
+
+    session.get.return_value = make_response(status_code=304)
+    second = http_cache.get(session, "http://example.com/events", params={'q': 'x'})
+
+    headers = session.get.call_args.kwargs['headers']
+    assert headers['If-None-Match'] == '"v1"'
+    assert headers['If-Modified-Since'] == 'Mon, 01 Jan 2024 00:00:00 GMT'
+    assert second.from_cache is True
+    assert second.text == "hello"
+    assert http_cache.stats() == {'requests': 2, 'hits': 1, 'misses': 1, 'hit_rate': 0.5}
+
+def test_responses_without_validators_are_not_cached(http_cache):
+    """Test nothing is stored when the server gives no validators"""
+    session = Mock()
+    session.get.return_value = make_response(text="hello")
+    http_cache.get(session, "http://example.com/events")
+    http_cache.get(session, "http://example.com/events")
+
+    assert 'headers' not in session.get.call_args.kwargs
+    assert http_cache.stats()['hits'] == 0
+
+def test_scraper_skips_parsing_on_304(http_cache):
+    """Test an unchanged page reuses the previously parsed events"""
+    scraper = CommunityWebScraper("http://example.com/events", http_cache=http_cache)
+    scraper.session.get = Mock(return_value=make_response(text=SAMPLE_HTML,
+                                                          headers={'ETag': '"v1"'}))
+    first = scraper.fetch_events()
+    assert len(first) == 1
+
+    scraper.session.get = Mock(return_value=make_response(status_code=304))
+    with patch.object(CommunityWebScraper, 'parse_page') as parse_page:
+        second = scraper.fetch_events()
+        assert not parse_page.called
+    assert second == first
+
+@patch.dict('os.environ', {'EVENTBRITE_API_KEY': 'fake_key'})
+def test_api_source_reuses_events_on_304(http_cache):
+    """Test API sources replay cached events when the first page is unchanged"""
+    source = EventbriteSource(http_cache=http_cache)
+    body = json.dumps({"events": [{
+        "id": "456",
+        "name": {"text": "Tech Conference"},
+        "description": {"text": "Annual technology conference"},
+        "start": {"local": "2024-05-01T09:00:00"},
+        "venue": {"name": "Convention Center", "address": {"city": "New York"}},
+        "category": {"name": "Technology"},
+        "url": "http://eventbrite.com/e/456"
+    }]})
+    source.session.get = Mock(return_value=make_response(text=body, headers={'ETag': '"v1"'}))
+    first = source.fetch_events()
+    assert [event.id for event in first] == ["456"]
+
+    source.session.get = Mock(return_value=make_response(status_code=304))
+    second = source.fetch_events()
+    assert second == first
+    assert http_cache.stats()['hits'] == 1
+
+def eventbrite_body(ids, continuation=None):
+    return json.dumps({
+        "pagination": {"has_more_items": continuation is not None, "continuation": continuation},
+        "events": [{
+            "id": event_id,
+            "name": {"text": f"Event {event_id}"},
+            "description": {"text": "Description"},
+            "start": {"local": "2024-05-01T09:00:00"},
+            "venue": {"name": "Venue", "address": {"city": "New York"}},
+            "category": {"name": "Technology"},
+            "url": f"http://eventbrite.com/e/{event_id}"
+        } for event_id in ids]
+    })
+
+@patch.dict('os.environ', {'EVENTBRITE_API_KEY': 'fake_key'})
+def test_api_source_revalidates_every_page(http_cache):
+    """Test a changed later page is picked up while unchanged pages are replayed"""
+    source = EventbriteSource(http_cache=http_cache)
+    source.session.get = Mock(side_effect=[
+        make_response(text=eventbrite_body(["1"], continuation="c1"), headers={'ETag': '"p1"'}),
+        make_response(text=eventbrite_body(["2"]), headers={'ETag': '"p2"'}),
+    ])
+    assert [event.id for event in source.fetch_events()] == ["1", "2"]
+
+    source.session.get = Mock(side_effect=[
+        make_response(status_code=304),
+        make_response(text=eventbrite_body(["2", "3"]), headers={'ETag': '"p2b"'}),
+    ])
+    with patch.object(EventbriteSource, '_parse_event',
+                      wraps=source._parse_event) as parse_event:
+        events = source.fetch_events()
+    assert [event.id for event in events] == ["1", "2", "3"]
+    assert parse_event.call_count == 2
+    assert source.session.get.call_args_list[1].kwargs['params']['continuation'] == "c1"
+
+@patch.dict('os.environ', {'MEETUP_API_KEY': 'fake_key'})
+def test_replayed_page_keeps_link_header(http_cache):
+    """Test a 304 page still leads on to the next page through its stored Link header"""
+    source = MeetupSource(http_cache=http_cache)
+    next_url = "https://api.meetup.com/find/upcoming_events?scroll=since:2"
+
+    def meetup_body(event_id):
+        return json.dumps({"events": [{
+            "id": event_id,
+            "name": f"Event {event_id}",
+            "time": 1714500000000,
+            "venue": {"name": "Venue", "city": "New York"},
+            "link": f"http://meetup.com/event/{event_id}"
+        }]})
+    first_page = make_response(text=meetup_body("1"), headers={
+        'ETag': '"p1"', 'Link': f'<{next_url}>; rel="next"'})
+    first_page.links = {"next": {"url": next_url, "rel": "next"}}
+    source.session.get = Mock(side_effect=[first_page, make_response(text=meetup_body("2"))])
+    assert [event.id for event in source.fetch_events()] == ["1", "2"]
+
+    source.session.get = Mock(side_effect=[make_response(status_code=304),
+                                           make_response(text=meetup_body("3"))])
+    assert [event.id for event in source.fetch_events()] == ["1", "3"]
+    assert source.session.get.call_args_list[1].args == (next_url,)
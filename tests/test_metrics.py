@@ -0,0 +1,124 @@
+import time
+import urllib.request
+from datetime import datetime, timedelta
+import pytest
+from src.models.user_preferences import UserPreferences
+from src.services.event_processor import EventProcessor
+from src.services.fetch_orchestrator import FetchOrchestrator
+from src.services.metrics import (EVENTS_PER_SECOND, SOURCE_EVENTS, SOURCE_FAILURES,
+                                  SOURCE_SECONDS, STAGE_SECONDS, MetricsRegistry,
+                                  start_metrics_server, write_metrics)
+from src.sources.base import EventSource
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+class StubSource(EventSource):
+    def __init__(self, name, events=None, error=None):
+        self.source_name = name
+        self.events = events or []
+        self.error = error
+
+    def fetch_events(self):
+        if self.error:
+            raise self.error
+        return self.events
+
+    def validate_event(self, event):
+        return super().validate_event(event)
+
+def test_render_prometheus_text(registry):
+    """Test counters, gauges and histograms render in the exposition format"""
+    requests = registry.counter('requests_total', "Requests handled", ('path',))
+    requests.labels(path='/a').inc()
+    requests.labels(path='/a').inc(2)
+    requests.labels(path='say "hi"\n').inc()
+    registry.gauge('temperature', "Current temperature").set(21.5)
+    latency = registry.histogram('latency_seconds', "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3):
+        latency.observe(value)
+
+    assert registry.render().splitlines() == [
+        '# HELP requests_total Requests handled',
+        '# TYPE requests_total counter',
+        'requests_total{path="/a"} 3',
+        'requests_total{path="say \\"hi\\"\\n"} 1',
+        '# HELP temperature Current temperature',
+        '# TYPE temperature gauge',
+        'temperature 21.5',
+        '# HELP latency_seconds Latency',
+        '# TYPE latency_seconds histogram',
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        'latency_seconds_sum 4.05',
+        'latency_seconds_count 4',
+    ]
+
+def test_duplicate_metric_names_rejected(registry):
+    """Test a metric name can only be registered once"""
+    registry.counter('events_total', "Events")
+    with pytest.raises(ValueError):
+        registry.gauge('events_total', "Events")
+
+def test_timer_as_decorator_and_context_manager(registry):
+    """Test timers observe once per call or block"""
+    histogram = registry.histogram('work_seconds', "Work", ('kind',))
+
+    @histogram.labels(kind='decorated').time()
+    def work():
+        return 42
+
+    assert work() == 42
+    assert work() == 42
+    with histogram.labels(kind='block').time() as timer:
+        time.sleep(0.01)
+
+    assert histogram.labels(kind='decorated').count == 2
+    assert histogram.labels(kind='block').count == 1
+    assert timer.elapsed >= 0.01
+
+def test_fetch_records_source_metrics(make_event):
+    """Test the orchestrator records latency, events and failures per source"""
+    event = make_event(1, date=datetime.now() + timedelta(days=1), source="metrics_ok")
+    ok = StubSource("metrics_ok", [event])
+    broken = StubSource("metrics_broken", error=RuntimeError("down"))
+    FetchOrchestrator(max_workers=2).fetch_all([ok, broken])
+
+    assert SOURCE_SECONDS.labels(source="metrics_ok", stage="fetch").count == 1
+    assert SOURCE_EVENTS.labels(source="metrics_ok").value == 1
+    assert SOURCE_FAILURES.labels(source="metrics_broken", reason="error").value == 1
+    assert EVENTS_PER_SECOND.labels(stage="fetch").value > 0
+
+def test_processor_stages_are_timed(make_event):
+    """Test update, match and render stages record their latency"""
+    stages = ('update', 'match', 'render')
+    before = {stage: STAGE_SECONDS.labels(stage=stage).count for stage in stages}
+    processor = EventProcessor({})
+    events = [make_event(i, date=datetime.now() + timedelta(days=i + 1)) for i in range(3)]
+    processor.update_events(events)
+    matched = processor.get_matching_events(UserPreferences(user_id="u", categories=["technology"]))
+    processor._format_email_body(matched)
+
+    for stage in stages:
+        assert STAGE_SECONDS.labels(stage=stage).count == before[stage] + 1
+    assert EVENTS_PER_SECOND.labels(stage='update').value > 0
+
+def test_exporters(tmp_path):
+    """Test the file exporter and HTTP endpoint serve the registry"""
+    path = tmp_path / "metrics.prom"
+    write_metrics(str(path))
+    assert "# TYPE cea_stage_seconds histogram" in path.read_text()
+
+    server = start_metrics_server(0)
+    try:
+        # Local only unless a host is configured
+        assert server.server_address[0] == "127.0.0.1"
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url) as response:
+            assert response.headers['Content-Type'].startswith("text/plain; version=0.0.4")
+            assert "cea_source_seconds" in response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -19,6 +19,7 @@ def test_event_creation():
     assert event.id == "123"
     assert event.title == "Tech Meetup"
     assert event.category == "technology"
+    assert event.key == ("test", "123")
     
     # Test to_dict method
     event_dict = event.to_dict()
@@ -31,6 +32,18 @@ def test_event_creation():
     assert new_event.date.year == 2024
     assert new_event.date.month == 1
 
+def test_event_is_slotted_and_interns_categories():
+    """Test events carry no __dict__ and share categorical strings"""
+    first, second = (
+        Event(id=str(i), title="Meetup", description="Description",
+              date=datetime(2024, 1, 1), location="".join(["down", "town"]),
+              category="".join(["tech", "nology"]), source="test")
+        for i in range(2)
+    )
+    assert not hasattr(first, '__dict__')
+    assert first.location is second.location
+    assert first.category is second.category
+
 def test_user_preferences_creation():
     """Test UserPreferences model creation and methods"""
     prefs = UserPreferences(
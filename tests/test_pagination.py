@@ -0,0 +1,54 @@
+import threading
+import pytest
+from src.sources.pagination import iter_pages
+
+def make_fetcher(pages, calls):
+    """Fetcher over a list of pages, using the page number as cursor"""
+    def fetch_page(cursor):
+        number = cursor or 0
+        calls.append(number)
+        next_cursor = number + 1 if number + 1 < len(pages) else None
+        return pages[number], next_cursor
+    return fetch_page
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_iter_pages_follows_cursors(prefetch):
+    """Test every page is yielded in order"""
+    calls = []
+    pages = [[1, 2], [3], [4, 5]]
+    assert list(iter_pages(make_fetcher(pages, calls), prefetch=prefetch)) == pages
+    assert calls == [0, 1, 2]
+
+def test_iter_pages_max_pages():
+    """Test max_pages caps the number of requests"""
+    calls = []
+    pages = [[1], [2], [3]]
+    assert list(iter_pages(make_fetcher(pages, calls), max_pages=2)) == [[1], [2]]
+    assert calls == [0, 1]
+
+def test_iter_pages_prefetches_next_page():
+    """Test the next page is requested while the current one is processed"""
+    fetched_second = threading.Event()
+
+    def fetch_page(cursor):
+        if cursor is None:
+            return ["first"], "next"
+        fetched_second.set()
+        return ["second"], None
+
+    pages = iter_pages(fetch_page)
+    assert next(pages) == ["first"]
+    assert fetched_second.wait(timeout=1)
+    assert list(pages) == [["second"]]
+
+def test_iter_pages_propagates_errors():
+    """Test an error on a later page is raised to the consumer"""
+    def fetch_page(cursor):
+        if cursor is None:
+            return ["first"], "next"
+        raise ValueError("bad page")
+
+    pages = iter_pages(fetch_page)
+    assert next(pages) == ["first"]
+    with pytest.raises(ValueError):
+        next(pages)
@@ -0,0 +1,99 @@
+from unittest.mock import Mock
+import pytest
+from src.models.event import Event
+from src.services.fetch_orchestrator import FetchOrchestrator
+from src.services.metrics import PARSE_ERRORS, SOURCE_SECONDS
+from src.services.parse_stage import ParseStage
+from src.sources.base import RawPage
+from src.sources.web_scraper import CommunityWebScraper
+
+LISTING_HTML = """
+<div class="event-card">
+    <h2 class="event-title">Python Meetup</h2>
+    <p class="event-description">Monthly Python programming meetup</p>
+    <span class="event-date">2024-01-01 18:30</span>
+    <span class="event-location">Downtown Tech Hub</span>
+    <span class="event-category">Technology</span>
+    <a class="event-link" href="http://example.com/events/1">Details</a>
+</div>
+<div class="event-card">
+    <h2 class="event-title">Jazz Night</h2>
+    <p class="event-description">Live jazz in the park bandstand</p>
+    <span class="event-date">2024-01-02 20:00</span>
+    <span class="event-location">City Park</span>
+    <span class="event-category">Music</span>
+</div>
+"""
+
+@pytest.fixture
+def scraper():
+    scraper = CommunityWebScraper("http://example.com/events")
+    response = Mock()
+    response.text = LISTING_HTML
+    scraper.session.get = Mock(return_value=response)
+    return scraper
+
+@pytest.fixture(scope="module")
+def stage():
+    stage = ParseStage(workers=1)
+    yield stage
+    stage.close()
+
+def test_inline_parse_matches_scraper(scraper):
+    """Test workers=0 parses in the calling thread"""
+    stage = ParseStage(workers=0)
+    assert stage.parse(scraper, LISTING_HTML) == scraper.parse_page(LISTING_HTML)
+    assert stage._pool is None
+
+def test_process_parse_matches_inline(scraper, stage):
+    """Test events parsed in a worker process equal those parsed inline"""
+    events = stage.parse(scraper, LISTING_HTML)
+    assert events == scraper.parse_page(LISTING_HTML)
+    assert [event.title for event in events] == ["Python Meetup", "Jazz Night"]
+
+def test_fetch_reuses_cached_pages(scraper):
+    """Test pages with cached events skip parsing"""
+    cached = scraper.parse_page(LISTING_HTML)[:1]
+    scraper.fetch_raw = Mock(return_value=[RawPage("http://example.com/events", events=cached)])
+    scraper.parse_raw = Mock()
+
+    assert ParseStage(workers=0).fetch(scraper) == cached
+    scraper.parse_raw.assert_not_called()
+
+def test_orchestrator_routes_scrapers_through_stage(scraper, stage):
+    """Test the orchestrator parses splittable sources on the parse stage"""
+    stage_fetch = Mock(wraps=stage.fetch)
+    stage.fetch = stage_fetch
+    try:
+        report = FetchOrchestrator(parse_stage=stage).fetch_all([scraper])
+    finally:
+        del stage.fetch
+
+    assert [event.title for event in report.events] == ["Python Meetup", "Jazz Night"]
+    stage_fetch.assert_called_once_with(scraper)
+
+def test_worker_parse_metrics_reach_the_parent(scraper, stage):
+    """Test parse times and errors in worker processes are recorded in this process"""
+    broken_card = """
+<div class="event-card">
+    <p class="event-description">A card without a title</p>
+    <span class="event-date">2024-01-03 18:00</span>
+    <span class="event-location">Library</span>
+    <span class="event-category">Arts</span>
+</div>
+"""
+    errors = PARSE_ERRORS.labels(source=scraper.source_name)
+    timings = SOURCE_SECONDS.labels(source=scraper.source_name, stage='parse')
+    errors_before, timings_before = errors.value, timings.count
+
+    events = stage.parse(scraper, LISTING_HTML + broken_card)
+
+    assert len(events) == 2
+    assert errors.value == errors_before + 1
+    assert timings.count == timings_before + 1
+
+def test_event_tuple_round_trip(make_event):
+    """Test events survive the compact tuple encoding"""
+    event = make_event(1, url="http://example.com/1",
+                       source_urls=["http://example.com/1", "http://other.example.com/1"])
+    assert Event.from_tuple(event.to_tuple()) == event
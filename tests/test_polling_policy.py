@@ -0,0 +1,75 @@
+from dataclasses import replace
+from datetime import datetime, timedelta
+import pytest
+from src.services.polling_policy import AdaptivePolling, change_fraction, event_fingerprints
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def make_events(make_event):
+    def make(count, offset=0):
+        return [make_event(offset + i, date=datetime(2030, 1, 1) + timedelta(days=offset + i),
+                           location="Hall", source="stub")
+                for i in range(count)]
+    return make
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def polling(clock):
+    return AdaptivePolling(min_interval=60, max_interval=86400, initial_interval=3600,
+                           target_change=0.1, clock=clock)
+
+def test_change_fraction_counts_edits(make_events):
+    """Test the Jaccard distance treats an edited event as changed"""
+    events = make_events(4)
+    same = event_fingerprints(events)
+    assert change_fraction(same, event_fingerprints(make_events(4))) == 0.0
+    edited = event_fingerprints(events[:3] + [replace(events[3], title="Renamed")])
+    assert change_fraction(same, edited) == pytest.approx(1 - 3 / 5)
+    assert change_fraction(frozenset(), frozenset()) == 0.0
+
+def test_first_fetch_keeps_initial_interval(polling, make_events):
+    """Test one fetch alone says nothing about the change rate"""
+    assert polling.observe("feed", make_events(10)) == 3600
+    assert polling.activity("feed").fetches == 1
+    assert polling.interval("other") == 3600
+
+def test_static_source_backs_off_to_max(polling, clock, make_events):
+    """Test a source that never changes is polled as rarely as allowed"""
+    events = make_events(10)
+    polling.observe("page", events)
+    clock.now += 3600
+    assert polling.observe("page", events) == 86400
+    assert polling.activity("page").changes == 0
+
+def test_fast_source_polled_more_often(polling, clock, make_events):
+    """Test the interval targets the configured change fraction per fetch"""
+    polling.observe("feed", make_events(10))
+    # Half of the events replaced within the hour: 0.5 / 3600 per second
+    clock.now += 3600
+    interval = polling.observe("feed", make_events(10, offset=5))
+    assert interval == pytest.approx(0.1 / ((1 - 5 / 15) / 3600))
+    assert interval < 3600
+    assert polling.activity("feed").changes == 1
+
+def test_interval_bounded_and_smoothed(polling, clock, make_events):
+    """Test intervals stay within bounds and one quiet fetch does not reset the rate"""
+    polling.observe("feed", make_events(10))
+    clock.now += 60
+    assert polling.observe("feed", make_events(10, offset=100)) == 60
+    clock.now += 60
+    assert polling.observe("feed", make_events(10, offset=100)) == 60
+    assert polling.activity("feed").change_rate == pytest.approx(0.5 / 60)
+
+def test_rejects_inverted_bounds():
+    """Test min_interval above max_interval is a configuration error"""
+    with pytest.raises(ValueError):
+        AdaptivePolling(min_interval=600, max_interval=60)
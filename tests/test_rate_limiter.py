@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+import pytest
+from src.sources.rate_limiter import (
+    RateLimiter, TokenBucket, parse_rate_limit_reset, parse_retry_after
+)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_token_bucket_allows_burst_then_paces():
+    """Test the bucket allows its capacity at once then refills at rate"""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=2, clock=clock)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+    clock.now = 10.0
+    assert bucket.reserve() == 0
+
+def test_token_bucket_block_and_drain():
+    """Test provider back-off holds callers and drops saved tokens"""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1.0, capacity=5, clock=clock)
+    bucket.block_for(3)
+    assert bucket.reserve() == pytest.approx(3)
+
+    clock.now = 4.0
+    bucket.drain()
+    assert bucket.reserve() == pytest.approx(1.0)
+
+def test_buckets_are_per_host():
+    """Test hosts get independent buckets and configured rates"""
+    limiter = RateLimiter(default_rate=1.0, host_rates={'api.meetup.com': 5.0})
+    eventbrite = limiter.bucket_for("https://www.eventbriteapi.com/v3/events/search/")
+    assert eventbrite is limiter.bucket_for("https://www.eventbriteapi.com/v3/other")
+    assert limiter.bucket_for("https://api.meetup.com/find").rate == 5.0
+    assert eventbrite.rate == 1.0
+
+def test_update_from_response_honors_headers():
+    """Test Retry-After and X-RateLimit headers push back the next request"""
+    limiter = RateLimiter(default_rate=100.0)
+    url = "https://api.example.com/events"
+
+    limiter.update_from_response(url, 429, {'Retry-After': '2'})
+    assert limiter.bucket_for(url).reserve() == pytest.approx(2, abs=0.1)
+
+    other = "https://other.example.com/events"
+    limiter.update_from_response(other, 200, {'X-RateLimit-Remaining': '0',
+                                              'X-RateLimit-Reset': '5'})
+    assert limiter.bucket_for(other).reserve() == pytest.approx(5, abs=0.1)
+
+def test_header_parsing():
+    """Test the header value formats providers use"""
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("nonsense") is None
+    http_date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 < parse_retry_after(http_date) <= 30
+
+    assert parse_rate_limit_reset("10") == 10.0
+    assert 55 < parse_rate_limit_reset(str(time.time() + 60)) <= 60
+    assert parse_rate_limit_reset("soon") is None
+
+def test_limiter_is_shared_across_threads():
+    """Test concurrent callers share one budget"""
+    limiter = RateLimiter(default_rate=50.0, default_capacity=1)
+    url = "https://api.example.com/"
+
+    def worker():
+        for _ in range(5):
+            limiter.acquire(url)
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # 20 requests at 50/s with no burst need close to 0.4s
+    assert time.monotonic() - start >= 0.3
+
+def test_acquire_async():
+    """Test async tasks wait on the event loop"""
+    limiter = RateLimiter(default_rate=20.0, default_capacity=1)
+
+    async def run():
+        await asyncio.gather(*[limiter.acquire_async("https://a/") for _ in range(5)])
+
+    start = time.monotonic()
+    asyncio.run(run())
+    assert time.monotonic() - start >= 0.15
+
+def test_get_wraps_session_and_reads_headers():
+    """Test rate limited GETs pass through and record response headers"""
+    limiter = RateLimiter(default_rate=100.0)
+    response = Mock(status_code=200, headers={'Retry-After': '1'})
+    session = Mock()
+    session.get.return_value = response
+
+    assert limiter.get(session, "https://a/x", params={'q': 1}) is response
+    session.get.assert_called_once_with("https://a/x", params={'q': 1})
+    assert limiter.bucket_for("https://a/").reserve() == pytest.approx(1, abs=0.1)
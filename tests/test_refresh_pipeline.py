@@ -0,0 +1,144 @@
+from dataclasses import replace
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+import pytest
+from src.models.user_preferences import UserPreferences
+from src.services.event_processor import EventProcessor
+from src.services.fetch_orchestrator import FetchOrchestrator
+from src.services.polling_policy import AdaptivePolling
+from src.services.refresh_pipeline import RefreshPipeline
+from src.services.scheduler import Scheduler
+from src.sources.base import EventSource
+
+@pytest.fixture
+def source_event(make_event):
+    """An event from a named source, index + 1 days from now"""
+    def make(source, index, **fields):
+        return make_event(index, title=f"{source} event {index}",
+                          date=datetime.now() + timedelta(days=index + 1),
+                          location=f"{source} hall", source=source, **fields)
+    return make
+
+class StubSource(EventSource):
+    """Source whose next result can be set by the test"""
+    def __init__(self, name, events):
+        self.source_name = name
+        self.events = events
+        self.error = None
+
+    def fetch_events(self):
+        if self.error:
+            raise self.error
+        return list(self.events)
+
+    def validate_event(self, event):
+        return super().validate_event(event)
+
+@pytest.fixture
+def sources(source_event):
+    return [StubSource("a", [source_event("a", 0)]),
+            StubSource("b", [source_event("b", 1, category="music")])]
+
+@pytest.fixture
+def users():
+    return [UserPreferences(user_id="tech", categories=["technology"], email="tech@example.com"),
+            UserPreferences(user_id="music", categories=["music"], email="music@example.com")]
+
+@pytest.fixture
+def pipeline(sources, users):
+    processor = EventProcessor({})
+    processor.send_email_notification = Mock()
+    return RefreshPipeline(sources, processor, users, fetcher=FetchOrchestrator(max_workers=2))
+
+def test_run_once_sends_digests(pipeline, sources, users):
+    """Test a full run fetches, refreshes and emails every user"""
+    pipeline.run_once()
+    sent = {call.args[0].user_id: call.args[1]
+            for call in pipeline.processor.send_email_notification.call_args_list}
+    assert sent == {"tech": sources[0].events, "music": sources[1].events}
+    assert pipeline.pending_digests() == {}
+
+def test_refresh_waits_for_every_source(pipeline, sources):
+    """Test refresh is skipped until all sources have been fetched once"""
+    pipeline.fetch_source(sources[0])
+    assert pipeline.refresh() is None
+    pipeline.fetch_source(sources[1])
+    assert len(pipeline.refresh().added) == 2
+    # Nothing new was fetched since
+    assert pipeline.refresh() is None
+
+def test_skipped_refresh_evicts_past_events(pipeline, sources):
+    """Test events that start between fetches are evicted by the next refresh"""
+    pipeline.fetch_all()
+    pipeline.refresh()
+    # As if a day and a half had passed: source a's event has started
+    pipeline.processor.retain_past = -timedelta(days=1, hours=12)
+    assert pipeline.refresh() is None
+    assert pipeline.processor.get_events_between() == sources[1].events
+
+def test_failed_source_keeps_previous_events(pipeline, sources):
+    """Test a failing source does not have its events reported as removed"""
+    pipeline.fetch_all()
+    pipeline.refresh()
+    sources[1].error = RuntimeError("down")
+    pipeline.fetch_source(sources[1])
+    diff = pipeline.refresh()
+    assert not diff
+    assert len(pipeline.processor.get_events_between()) == 2
+
+def test_digests_accumulate_until_sent(pipeline, sources, users, source_event):
+    """Test digests from several refreshes are merged per user, latest version first"""
+    pipeline.fetch_all()
+    pipeline.refresh()
+    renamed = replace(sources[0].events[0], title="Renamed")
+    sources[0].events = [renamed, source_event("a", 5)]
+    pipeline.fetch_source(sources[0])
+    pipeline.refresh()
+
+    assert pipeline.pending_digests()["tech"] == [renamed, sources[0].events[1]]
+    pipeline.send_digests([users[0]])
+    assert list(pipeline.pending_digests()) == ["music"]
+    (user, events), _ = pipeline.processor.send_email_notification.call_args
+    assert user is users[0]
+    assert events == [renamed, sources[0].events[1]]
+
+def test_schedule_registers_independent_jobs(pipeline, users):
+    """Test one job per source, one refresh job and one job per digest batch"""
+    scheduler = Scheduler()
+    pipeline.schedule(scheduler, digest_batch_size=1)
+    assert sorted(job.name for job in scheduler.jobs()) == [
+        "digest:0", "digest:1", "fetch:0:a", "fetch:1:b", "refresh"
+    ]
+    scheduler.stop()
+
+def test_polling_reschedules_fetch_jobs(sources, users):
+    """Test a source whose events stop changing is fetched less often"""
+    processor = EventProcessor({})
+    polling = AdaptivePolling(min_interval=60, max_interval=7200, initial_interval=600)
+    pipeline = RefreshPipeline(sources, processor, users,
+                               fetcher=FetchOrchestrator(max_workers=2), polling=polling)
+    scheduler = Scheduler()
+    pipeline.schedule(scheduler, source_interval=600)
+    pipeline.fetch_source(sources[0])
+    assert scheduler.get_job("fetch:0:a").interval == 600
+    pipeline.fetch_source(sources[0])
+    job = scheduler.get_job("fetch:0:a")
+    assert job.interval == 7200
+    assert job.next_run > scheduler.clock() + 7000
+    assert scheduler.get_job("fetch:1:b").interval == 600
+    scheduler.stop()
+
+def test_users_subscribed_once(sources, users):
+    """Test refreshes reuse the subscription index until the users change"""
+    processor = EventProcessor({})
+    processor.subscribe_users = Mock(wraps=processor.subscribe_users)
+    pipeline = RefreshPipeline(sources, processor, users, fetcher=FetchOrchestrator(max_workers=2))
+    pipeline.fetch_all()
+    pipeline.refresh()
+    pipeline.refresh(force=True)
+    assert processor.subscribe_users.call_count == 1
+
+    pipeline.users = users[:1]
+    pipeline.refresh(force=True)
+    assert processor.subscribe_users.call_count == 2
+    assert len(processor._subscriptions) == 1
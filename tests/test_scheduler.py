@@ -0,0 +1,116 @@
+import random
+import threading
+import time
+import pytest
+from src.services.scheduler import Scheduler
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+@pytest.fixture
+def scheduler():
+    scheduler = Scheduler(workers=4, rng=random.Random(0))
+    yield scheduler
+    scheduler.stop()
+
+def test_jobs_run_on_independent_cadences(scheduler):
+    """Test each job runs at its own interval"""
+    fast = scheduler.add_job("fast", lambda: None, interval=0.02)
+    slow = scheduler.add_job("slow", lambda: None, interval=0.2)
+    scheduler.start()
+    time.sleep(0.35)
+    assert fast.runs >= 8
+    assert 1 <= slow.runs <= 3
+
+def test_job_runs_when_due_not_on_a_poll_tick(scheduler):
+    """Test a job starts close to its due time"""
+    started = []
+    scheduler.add_job("once", lambda: started.append(time.monotonic()), interval=60, delay=0.05)
+    scheduled_at = time.monotonic()
+    scheduler.start()
+    assert wait_for(lambda: started)
+    assert 0.04 <= started[0] - scheduled_at < 0.2
+
+def test_overlapping_runs_are_skipped(scheduler):
+    """Test a job still running when due again is not started twice"""
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def slow():
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.1)
+        with lock:
+            active.pop()
+
+    job = scheduler.add_job("slow", slow, interval=0.01)
+    scheduler.start()
+    assert wait_for(lambda: job.runs >= 2)
+    assert max(peak) == 1
+    assert job.skipped > 0
+
+def test_jitter_spreads_first_runs():
+    """Test jitter delays each job by up to the jitter"""
+    scheduler = Scheduler(rng=random.Random(1), clock=lambda: 100.0)
+    jobs = [scheduler.add_job(f"job{i}", lambda: None, interval=60, jitter=30) for i in range(20)]
+    due = [job.next_run for job in jobs]
+    assert all(100.0 <= value <= 130.0 for value in due)
+    assert len(set(due)) == 20
+    scheduler.stop()
+
+def test_failures_are_recorded(scheduler, capsys):
+    """Test an exception in a job is recorded without stopping the scheduler"""
+    def broken():
+        raise RuntimeError("boom")
+
+    job = scheduler.add_job("broken", broken, interval=0.01)
+    scheduler.start()
+    assert wait_for(lambda: job.failures >= 2)
+    assert isinstance(job.last_error, RuntimeError)
+    assert "Error in scheduled job broken: boom" in capsys.readouterr().out
+
+def test_reschedule_trigger_and_remove(scheduler):
+    """Test jobs can be sped up, triggered and removed"""
+    runs = []
+    job = scheduler.add_job("job", lambda: runs.append(1), interval=60, delay=60)
+    scheduler.start()
+    scheduler.trigger("job")
+    assert wait_for(lambda: job.runs == 1)
+
+    scheduler.reschedule("job", interval=0.01)
+    assert wait_for(lambda: job.runs >= 3)
+    scheduler.remove_job("job")
+    time.sleep(0.05)
+    count = job.runs
+    time.sleep(0.05)
+    assert job.runs == count
+    assert scheduler.get_job("job") is None
+    with pytest.raises(ValueError):
+        scheduler.add_job("dup", lambda: None, interval=1)
+        scheduler.add_job("dup", lambda: None, interval=1)
+
+def test_run_forever_returns_when_stopped_from_another_thread(scheduler):
+    """Test run_forever exits cleanly when another thread calls stop"""
+    errors = []
+
+    def run():
+        try:
+            scheduler.run_forever()
+        except Exception as e:
+            errors.append(e)
+
+    runner = threading.Thread(target=run)
+    runner.start()
+    assert wait_for(lambda: scheduler._dispatcher is not None)
+    scheduler.stop()
+    runner.join(timeout=2.0)
+
+    assert not runner.is_alive()
+    assert errors == []
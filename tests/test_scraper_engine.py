@@ -0,0 +1,222 @@
+import json
+import threading
+import time
+from unittest.mock import Mock
+import pytest
+import requests
+from src.services.parse_stage import parse_in_worker
+from src.services.scraper_engine import MultiSiteScraperEngine
+from src.sources.site_config import ConfiguredSiteScraper, SiteConfig, load_site_configs
+
+LIBRARY_HTML = """
+<ul>
+  <li class="program">
+    <h3 class="program-name">Story Time</h3>
+    <div class="summary">Stories and songs for toddlers</div>
+    <time class="start">Monday, May 06, 2024 10:00 AM</time>
+    <span class="branch">Central Library</span>
+    <a class="details" href="http://library.example.org/p/1">Details</a>
+  </li>
+</ul>
+"""
+
+COMMUNITY_HTML = """
+<div class="event-card">
+    <h2 class="event-title">Python Meetup</h2>
+    <p class="event-description">Monthly Python programming meetup</p>
+    <span class="event-date">2024-01-01 18:30</span>
+    <span class="event-location">Downtown Tech Hub</span>
+    <span class="event-category">Technology</span>
+</div>
+"""
+
+def library_config(**overrides):
+    data = {
+        'name': "city_library",
+        'url': "http://library.example.org/calendar",
+        'card': "li.program",
+        'fields': {
+            'title': "h3.program-name",
+            'description': "div.summary",
+            'date': "time.start",
+            'location': "span.branch",
+        },
+        'link': "a.details",
+        'date_formats': ["%A, %B %d, %Y %I:%M %p"],
+        'default_category': "education",
+        'max_connections': 1,
+    }
+    data.update(overrides)
+    return SiteConfig.from_dict(data)
+
+def page_response(html):
+    response = Mock()
+    response.text = html
+    return response
+
+def test_load_site_configs(tmp_path):
+    """Test configs load from JSON files"""
+    sites = [{'name': "a", 'url': "http://a.example.com"},
+             {'name': "b", 'urls': ["http://b.example.com/1", "http://b.example.com/2"]}]
+    json_path = tmp_path / "sites.json"
+    json_path.write_text(json.dumps({'sites': sites}))
+
+    configs = load_site_configs(str(json_path))
+    assert [config.urls for config in configs] == [
+        ["http://a.example.com"], ["http://b.example.com/1", "http://b.example.com/2"]
+    ]
+
+def test_load_yaml_site_configs(tmp_path):
+    """Test configs load from YAML when PyYAML is installed"""
+    pytest.importorskip("yaml")
+    yaml_path = tmp_path / "sites.yaml"
+    yaml_path.write_text("- name: c\n  url: http://c.example.com\n  max_connections: 4\n")
+    assert load_site_configs(str(yaml_path))[0].max_connections == 4
+
+def test_example_config_is_valid():
+    """Test the shipped example config loads"""
+    configs = load_site_configs("config/sites.example.json")
+    assert {config.name for config in configs} == {"downtown_community", "city_library"}
+
+def test_site_config_requires_name_and_url():
+    """Test incomplete site configs are rejected"""
+    with pytest.raises(ValueError):
+        SiteConfig.from_dict({'name': "missing-url"})
+
+def test_configured_scraper_uses_site_selectors():
+    """Test selectors, date formats and defaults come from the config"""
+    scraper = ConfiguredSiteScraper(library_config())
+    events = scraper.parse_page(LIBRARY_HTML)
+
+    assert len(events) == 1
+    event = events[0]
+    assert event.title == "Story Time"
+    assert event.date.day == 6 and event.date.hour == 10
+    assert event.category == "education"
+    assert event.source == "city_library"
+    assert event.url == "http://library.example.org/p/1"
+
+def test_configured_scraper_fetches_every_url():
+    """Test all listing pages of a site are fetched and failures are isolated"""
+    config = library_config(urls=["http://library.example.org/page2"])
+    scraper = ConfiguredSiteScraper(config)
+    scraper.session.get = Mock(side_effect=[
+        page_response(LIBRARY_HTML), requests.RequestException("down")
+    ])
+
+    assert len(scraper.fetch_events()) == 1
+    assert scraper.session.get.call_count == 2
+
+def test_site_parser_rebuilds_in_worker():
+    """Test a configured site's parser spec can be rebuilt by a worker"""
+    scraper = ConfiguredSiteScraper(library_config())
+    rows, errors = parse_in_worker(scraper.parser_spec(), LIBRARY_HTML)
+    assert rows == [event.to_tuple() for event in scraper.parse_page(LIBRARY_HTML)]
+    assert errors == 0
+
+def test_engine_scrapes_sites_with_process_parsing():
+    """Test the engine fetches all sites and parses them on worker processes"""
+    community = SiteConfig(name="community", urls=["http://example.com/events"])
+    engine = MultiSiteScraperEngine([community, library_config()], parse_workers=1)
+    engine.scrapers[0].session.get = Mock(return_value=page_response(COMMUNITY_HTML))
+    engine.scrapers[1].session.get = Mock(side_effect=requests.RequestException("down"))
+    try:
+        events = engine.fetch_events()
+    finally:
+        engine.close()
+
+    assert [event.title for event in events] == ["Python Meetup"]
+    assert events[0].source == "community"
+    assert list(engine.errors) == ["http://library.example.org/calendar"]
+
+def test_engine_honours_per_site_connection_limit():
+    """Test no more than max_connections downloads run per site"""
+    config = SiteConfig(name="busy", urls=[f"http://example.com/{i}" for i in range(6)],
+                        max_connections=2)
+    engine = MultiSiteScraperEngine([config], parse_workers=1)
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def get(url, headers=None):
+        with lock:
+            active.append(url)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(url)
+        return page_response("")
+
+    engine.scrapers[0].session.get = get
+    try:
+        assert engine.fetch_events() == []
+    finally:
+        engine.close()
+    assert max(peak) == 2
+
+def test_engine_keeps_failed_site_events():
+    """Test a site that fails is served from its last scrape instead of dropping out"""
+    community = SiteConfig(name="community", urls=["http://example.com/events"])
+    engine = MultiSiteScraperEngine([community, library_config()], parse_workers=1)
+    engine.scrapers[0].session.get = Mock(return_value=page_response(COMMUNITY_HTML))
+    engine.scrapers[1].session.get = Mock(return_value=page_response(LIBRARY_HTML))
+    try:
+        first = engine.fetch_events()
+        engine.scrapers[1].session.get = Mock(side_effect=requests.RequestException("down"))
+        second = engine.fetch_events()
+        engine.scrapers[0].session.get = Mock(side_effect=requests.RequestException("down"))
+        with pytest.raises(RuntimeError):
+            engine.fetch_events()
+    finally:
+        engine.close()
+
+    assert [event.title for event in first] == ["Python Meetup", "Story Time"]
+    assert second == first
+    assert list(engine.errors) == ["http://example.com/events",
+                                   "http://library.example.org/calendar"]
+
+def test_engine_times_out_slow_sites():
+    """Test a site slower than site_timeout does not hold up the others"""
+    community = SiteConfig(name="community", urls=["http://example.com/events"])
+    engine = MultiSiteScraperEngine([community, library_config()], parse_workers=1,
+                                    site_timeout=1.5)
+    engine.scrapers[0].session.get = Mock(return_value=page_response(COMMUNITY_HTML))
+    release = threading.Event()
+
+    def hang(url, headers=None):
+        release.wait(10)
+        return page_response(LIBRARY_HTML)
+
+    engine.scrapers[1].session.get = hang
+    started = time.monotonic()
+    try:
+        events = engine.fetch_events()
+    finally:
+        release.set()
+        engine.close()
+
+    assert time.monotonic() - started < 5
+    assert [event.title for event in events] == ["Python Meetup"]
+    assert isinstance(engine.errors["http://library.example.org/calendar"], TimeoutError)
+
+def test_engine_timeout_is_per_page():
+    """Test pages queued behind a slow one are still fetched, each with its own timeout"""
+    community = SiteConfig(name="community", urls=["http://example.com/events"])
+    engine = MultiSiteScraperEngine([library_config(), community], max_workers=1,
+                                    parse_workers=1, site_timeout=1.5)
+    release = threading.Event()
+
+    def hang(url, headers=None):
+        release.wait(10)
+        return page_response(LIBRARY_HTML)
+
+    engine.scrapers[0].session.get = hang
+    engine.scrapers[1].session.get = Mock(return_value=page_response(COMMUNITY_HTML))
+    try:
+        events = engine.fetch_events()
+    finally:
+        release.set()
+        engine.close()
+
+    assert [event.title for event in events] == ["Python Meetup"]
+    assert list(engine.errors) == ["http://library.example.org/calendar"]
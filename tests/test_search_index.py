@@ -0,0 +1,79 @@
+import random
+import pytest
+from src.services.search_index import SearchIndex, tokenize
+
+@pytest.fixture
+def events(make_event):
+    return [
+        make_event(0, title="Jazz Night", description="Live jazz and blues at the hall"),
+        make_event(1, title="Python Workshop", description="Hands-on python for beginners"),
+        make_event(2, title="Community Meetup",
+                   description="Talks on python, data and a little jazz"),
+        make_event(3, title="Art Walk", description="Galleries open late"),
+    ]
+
+@pytest.fixture
+def index(events):
+    index = SearchIndex()
+    for event in events:
+        index.add(event.key, event)
+    return index
+
+def keys(results):
+    return [key[1] for key, _ in results]
+
+def test_tokenize():
+    """Test tokens are lowercased words without stopwords"""
+    assert tokenize("The Python-Workshop, for ALL!") == ["python", "workshop", "all"]
+    assert tokenize(None) == []
+
+def test_title_matches_rank_first(index):
+    """Test events naming the term in their title outrank mentions in passing"""
+    assert keys(index.search("jazz")) == ["0", "2"]
+    assert keys(index.search("python")) == ["1", "2"]
+
+def test_all_terms_required_by_default(index):
+    """Test multi-word queries match events containing every term"""
+    assert keys(index.search("python workshop")) == ["1"]
+    assert keys(index.search("python galleries")) == []
+    assert set(keys(index.search("python galleries", match_all=False))) == {"1", "2", "3"}
+
+def test_candidates_and_limit(index, events):
+    """Test results are restricted to candidate keys and cut at the limit"""
+    assert keys(index.search("python", candidates={events[2].key})) == ["2"]
+    assert len(index.search("jazz", limit=1)) == 1
+    assert index.search("the") == []
+
+def test_incremental_updates(index, events, make_event):
+    """Test removed and replaced events stop matching their old text"""
+    index.remove(events[0].key, events[0])
+    assert keys(index.search("jazz")) == ["2"]
+    assert index.document_frequency("blues") == 0
+
+    renamed = make_event(2, title="Community Meetup", description="Talks on rust")
+    index.remove(events[2].key, events[2])
+    index.add(renamed.key, renamed)
+    assert keys(index.search("jazz")) == []
+    assert keys(index.search("rust")) == ["2"]
+    assert len(index) == 3
+
+def test_top_k_pruning_agrees_with_scoring_everything(make_event):
+    """Test early termination returns the same scores as ranking every match"""
+    rng = random.Random(3)
+    words = [f"word{i}" for i in range(30)]
+    weights = [1 / (i + 1) for i in range(len(words))]
+    index = SearchIndex()
+    for i in range(300):
+        event = make_event(i, title=" ".join(rng.choices(words[:10], k=rng.randint(0, 3))),
+                           description=" ".join(rng.choices(words, weights, k=rng.randint(1, 60))))
+        index.add(event.key, event)
+
+    for _ in range(50):
+        query = " ".join(rng.sample(words, rng.randint(1, 3)))
+        match_all = rng.random() < 0.5
+        postings = [index._postings.get(term, {}) for term in query.split()]
+        test = all if match_all else any
+        matches = [key for key in index._lengths if test(key in posting for posting in postings)]
+        expected = sorted(score for _, score in index._scores(matches, index._weights(postings)))
+        found = index.search(query, limit=10, match_all=match_all)
+        assert [score for _, score in found] == pytest.approx(expected[::-1][:10])
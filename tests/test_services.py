@@ -1,9 +1,14 @@
+import threading
 import pytest
+from dataclasses import replace
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 from src.models.event import Event
 from src.models.user_preferences import UserPreferences
 from src.services.event_processor import EventProcessor
+from src.services.event_repository import EventRepository
+from src.services.geo import Gazetteer
+from src.services.snapshot import SNAPSHOT_HEADER, SNAPSHOT_MAGIC, SNAPSHOT_VERSION
 
 @pytest.fixture
 def sample_events():
@@ -136,4 +141,305 @@ def test_notification_empty_user_email(event_processor, sample_events):
     """Test notification handling with empty user email"""
     prefs = UserPreferences(user_id="user1")  # No email set
     event_processor.send_email_notification(prefs, sample_events)
-    # Should not raise any exception
\ No newline at end of file
+    # Should not raise any exception
+
+def test_matching_index_agrees_with_matches_event(event_processor, make_event):
+    """Test indexed matching returns exactly what matches_event would"""
+    categories = ["technology", "music", "arts", "sports"]
+    locations = ["downtown", "park", "midtown", "uptown"]
+    events = [
+        make_event(i, date=datetime.now() + timedelta(days=i, hours=1),
+                   location=locations[(i * 7) % len(locations)],
+                   category=categories[(i * 3) % len(categories)])
+        for i in range(40)
+    ]
+    event_processor.update_events(events)
+    
+    preference_sets = [
+        UserPreferences(user_id="any"),
+        UserPreferences(user_id="cat", categories=["music", "arts"]),
+        UserPreferences(user_id="loc", locations=["park"]),
+        UserPreferences(user_id="both", categories=["technology"], locations=["downtown", "uptown"]),
+        UserPreferences(user_id="none", categories=["cooking"]),
+    ]
+    for prefs in preference_sets:
+        expected = [event for event in events if prefs.matches_event(event)]
+        assert event_processor.get_matching_events(prefs) == expected
+
+def test_matching_index_rebuilt_on_update(event_processor, sample_events, sample_preferences):
+    """Test the index reflects only the latest update"""
+    event_processor.update_events(sample_events)
+    assert len(event_processor.get_matching_events(sample_preferences)) == 1
+    
+    event_processor.update_events(sample_events[1:])
+    assert event_processor.get_matching_events(sample_preferences) == []
+
+def test_subscribed_users_get_digests(event_processor, sample_events, sample_preferences):
+    """Test update_events routes events to subscribed users"""
+    music_fan = UserPreferences(user_id="user2", categories=["music"])
+    event_processor.subscribe_users([sample_preferences, music_fan])
+    event_processor.update_events(sample_events)
+    
+    digests = event_processor.get_digests()
+    assert [event.title for event in digests["user1"]] == ["Tech Conference"]
+    assert [event.title for event in digests["user2"]] == ["Music Festival"]
+
+def test_digests_empty_without_subscribers(event_processor, sample_events):
+    """Test no digests are built when no users are subscribed"""
+    event_processor.update_events(sample_events)
+    assert event_processor.get_digests() == {}
+
+def test_email_fragments_reset_on_update(event_processor, sample_events):
+    """Test cached email fragments do not survive an event update"""
+    event_processor.update_events(sample_events)
+    event_processor._format_email_body(sample_events)
+    
+    renamed = replace(sample_events[0], title="Renamed Conference")
+    event_processor.update_events([renamed, sample_events[1]])
+    assert "Renamed Conference" in event_processor._format_email_body([renamed])
+    assert sample_events[1].key in event_processor._renderer._fragments
+
+    event_processor.update_events([renamed])
+    assert sample_events[1].key not in event_processor._renderer._fragments
+
+
+def test_update_events_diff(event_processor, sample_events):
+    """Test refreshes report added, updated and removed events"""
+    diff = event_processor.update_events(sample_events)
+    assert diff.added == sample_events
+    assert not diff.updated and not diff.removed
+    
+    # Unchanged refetch: nothing to do, cached objects are kept
+    refetched = [replace(event) for event in sample_events]
+    diff = event_processor.update_events(refetched)
+    assert not diff
+    assert event_processor._cached_events[0] is sample_events[0]
+    
+    moved = replace(sample_events[0], location="uptown")
+    new_event = replace(sample_events[1], id="3", title="Jazz Night")
+    diff = event_processor.update_events([moved, new_event])
+    assert diff.added == [new_event]
+    assert diff.updated == [moved]
+    assert diff.removed == [sample_events[1]]
+    assert event_processor.last_diff is diff
+    assert event_processor._cached_events == [moved, new_event]
+
+def test_incremental_index_tracks_changes(event_processor, sample_events, sample_preferences):
+    """Test matching reflects updated and removed events"""
+    event_processor.update_events(sample_events)
+    assert len(event_processor.get_matching_events(sample_preferences)) == 1
+    
+    moved = replace(sample_events[0], location="uptown")
+    event_processor.update_events([moved, sample_events[1]])
+    assert event_processor.get_matching_events(sample_preferences) == []
+    
+    event_processor.update_events(sample_events)
+    assert event_processor.get_matching_events(sample_preferences) == [sample_events[0]]
+
+def test_digests_only_contain_changes(event_processor, sample_events, sample_preferences):
+    """Test users are only sent events that are new or changed"""
+    event_processor.subscribe_users([sample_preferences])
+    event_processor.update_events(sample_events)
+    assert len(event_processor.get_digests()["user1"]) == 1
+    
+    event_processor.update_events([replace(event) for event in sample_events])
+    assert event_processor.get_digests() == {}
+    
+    renamed = replace(sample_events[0], title="Tech Conference 2.0")
+    event_processor.update_events([renamed, sample_events[1]])
+    assert event_processor.get_digests() == {"user1": [renamed]}
+
+def test_repository_backed_processor(tmp_path, sample_events, sample_preferences):
+    """Test a repository-backed processor diffs against stored events after a restart"""
+    url = f"sqlite:///{tmp_path / 'events.db'}"
+    processor = EventProcessor({}, repository=EventRepository(url))
+    diff = processor.update_events(sample_events)
+    assert diff.added == sample_events
+    assert processor._cached_events == []
+    assert processor.get_matching_events(sample_preferences) == [sample_events[0]]
+
+    restarted = EventProcessor({}, repository=EventRepository(url))
+    changed = replace(sample_events[1], title="Renamed Festival")
+    diff = restarted.update_events([changed])
+    assert diff.added == []
+    assert diff.updated == [changed]
+    assert diff.removed == [sample_events[0]]
+    assert restarted.get_matching_events(sample_preferences) == []
+
+    # A relisted event is new again
+    diff = restarted.update_events([sample_events[0], changed])
+    assert diff.added == [sample_events[0]]
+    assert diff.updated == []
+
+def test_warm_start_from_snapshot(tmp_path, sample_events, sample_preferences):
+    """Test a restarted processor serves the snapshotted cache without re-notifying"""
+    path = str(tmp_path / "snapshot")
+    processor = EventProcessor({}, snapshot_path=path)
+    assert not processor.warm_start()
+    processor.update_events(sample_events)
+
+    restarted = EventProcessor({}, snapshot_path=path)
+    assert restarted.warm_start()
+    assert restarted.get_matching_events(sample_preferences) == [sample_events[0]]
+    assert not restarted.should_update_cache()
+    assert not restarted.update_events(sample_events)
+
+def test_corrupt_snapshot_is_ignored(tmp_path, capsys):
+    """Test an unreadable snapshot falls back to a cold start"""
+    path = tmp_path / "snapshot"
+    path.write_bytes(b"garbage")
+    assert not EventProcessor({}, snapshot_path=str(path)).warm_start()
+    assert "Ignoring event snapshot" in capsys.readouterr().out
+
+def test_corrupt_snapshot_payload_is_ignored(tmp_path, sample_events, capsys):
+    """Test a snapshot whose payload cannot be read falls back to a cold start"""
+    path = tmp_path / "snapshot"
+    EventProcessor({}, snapshot_path=str(path)).update_events(sample_events)
+    data = bytearray(path.read_bytes())
+    data[-20:] = b"\x00" * 20
+    path.write_bytes(bytes(data))
+
+    processor = EventProcessor({}, snapshot_path=str(path))
+    assert not processor.warm_start()
+    assert processor._cached_events == []
+    assert "Ignoring event snapshot" in capsys.readouterr().out
+
+def test_older_snapshot_version_starts_cold(tmp_path, sample_events, capsys):
+    """Test a snapshot written for another row layout falls back to a cold start"""
+    path = tmp_path / "snapshot"
+    EventProcessor({}, snapshot_path=str(path)).update_events(sample_events)
+    data = bytearray(path.read_bytes())
+    data[:SNAPSHOT_HEADER.size] = SNAPSHOT_HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION - 1, len(data) - SNAPSHOT_HEADER.size)
+    path.write_bytes(bytes(data))
+
+    processor = EventProcessor({}, snapshot_path=str(path))
+    assert not processor.warm_start()
+    assert processor._cached_events == []
+    assert "Unsupported snapshot version" in capsys.readouterr().out
+
+def test_batch_match(event_processor, sample_events, sample_preferences):
+    """Test batch matching covers every cached event"""
+    event_processor.update_events(sample_events)
+    everyone = UserPreferences(user_id="user2")
+    matrix = event_processor.batch_match([sample_preferences, everyone])
+    assert matrix.to_digests() == {"user1": [sample_events[0]], "user2": sample_events}
+
+def test_date_window_queries(event_processor, sample_events, sample_preferences):
+    """Test upcoming, between and per-day queries over the cache"""
+    later = replace(sample_events[0], id="3", date=sample_events[0].date + timedelta(days=10))
+    event_processor.update_events(sample_events + [later])
+
+    assert event_processor.get_upcoming_events() == sample_events + [later]
+    assert event_processor.get_upcoming_events(within=timedelta(days=7)) == sample_events
+    assert event_processor.get_upcoming_events(sample_preferences) == [sample_events[0], later]
+    assert event_processor.get_upcoming_events(sample_preferences, limit=1) == [sample_events[0]]
+    assert event_processor.get_events_between(
+        sample_events[1].date, later.date) == [sample_events[1]]
+    assert event_processor.get_events_by_day(end=later.date) == {
+        sample_events[0].date.date(): [sample_events[0]],
+        sample_events[1].date.date(): [sample_events[1]],
+    }
+
+def test_past_events_are_evicted(event_processor, sample_events):
+    """Test past events are dropped on update and by evict_past"""
+    past = replace(sample_events[0], id="old", date=datetime.now() - timedelta(days=1))
+    diff = event_processor.update_events(sample_events + [past])
+    assert diff.added == sample_events
+
+    evicted = event_processor.evict_past(now=sample_events[0].date + timedelta(hours=1))
+    assert evicted == [sample_events[0]]
+    assert event_processor.get_upcoming_events(now=datetime.now()) == [sample_events[1]]
+    assert event_processor.get_matching_events(UserPreferences(user_id="any")) == [sample_events[1]]
+
+def test_past_events_kept_when_eviction_disabled(sample_events):
+    """Test retain_past=None keeps past events"""
+    processor = EventProcessor({}, retain_past=None)
+    past = replace(sample_events[0], id="old", date=datetime.now() - timedelta(days=1))
+    processor.update_events([past] + sample_events)
+    assert processor.get_events_between() == [past] + sample_events
+    assert processor.evict_past() == []
+
+def test_distance_matching(sample_events):
+    """Test locations match within max_distance when a gazetteer is configured"""
+    gazetteer = Gazetteer("config/gazetteer.example.json")
+    processor = EventProcessor({}, gazetteer=gazetteer)
+    start = datetime.now() + timedelta(days=1)
+    events = [
+        replace(sample_events[0], id=str(i), location=location, date=start + timedelta(hours=i))
+        for i, location in enumerate(["hoboken", "newark", "philadelphia", "Secret Loft"])
+    ]
+    near = UserPreferences(user_id="near", locations=["midtown"], max_distance=10)
+    wide = UserPreferences(user_id="wide", categories=["technology"],
+                           locations=["midtown", "Secret Loft"], max_distance=20)
+    far = UserPreferences(user_id="far", categories=["music"], locations=["midtown"],
+                          max_distance=200)
+    processor.subscribe_users([near, wide, far])
+    processor.update_events(events)
+
+    assert processor.get_matching_events(near) == events[:1]
+    assert processor.get_matching_events(wide) == [events[0], events[1], events[3]]
+    assert processor.get_matching_events(far) == []
+    assert processor.get_digests() == {"near": events[:1], "wide": [events[0], events[1], events[3]]}
+    assert processor.get_upcoming_events(wide) == [events[0], events[1], events[3]]
+    for prefs in (near, wide, far):
+        assert processor.get_matching_events(prefs) == [
+            event for event in events if prefs.matches_event(event, gazetteer)
+        ]
+
+def test_distance_matching_with_repository(tmp_path, sample_events):
+    """Test a repository-backed processor also matches locations by distance"""
+    url = f"sqlite:///{tmp_path / 'events.db'}"
+    processor = EventProcessor({}, repository=EventRepository(url),
+                               gazetteer=Gazetteer("config/gazetteer.example.json"))
+    start = datetime.now() + timedelta(days=1)
+    events = [
+        replace(sample_events[0], id=str(i), location=location, date=start + timedelta(hours=i))
+        for i, location in enumerate(["hoboken", "newark", "philadelphia", "Secret Loft"])
+    ]
+    processor.update_events(events)
+    wide = UserPreferences(user_id="wide", categories=["technology"],
+                           locations=["midtown", "Secret Loft"], max_distance=20)
+
+    assert processor.get_matching_events(wide) == [events[0], events[1], events[3]]
+    assert processor.get_upcoming_events(wide, limit=2) == events[:2]
+    assert processor.search("conference", locations=["midtown"]) == events[:2]
+
+def test_search_follows_updates(event_processor, sample_events):
+    """Test keyword search reflects each update and combines with filters"""
+    event_processor.update_events(sample_events)
+    assert event_processor.search("festival") == [sample_events[1]]
+    assert event_processor.search("festival", categories=["technology"]) == []
+    assert event_processor.search("conference", locations=["downtown"]) == [sample_events[0]]
+
+    renamed = replace(sample_events[1], title="Jazz Night", description="Live jazz")
+    event_processor.update_events([sample_events[0], renamed])
+    assert event_processor.search("festival") == []
+    assert event_processor.search("jazz") == [renamed]
+
+def test_queries_during_updates(event_processor, sample_events, sample_preferences):
+    """Test reads from another thread never see a half-applied update"""
+    batches = [[replace(event, id=f"{event.id}-{round}") for event in sample_events * 20]
+               for round in range(2)]
+    errors = []
+    stop = threading.Event()
+
+    def read():
+        while not stop.is_set():
+            try:
+                event_processor.get_matching_events(sample_preferences)
+                event_processor.search("conference", locations=["downtown"])
+                event_processor.get_upcoming_events(sample_preferences)
+            except Exception as e:
+                errors.append(e)
+                return
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    try:
+        for round in range(200):
+            event_processor.update_events(batches[round % 2])
+    finally:
+        stop.set()
+        reader.join()
+    assert errors == []
@@ -0,0 +1,77 @@
+import pickle
+from dataclasses import fields
+from datetime import datetime
+import pytest
+from src.models.event import Event
+from src.services.snapshot import (
+    SNAPSHOT_HEADER, SNAPSHOT_MAGIC, SNAPSHOT_VERSION, SnapshotError, load_snapshot,
+    save_snapshot
+)
+
+@pytest.fixture
+def events(make_event):
+    return [make_event(index, date=datetime(2024, 1, index + 1, 18, 30),
+                       source_urls=[f"http://example.com/{index}"])
+            for index in range(3)]
+
+def test_snapshot_round_trip(tmp_path, events):
+    """Test events and the update time survive a snapshot"""
+    path = tmp_path / "snapshot"
+    last_update = datetime(2024, 1, 1, 12, 0)
+    save_snapshot(str(path), events, last_update)
+
+    assert load_snapshot(str(path)) == (events, last_update)
+    assert path.read_bytes()[:4] == SNAPSHOT_MAGIC
+    assert [p.name for p in tmp_path.iterdir()] == ["snapshot"]
+
+def test_missing_snapshot(tmp_path):
+    """Test a missing snapshot loads as None"""
+    assert load_snapshot(str(tmp_path / "missing")) is None
+
+def test_snapshot_rejects_other_files(tmp_path):
+    """Test files without the snapshot header are rejected"""
+    path = tmp_path / "snapshot"
+    path.write_bytes(b"not a snapshot at all")
+    with pytest.raises(SnapshotError):
+        load_snapshot(str(path))
+
+def test_snapshot_rejects_unknown_version(tmp_path, events):
+    """Test snapshots from another format version are rejected"""
+    path = tmp_path / "snapshot"
+    save_snapshot(str(path), events, None)
+    data = bytearray(path.read_bytes())
+    length = len(data) - SNAPSHOT_HEADER.size
+    data[:SNAPSHOT_HEADER.size] = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, 99, length)
+    path.write_bytes(bytes(data))
+    with pytest.raises(SnapshotError, match="version"):
+        load_snapshot(str(path))
+
+def test_snapshot_rejects_truncated_file(tmp_path, events):
+    """Test partially written snapshots are rejected"""
+    path = tmp_path / "snapshot"
+    save_snapshot(str(path), events, None)
+    path.write_bytes(path.read_bytes()[:-10])
+    with pytest.raises(SnapshotError, match="truncated"):
+        load_snapshot(str(path))
+
+def write_payload(path, payload: bytes):
+    """Write a payload behind a valid header"""
+    path.write_bytes(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(payload)) + payload)
+
+def test_snapshot_rejects_corrupt_payload(tmp_path):
+    """Test a payload that does not unpickle is rejected"""
+    path = tmp_path / "snapshot"
+    write_payload(path, b"\x80\x05garbage")
+    with pytest.raises(SnapshotError, match="corrupt"):
+        load_snapshot(str(path))
+
+def test_snapshot_version_tracks_event_layout(events):
+    """Test the row layout is the one SNAPSHOT_VERSION was last bumped for"""
+    # A failure here means Event.to_tuple() changed: bump SNAPSHOT_VERSION
+    # and update the expected layout
+    assert SNAPSHOT_VERSION == 2
+    assert [f.name for f in fields(Event)] == [
+        'id', 'title', 'description', 'date', 'location', 'category', 'source',
+        'url', 'image_url', 'source_urls',
+    ]
+    assert len(events[0].to_tuple()) == len(fields(Event))
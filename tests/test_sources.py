@@ -149,3 +149,30 @@ def test_parse_event_missing_fields(web_scraper):
     
     with pytest.raises(AttributeError):
         web_scraper._parse_event(soup.find('div'))
+
+def test_event_ids_are_stable(web_scraper, sample_html):
+    """Test re-scraping the same page yields the same event ids"""
+    mock_response = Mock()
+    mock_response.text = sample_html
+    mock_response.raise_for_status = Mock()
+    web_scraper.session.get = Mock(return_value=mock_response)
+    
+    first = [event.id for event in web_scraper.fetch_events()]
+    second = [event.id for event in web_scraper.fetch_events()]
+    
+    assert first == second
+    assert len(set(first)) == 2
+    
+    # Ids ignore cosmetic whitespace and case differences
+    mock_response.text = sample_html.replace("Python Meetup", "  python   MEETUP ")
+    assert web_scraper.fetch_events()[0].id == first[0]
+
+def test_event_id_depends_on_identifying_fields(web_scraper):
+    """Test changing the date or location changes the id"""
+    date = datetime(2024, 1, 1, 18, 30)
+    base_id = web_scraper.make_event_id("community_web", "Meetup", date, "Hub")
+    
+    assert base_id == web_scraper.make_event_id("community_web", "Meetup", date, " hub ")
+    assert base_id != web_scraper.make_event_id("community_web", "Meetup", date, "Park")
+    assert base_id != web_scraper.make_event_id("community_web", "Meetup", datetime(2024, 1, 2), "Hub")
+    assert base_id != web_scraper.make_event_id("other", "Meetup", date, "Hub")
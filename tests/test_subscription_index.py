@@ -0,0 +1,57 @@
+import itertools
+from datetime import datetime
+import pytest
+from src.models.user_preferences import UserPreferences
+from src.services.subscription_index import SubscriptionIndex
+
+CATEGORIES = ["technology", "music", "arts"]
+LOCATIONS = ["downtown", "park", "midtown"]
+
+@pytest.fixture
+def events(make_event):
+    return [make_event(f"{category}-{location}", title="Event", date=datetime(2024, 1, 1),
+                       location=location, category=category)
+            for category, location in itertools.product(CATEGORIES + ["food"], LOCATIONS + ["uptown"])]
+
+def make_users():
+    return [
+        UserPreferences(user_id="all"),
+        UserPreferences(user_id="music", categories=["music"]),
+        UserPreferences(user_id="park", locations=["park", "midtown"]),
+        UserPreferences(user_id="both", categories=["technology", "arts"], locations=["downtown"]),
+        UserPreferences(user_id="nothing", categories=["cooking"], locations=["park"]),
+    ]
+
+def test_route_agrees_with_matches_event(events):
+    """Test routing gives the same answer as matches_event for every pair"""
+    users = make_users()
+    index = SubscriptionIndex(users)
+
+    for event in events:
+        expected = {user.user_id for user in users if user.matches_event(event)}
+        assert index.route(event) == expected
+
+def test_build_digests(events):
+    """Test digests are built per user in event order"""
+    users = make_users()
+    digests = SubscriptionIndex(users).build_digests(events)
+
+    for user in users:
+        expected = [event for event in events if user.matches_event(event)]
+        assert digests.get(user.user_id, []) == expected
+    assert "nothing" not in digests
+
+def test_add_replaces_and_remove_unregisters(events):
+    """Test re-adding a user replaces their subscriptions"""
+    index = SubscriptionIndex(make_users())
+    event = events[0]  # technology / downtown
+    assert "both" in index.route(event)
+
+    index.add(UserPreferences(user_id="both", categories=["music"]))
+    assert "both" not in index.route(event)
+    assert index.get_user("both").categories == ["music"]
+
+    index.remove("all")
+    index.remove("unknown")
+    assert "all" not in index.route(event)
+    assert len(index) == 4
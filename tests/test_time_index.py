@@ -0,0 +1,76 @@
+import random
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from src.services.time_index import BULK_THRESHOLD, TimeIndex
+
+START = datetime(2024, 3, 1, 9, 0)
+
+def stub(hours):
+    return SimpleNamespace(date=START + timedelta(hours=hours))
+
+def build(hours_by_key):
+    index = TimeIndex()
+    for key, hours in hours_by_key.items():
+        index.add(key, stub(hours))
+    return index
+
+def test_between_is_half_open_and_date_ordered():
+    """Test range queries include start, exclude end and sort by date"""
+    index = build({"c": 30, "a": 0, "b": 5, "d": 5, "e": 48})
+    assert index.between() == ["a", "b", "d", "c", "e"]
+    assert index.between(START + timedelta(hours=5), START + timedelta(hours=30)) == ["b", "d"]
+    assert index.between(START + timedelta(hours=1), limit=2) == ["b", "d"]
+    assert index.between(START + timedelta(hours=100)) == []
+
+def test_upcoming_within_period():
+    """Test upcoming returns events from now, bounded by within"""
+    index = build({"past": -1, "soon": 2, "later": 200})
+    assert index.upcoming(now=START) == ["soon", "later"]
+    assert index.upcoming(now=START, within=timedelta(days=7)) == ["soon"]
+
+def test_by_day_buckets():
+    """Test keys are bucketed by calendar day"""
+    index = build({"a": 0, "b": 5, "c": 30, "d": 48})
+    assert index.by_day(end=START + timedelta(hours=48)) == {
+        date(2024, 3, 1): ["a", "b"],
+        date(2024, 3, 2): ["c"],
+    }
+
+def test_remove_and_evict():
+    """Test removal and eviction of past entries"""
+    events = {"a": stub(0), "b": stub(5), "c": stub(30)}
+    index = TimeIndex()
+    for key, event in events.items():
+        index.add(key, event)
+    index.remove("b", events["b"])
+    index.remove("b", events["b"])
+    assert index.between() == ["a", "c"]
+    assert index.evict_before(START + timedelta(hours=1)) == ["a"]
+    assert index.between() == ["c"]
+    assert len(index) == 1
+
+def test_aware_and_naive_dates_sort_together():
+    """Test timezone-aware dates are ordered alongside naive ones"""
+    index = TimeIndex()
+    aware = datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc).astimezone()
+    index.add("aware", SimpleNamespace(date=aware))
+    index.add("naive", SimpleNamespace(date=aware.replace(tzinfo=None) + timedelta(minutes=1)))
+    assert index.between() == ["aware", "naive"]
+
+def test_batches_agree_with_single_inserts():
+    """Test small and bulk batches keep the same order as one insert at a time"""
+    rng = random.Random(5)
+    items = [(f"k{i}", stub(rng.randrange(1000))) for i in range(BULK_THRESHOLD * 3)]
+    single = TimeIndex()
+    for key, event in items:
+        single.add(key, event)
+
+    batched = TimeIndex()
+    batched.add_many(items[:10])
+    batched.add_many(items[10:])
+    assert batched.between() == single.between()
+
+    batched.remove_many(items[:5])
+    batched.remove_many(items[100:])
+    assert batched.between() == [key for key in single.between()
+                                 if key in {key for key, _ in items[5:100]}]